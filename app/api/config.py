@@ -27,12 +27,12 @@ async def get_config(warehouse: Optional[str] = None):
     Otherwise, the default configuration is returned.
     """
     try:
-        logger.info(f"Received request for configuration. Warehouse: {warehouse}")
+        logger.info("Received request for configuration. Warehouse: %s", warehouse)
         config = await ConfigService.get_config(warehouse)
         logger.info("Successfully retrieved configuration")
         return config
     except Exception as e:
-        logger.error(f"Error handling configuration request: {str(e)}", exc_info=True)
+        logger.error("Error handling configuration request: %s", e, exc_info=True)
         
         # Return a 500 error
         raise HTTPException(
@@ -21,7 +21,7 @@ async def create_credentials(
 ):
     """Create or update storage credentials."""
     try:
-        logger.info(f"Creating credentials for prefix: {request.prefix}, warehouse: {request.warehouse}")
+        logger.info("Creating credentials for prefix: %s, warehouse: %s", request.prefix, request.warehouse)
         
         # Check if credentials already exist
         existing = await CredentialService.get_credentials(
@@ -31,7 +31,7 @@ async def create_credentials(
         )
         
         if existing and not request.overwrite:
-            logger.warning(f"Credentials already exist for prefix: {request.prefix}, warehouse: {request.warehouse}")
+            logger.warning("Credentials already exist for prefix: %s, warehouse: %s", request.prefix, request.warehouse)
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -51,12 +51,12 @@ async def create_credentials(
             request.table_id
         )
         
-        logger.info(f"Credentials created/updated with ID: {cred_id}")
+        logger.info("Credentials created/updated with ID: %s", cred_id)
         return Response(status_code=201)
     except HTTPException:
         raise
     except ValueError as e:
-        logger.warning(f"Bad request: {str(e)}")
+        logger.warning("Bad request: %s", e)
         raise HTTPException(
             status_code=400,
             detail={
@@ -68,7 +68,7 @@ async def create_credentials(
             }
         )
     except Exception as e:
-        logger.error(f"Error creating credentials: {str(e)}", exc_info=True)
+        logger.error("Error creating credentials: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
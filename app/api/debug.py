@@ -0,0 +1,15 @@
+# app/api/debug.py
+from fastapi import APIRouter
+from app.database import db
+from app.utils.logger import logger
+
+router = APIRouter()
+
+@router.get("/debug/pool")
+async def get_pool_stats():
+    """
+    Report database connection pool usage for monitoring.
+    """
+    stats = db.get_pool_stats()
+    logger.debug("Connection pool stats: %s", stats)
+    return stats
@@ -40,12 +40,12 @@ async def list_namespaces(
     If `parent` is not provided, all top-level namespaces should be listed.
     """
     try:
-        logger.info(f"List namespaces request. prefix: {prefix}, parent: {parent}, page_token: {page_token}, page_size: {page_size}")
+        logger.info("List namespaces request. prefix: %s, parent: %s, page_token: %s, page_size: %s", prefix, parent, page_token, page_size)
         return await NamespaceService.list_namespaces(parent, page_token, page_size)
     except ValueError as e:
         # Client error (not found, invalid input)
         if "not found" in str(e).lower():
-            logger.warning(f"Parent namespace not found: {str(e)}")
+            logger.warning("Parent namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -58,7 +58,7 @@ async def list_namespaces(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -71,7 +71,7 @@ async def list_namespaces(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error listing namespaces: {str(e)}", exc_info=True)
+        logger.error("Error listing namespaces: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -105,12 +105,12 @@ async def create_namespace(
     The server might also add properties, such as `last_modified_time` etc.
     """
     try:
-        logger.info(f"Create namespace request. prefix: {prefix}, namespace: {request.namespace.__root__}")
+        logger.info("Create namespace request. prefix: %s, namespace: %s", prefix, request.namespace.__root__)
         return await NamespaceService.create_namespace(request)
     except ValueError as e:
         # Handle namespace already exists
         if "already exists" in str(e).lower():
-            logger.warning(f"Namespace already exists: {str(e)}")
+            logger.warning("Namespace already exists: %s", e)
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -123,7 +123,7 @@ async def create_namespace(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -136,7 +136,7 @@ async def create_namespace(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error creating namespace: {str(e)}", exc_info=True)
+        logger.error("Error creating namespace: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -168,13 +168,13 @@ async def load_namespace_metadata(
     Load the metadata properties for a namespace
     """
     try:
-        logger.info(f"Load namespace metadata request. prefix: {prefix}, namespace: {namespace}")
+        logger.info("Load namespace metadata request. prefix: %s, namespace: %s", prefix, namespace)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         return await NamespaceService.get_namespace(namespace_levels)
     except ValueError as e:
         # Handle namespace not found
         if "not found" in str(e).lower():
-            logger.warning(f"Namespace not found: {str(e)}")
+            logger.warning("Namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -187,7 +187,7 @@ async def load_namespace_metadata(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -200,7 +200,7 @@ async def load_namespace_metadata(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error getting namespace metadata: {str(e)}", exc_info=True)
+        logger.error("Error getting namespace metadata: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -233,12 +233,12 @@ async def namespace_exists(
     Check if a namespace exists. The response does not contain a body.
     """
     try:
-        logger.info(f"Check namespace exists request. prefix: {prefix}, namespace: {namespace}")
+        logger.info("Check namespace exists request. prefix: %s, namespace: %s", prefix, namespace)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         exists = await NamespaceService.namespace_exists(namespace_levels)
         
         if not exists:
-            logger.warning(f"Namespace not found: {namespace}")
+            logger.warning("Namespace not found: %s", namespace)
             raise HTTPException(status_code=404)
         
         # 204 No Content is returned automatically for success
@@ -247,7 +247,7 @@ async def namespace_exists(
         raise
     except Exception as e:
         # Server error
-        logger.error(f"Error checking namespace existence: {str(e)}", exc_info=True)
+        logger.error("Error checking namespace existence: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -281,7 +281,7 @@ async def drop_namespace(
     Drop a namespace from the catalog. Namespace must be empty.
     """
     try:
-        logger.info(f"Drop namespace request. prefix: {prefix}, namespace: {namespace}")
+        logger.info("Drop namespace request. prefix: %s, namespace: %s", prefix, namespace)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         await NamespaceService.drop_namespace(namespace_levels)
         
@@ -289,7 +289,7 @@ async def drop_namespace(
     except ValueError as e:
         # Handle specific errors
         if "not found" in str(e).lower():
-            logger.warning(f"Namespace not found: {str(e)}")
+            logger.warning("Namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -301,7 +301,7 @@ async def drop_namespace(
                 }
             )
         elif "not empty" in str(e).lower():
-            logger.warning(f"Namespace not empty: {str(e)}")
+            logger.warning("Namespace not empty: %s", e)
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -314,7 +314,7 @@ async def drop_namespace(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -327,7 +327,7 @@ async def drop_namespace(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error dropping namespace: {str(e)}", exc_info=True)
+        logger.error("Error dropping namespace: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -362,13 +362,13 @@ async def update_properties(
     Set or remove properties on a namespace.
     """
     try:
-        logger.info(f"Update namespace properties request. prefix: {prefix}, namespace: {namespace}")
+        logger.info("Update namespace properties request. prefix: %s, namespace: %s", prefix, namespace)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         return await NamespaceService.update_properties(namespace_levels, request)
     except ValueError as e:
         # Handle specific errors
         if "not found" in str(e).lower():
-            logger.warning(f"Namespace not found: {str(e)}")
+            logger.warning("Namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -380,7 +380,7 @@ async def update_properties(
                 }
             )
         elif "cannot remove and update" in str(e).lower():
-            logger.warning(f"Property key conflict: {str(e)}")
+            logger.warning("Property key conflict: %s", e)
             raise HTTPException(
                 status_code=422,
                 detail={
@@ -393,7 +393,7 @@ async def update_properties(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -406,7 +406,7 @@ async def update_properties(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error updating namespace properties: {str(e)}", exc_info=True)
+        logger.error("Error updating namespace properties: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
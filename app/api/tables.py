@@ -6,14 +6,14 @@ from app.models.namespace import Namespace
 from app.models.table import (
     TableIdentifier, ListTablesResponse, CreateTableRequest, RegisterTableRequest,
     LoadTableResult, CommitTableRequest, CommitTableResponse, StorageCredential,
-    LoadCredentialsResponse, ReportMetricsRequest, RenameTableRequest,
+    LoadCredentialsResponse, MetricsReport, RenameTableRequest,
     CommitTransactionRequest
 )
 from app.services.namespace import NamespaceService
 from app.services.table import TableService
 from app.utils.logger import logger
 from fastapi.responses import Response
-import json
+import orjson
 router = APIRouter()
 
 @router.get("/v1/{prefix}/namespaces/{namespace}/tables",
@@ -38,13 +38,13 @@ async def list_tables(
     List all table identifiers underneath a given namespace.
     """
     try:
-        logger.info(f"List tables request. prefix: {prefix}, namespace: {namespace}, page_token: {page_token}, page_size: {page_size}")
+        logger.info("List tables request. prefix: %s, namespace: %s, page_token: %s, page_size: %s", prefix, namespace, page_token, page_size)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         return await TableService.list_tables(namespace_levels, page_token, page_size)
     except ValueError as e:
         # Handle namespace not found
         if "not found" in str(e).lower():
-            logger.warning(f"Namespace not found: {str(e)}")
+            logger.warning("Namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -57,7 +57,7 @@ async def list_tables(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -70,7 +70,7 @@ async def list_tables(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error listing tables: {str(e)}", exc_info=True)
+        logger.error("Error listing tables: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -105,7 +105,7 @@ async def create_table(
     Create a table in the given namespace.
     """
     try:
-        logger.info(f"Create table request. prefix: {prefix}, namespace: {namespace}, table name: {request.name}")
+        logger.info("Create table request. prefix: %s, namespace: %s, table name: %s", prefix, namespace, request.name)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         result = await TableService.create_table(namespace_levels, request, x_iceberg_access_delegation)
         
@@ -119,7 +119,7 @@ async def create_table(
     except ValueError as e:
         # Handle specific errors
         if "not found" in str(e).lower() and "namespace" in str(e).lower():
-            logger.warning(f"Namespace not found: {str(e)}")
+            logger.warning("Namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -131,7 +131,7 @@ async def create_table(
                 }
             )
         elif "already exists" in str(e).lower():
-            logger.warning(f"Table already exists: {str(e)}")
+            logger.warning("Table already exists: %s", e)
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -144,7 +144,7 @@ async def create_table(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -157,7 +157,7 @@ async def create_table(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error creating table: {str(e)}", exc_info=True)
+        logger.error("Error creating table: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -187,6 +187,7 @@ async def load_table(
     namespace: str,
     table: str,
     snapshots: Optional[str] = Query(None, regex="^(all|refs)$"),
+    max_snapshots: Optional[int] = Query(None, ge=1, description="Return only the most recent snapshots, up to this many"),
     x_iceberg_access_delegation: Optional[str] = Header(None),
     if_none_match: Optional[str] = Header(None)
 ):
@@ -194,69 +195,64 @@ async def load_table(
     Load a table from the catalog.
     """
     try:
-        logger.info(f"Load table request. prefix: {prefix}, namespace: {namespace}, table: {table}, snapshots: {snapshots}")
+        logger.info("Load table request. prefix: %s, namespace: %s, table: %s, snapshots: %s, max_snapshots: %s", prefix, namespace, table, snapshots, max_snapshots)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         
         # Get table basic info
         table_id, etag, table_metadata = await TableService.get_table_basic_info(namespace_levels, table, if_none_match)
         
-        # Always load credentials regardless of 304 status
-        config = await TableService.get_table_config(table_id)
-        credentials = await TableService.get_storage_credentials(table_id)
-        
-        # If get_table_basic_info returned None for table_metadata, we need to return 304
+        # If get_table_basic_info returned None for table_metadata, the client's copy is current
         if table_metadata is None:
-            # Return 304 with credentials in body
-            logger.info(f"Table {namespace_levels}.{table} not modified, returning 304 with credentials")
-            
-            # Get the last successful response and add credentials
-            cached_result = await TableService.get_cached_table_metadata(namespace_levels, table)
-            if cached_result:
-                # Ensure metadata-location exists in cached result
-                if "metadata-location" not in cached_result or cached_result["metadata-location"] is None:
-                    location = cached_result["metadata"].get("location")
-                    if location:
-                        cached_result["metadata-location"] = f"{location}/metadata/current.metadata.json"
-                
-                cached_result["config"] = config
-                cached_result["storage-credentials"] = [c.dict(by_alias=True) for c in credentials] if credentials else None
-                
-                return Response(
-                    content=json.dumps(cached_result),
-                    media_type="application/json",
-                    status_code=200,
-                    headers={"ETag": etag}
-                )
-            else:
-                # No cached response, return standard 304
-                return Response(status_code=304)
-        
-        # If we're here, we need to build the full response
-        result = await TableService.build_table_response(table_id, table_metadata, snapshots)
+            logger.info("Table %s.%s not modified, returning 304", namespace_levels, table)
+            return Response(status_code=304, headers={"ETag": etag})
         
-        # Add config and credentials
-        result_dict = result.dict(by_alias=True)
-        result_dict["config"] = config
-        result_dict["storage-credentials"] = [c.dict(by_alias=True) for c in credentials] if credentials else None
-        
-        # Double check metadata-location exists
-        if "metadata-location" not in result_dict or result_dict["metadata-location"] is None:
+        # Reuse the metadata serialized for this table version and snapshot filter;
+        # config and credentials are fetched for every load so rotations apply
+        cached_result = await TableService.get_cached_table_metadata(namespace_levels, table)
+        if cached_result and cached_result["etag"] == etag and cached_result["snapshots"] == (snapshots, max_snapshots):
+            metadata_location = cached_result["metadata_location"]
+            metadata_bytes = cached_result["metadata_bytes"]
+            config, storage_credentials = await TableService.get_table_access(table_id, cached_result["location"])
+        else:
+            # Otherwise build the full response, with config and credentials, as a plain dict
+            result_dict = await TableService.build_table_response_dict(
+                table_id, table_metadata, snapshots, max_snapshots
+            )
+            
+            # Double check metadata-location exists
+            metadata_location = result_dict.get("metadata-location")
             location = result_dict["metadata"].get("location")
-            if location:
-                result_dict["metadata-location"] = f"{location}/metadata/current.metadata.json"
+            if metadata_location is None and location:
+                metadata_location = f"{location}/metadata/current.metadata.json"
+            
+            # Serialize the metadata once and cache the bytes for repeat loads of this table version
+            metadata_bytes = orjson.dumps(result_dict["metadata"])
+            config, storage_credentials = result_dict["config"], result_dict["storage-credentials"]
+            await TableService.cache_table_metadata(namespace_levels, table, {
+                "metadata_location": metadata_location,
+                "metadata_bytes": metadata_bytes,
+                "location": location,
+                "etag": etag,
+                "last_updated_ms": table_metadata["last-updated-ms"],
+                "snapshots": (snapshots, max_snapshots),
+            })
         
-        # Cache this response for future 304 requests
-        await TableService.cache_table_metadata(namespace_levels, table, result_dict)
+        content = orjson.dumps({
+            "metadata-location": metadata_location,
+            "metadata": orjson.Fragment(metadata_bytes),
+            "config": config,
+            "storage-credentials": storage_credentials,
+        })
         
         return Response(
-            content=json.dumps(result_dict),
+            content=content,
             media_type="application/json",
             headers={"ETag": etag}
         )
     except ValueError as e:
         # Handle table not found
         if "not found" in str(e).lower():
-            logger.warning(f"Table not found: {str(e)}")
+            logger.warning("Table not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -269,7 +265,7 @@ async def load_table(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -282,7 +278,7 @@ async def load_table(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error loading table: {str(e)}", exc_info=True)
+        logger.error("Error loading table: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -316,12 +312,12 @@ async def table_exists(
     Check if a table exists. The response does not contain a body.
     """
     try:
-        logger.info(f"Check table exists request. prefix: {prefix}, namespace: {namespace}, table: {table}")
+        logger.info("Check table exists request. prefix: %s, namespace: %s, table: %s", prefix, namespace, table)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         exists = await TableService.table_exists(namespace_levels, table)
         
         if not exists:
-            logger.warning(f"Table not found: {namespace}.{table}")
+            logger.warning("Table not found: %s.%s", namespace, table)
             raise HTTPException(status_code=404)
         
         # 204 No Content is returned automatically for success
@@ -330,7 +326,7 @@ async def table_exists(
         raise
     except Exception as e:
         # Server error
-        logger.error(f"Error checking table existence: {str(e)}", exc_info=True)
+        logger.error("Error checking table existence: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -365,7 +361,7 @@ async def drop_table(
     Drop a table from the catalog.
     """
     try:
-        logger.info(f"Drop table request. prefix: {prefix}, namespace: {namespace}, table: {table}, purge_requested: {purge_requested}")
+        logger.info("Drop table request. prefix: %s, namespace: %s, table: %s, purge_requested: %s", prefix, namespace, table, purge_requested)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         await TableService.drop_table(namespace_levels, table, purge_requested)
         
@@ -373,7 +369,7 @@ async def drop_table(
     except ValueError as e:
         # Handle specific errors
         if "not found" in str(e).lower() and "namespace" in str(e).lower():
-            logger.warning(f"Namespace not found: {str(e)}")
+            logger.warning("Namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -385,7 +381,7 @@ async def drop_table(
                 }
             )
         elif "not found" in str(e).lower() and "table" in str(e).lower():
-            logger.warning(f"Table not found: {str(e)}")
+            logger.warning("Table not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -398,7 +394,7 @@ async def drop_table(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -411,7 +407,7 @@ async def drop_table(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error dropping table: {str(e)}", exc_info=True)
+        logger.error("Error dropping table: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -444,13 +440,13 @@ async def load_credentials(
     Load vended credentials for a table from the catalog.
     """
     try:
-        logger.info(f"Load credentials request. prefix: {prefix}, namespace: {namespace}, table: {table}")
+        logger.info("Load credentials request. prefix: %s, namespace: %s, table: %s", prefix, namespace, table)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         return await TableService.load_credentials(namespace_levels, table)
     except ValueError as e:
         # Handle table not found
         if "not found" in str(e).lower():
-            logger.warning(f"Table not found: {str(e)}")
+            logger.warning("Table not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -463,7 +459,7 @@ async def load_credentials(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -476,7 +472,7 @@ async def load_credentials(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error loading credentials: {str(e)}", exc_info=True)
+        logger.error("Error loading credentials: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -511,14 +507,14 @@ async def rename_table(
     Rename a table from its current name to a new name.
     """
     try:
-        logger.info(f"Rename table request. prefix: {prefix}, source: {request.source.namespace.__root__}.{request.source.name}, destination: {request.destination.namespace.__root__}.{request.destination.name}")
+        logger.info("Rename table request. prefix: %s, source: %s.%s, destination: %s.%s", prefix, request.source.namespace.__root__, request.source.name, request.destination.namespace.__root__, request.destination.name)
         await TableService.rename_table(request)
         
         # 204 No Content is returned automatically for success
     except ValueError as e:
         # Handle specific errors
         if "not found" in str(e).lower() and "namespace" in str(e).lower():
-            logger.warning(f"Namespace not found: {str(e)}")
+            logger.warning("Namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -530,7 +526,7 @@ async def rename_table(
                 }
             )
         elif "not found" in str(e).lower() and "table" in str(e).lower():
-            logger.warning(f"Table not found: {str(e)}")
+            logger.warning("Table not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -542,7 +538,7 @@ async def rename_table(
                 }
             )
         elif "already exists" in str(e).lower():
-            logger.warning(f"Table already exists: {str(e)}")
+            logger.warning("Table already exists: %s", e)
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -555,7 +551,7 @@ async def rename_table(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -568,7 +564,7 @@ async def rename_table(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error renaming table: {str(e)}", exc_info=True)
+        logger.error("Error renaming table: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -597,13 +593,13 @@ async def report_metrics(
     prefix: str,
     namespace: str,
     table: str,
-    request: ReportMetricsRequest
+    request: MetricsReport
 ):
     """
     Send a metrics report to this endpoint to be processed by the backend.
     """
     try:
-        logger.info(f"Report metrics request. prefix: {prefix}, namespace: {namespace}, table: {table}, report_type: {request.report_type}")
+        logger.info("Report metrics request. prefix: %s, namespace: %s, table: %s, report_type: %s", prefix, namespace, table, request.report_type)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         await TableService.report_metrics(namespace_levels, table, request)
         
@@ -611,7 +607,76 @@ async def report_metrics(
     except ValueError as e:
         # Handle table not found
         if "not found" in str(e).lower():
-            logger.warning(f"Table not found: {str(e)}")
+            logger.warning("Table not found: %s", e)
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "error": {
+                        "message": str(e),
+                        "type": "NoSuchTableException",
+                        "code": 404
+                    }
+                }
+            )
+        else:
+            # Other validation errors
+            logger.warning("Bad request: %s", e)
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": {
+                        "message": str(e),
+                        "type": "BadRequestException",
+                        "code": 400
+                    }
+                }
+            )
+    except Exception as e:
+        # Server error
+        logger.error("Error reporting metrics: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": {
+                    "message": f"Internal server error: {str(e)}",
+                    "type": "InternalServerError",
+                    "code": 500
+                }
+            }
+        )
+    
+@router.post("/v1/{prefix}/namespaces/{namespace}/tables/{table}/metrics/batch",
+    status_code=204,
+    responses={
+        204: {"description": "Success, no content"},
+        400: {"model": IcebergErrorResponse},
+        401: {"model": IcebergErrorResponse},
+        403: {"model": IcebergErrorResponse},
+        404: {"model": IcebergErrorResponse},
+        419: {"model": IcebergErrorResponse},
+        503: {"model": IcebergErrorResponse},
+        500: {"model": IcebergErrorResponse}
+    }
+)
+async def report_metrics_batch(
+    prefix: str,
+    namespace: str,
+    table: str,
+    requests: List[MetricsReport]
+):
+    """
+    Send several metrics reports for a table in a single request.
+    """
+    try:
+        logger.info("Report metrics batch request. prefix: %s, namespace: %s, table: %s, reports: %s", prefix, namespace, table, len(requests))
+        namespace_levels = NamespaceService.parse_namespace(namespace)
+        await TableService.report_metrics_batch(namespace_levels, table, requests)
+        
+        # 204 No Content is returned automatically for success
+    except ValueError as e:
+        # Handle table not found
+        if "not found" in str(e).lower():
+            logger.warning("Table not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -624,7 +689,7 @@ async def report_metrics(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -637,7 +702,7 @@ async def report_metrics(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error reporting metrics: {str(e)}", exc_info=True)
+        logger.error("Error reporting metrics batch: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -673,7 +738,7 @@ async def update_table(
     Commits updates to table metadata.
     """
     try:
-        logger.info(f"Update table request. prefix: {prefix}, namespace: {namespace}, table: {table}")
+        logger.info("Update table request. prefix: %s, namespace: %s, table: %s", prefix, namespace, table)
         namespace_levels = NamespaceService.parse_namespace(namespace)
         
         result = await TableService.update_table(namespace_levels, table, request)
@@ -683,7 +748,7 @@ async def update_table(
     except ValueError as e:
         # Handle specific errors
         if "not found" in str(e).lower() and "namespace" in str(e).lower():
-            logger.warning(f"Namespace not found: {str(e)}")
+            logger.warning("Namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -695,7 +760,7 @@ async def update_table(
                 }
             )
         elif "not found" in str(e).lower() and "table" in str(e).lower():
-            logger.warning(f"Table not found: {str(e)}")
+            logger.warning("Table not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -707,7 +772,7 @@ async def update_table(
                 }
             )
         elif "requirement" in str(e).lower() or "conflict" in str(e).lower():
-            logger.warning(f"Commit requirement failed: {str(e)}")
+            logger.warning("Commit requirement failed: %s", e)
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -720,7 +785,7 @@ async def update_table(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -733,7 +798,7 @@ async def update_table(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error updating table: {str(e)}", exc_info=True)
+        logger.error("Error updating table: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -768,7 +833,7 @@ async def commit_transaction(
     Commits updates to multiple tables in an atomic operation.
     """
     try:
-        logger.info(f"Commit transaction request. prefix: {prefix}, table changes: {len(request.table_changes)}")
+        logger.info("Commit transaction request. prefix: %s, table changes: %s", prefix, len(request.table_changes))
         
         await TableService.commit_transaction(request)
         
@@ -776,7 +841,7 @@ async def commit_transaction(
     except ValueError as e:
         # Handle specific errors
         if "not found" in str(e).lower() and "namespace" in str(e).lower():
-            logger.warning(f"Namespace not found: {str(e)}")
+            logger.warning("Namespace not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -788,7 +853,7 @@ async def commit_transaction(
                 }
             )
         elif "not found" in str(e).lower() and "table" in str(e).lower():
-            logger.warning(f"Table not found: {str(e)}")
+            logger.warning("Table not found: %s", e)
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -800,7 +865,7 @@ async def commit_transaction(
                 }
             )
         elif "requirement" in str(e).lower() or "conflict" in str(e).lower():
-            logger.warning(f"Commit requirement failed: {str(e)}")
+            logger.warning("Commit requirement failed: %s", e)
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -813,7 +878,7 @@ async def commit_transaction(
             )
         else:
             # Other validation errors
-            logger.warning(f"Bad request: {str(e)}")
+            logger.warning("Bad request: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -826,7 +891,7 @@ async def commit_transaction(
             )
     except Exception as e:
         # Server error
-        logger.error(f"Error committing transaction: {str(e)}", exc_info=True)
+        logger.error("Error committing transaction: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail={
@@ -7,8 +7,11 @@ import traceback
 import os
 
 from app.database import db
-from app.api import config, namespaces, tables, credentials
-from app.utils.logger import logger
+from app.migrations import run_migrations
+from app.services.metrics import metrics_writer
+from app.services.table import TableService, TABLE_PREFETCH_INTERVAL_MS
+from app.api import config, namespaces, tables, credentials, debug
+from app.utils.logger import logger, start_log_listener, stop_log_listener
 # Import other API routers here as needed
 
 # Create FastAPI app instance
@@ -35,6 +38,7 @@ app.include_router(config.router, tags=["Configuration API"])
 app.include_router(namespaces.router, tags=["Namespace API"])
 app.include_router(tables.router, tags=["Table API"])
 app.include_router(credentials.router, tags=["Credentials API"])
+app.include_router(debug.router, tags=["Debug API"])
 # Include other routers here
 
 # Enable/disable debug based on environment
@@ -43,15 +47,23 @@ app.debug = os.getenv("ENVIRONMENT", "production").lower() == "development"
 # Startup and shutdown events
 @app.on_event("startup")
 async def startup():
+    start_log_listener()
     logger.info("Starting up application")
     await db.connect()
     logger.info("Database connection established")
+    await run_migrations()
+    await metrics_writer.start()
+    if TABLE_PREFETCH_INTERVAL_MS > 0:
+        TableService.start_prefetcher(TABLE_PREFETCH_INTERVAL_MS)
 
 @app.on_event("shutdown")
 async def shutdown():
     logger.info("Shutting down application")
+    await metrics_writer.stop()
+    await TableService.stop_prefetcher()
     await db.disconnect()
     logger.info("Database connection closed")
+    stop_log_listener()
 
 # Exception handler for IcebergErrorResponse format
 @app.exception_handler(Exception)
@@ -63,7 +75,7 @@ async def exception_handler(request: Request, exc: Exception):
     error_type = type(exc).__name__
     error_message = str(exc)
     
-    logger.error(f"Unhandled exception: {error_message}", exc_info=True)
+    logger.error("Unhandled exception: %s", error_message, exc_info=True)
     
     return JSONResponse(
         status_code=status_code,
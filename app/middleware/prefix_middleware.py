@@ -24,7 +24,7 @@ class PrefixMiddleware(BaseHTTPMiddleware):
             if prefix != 'v1':  # Skip if already in correct format
                 # For config endpoint, the prefix becomes a warehouse parameter
                 new_path = "/v1/config"
-                logger.info(f"Rewriting config path from '{path}' to '{new_path}' with warehouse={prefix}")
+                logger.info("Rewriting config path from '%s' to '%s' with warehouse=%s", path, new_path, prefix)
                 
                 # Create modified request scope with new path
                 request.scope["path"] = new_path
@@ -60,7 +60,7 @@ class PrefixMiddleware(BaseHTTPMiddleware):
             # Rewrite to /v1/{prefix}/...
             new_path = f"/v1/{prefix}/{rest_of_path}"
             
-            logger.info(f"Rewriting path from '{path}' to '{new_path}'")
+            logger.info("Rewriting path from '%s' to '%s'", path, new_path)
             
             # Create modified request scope with new path
             request.scope["path"] = new_path
@@ -0,0 +1,64 @@
+# app/migrations.py
+from app.database import db
+from app.utils.logger import logger
+
+# Data migrations for databases created by older versions. Postgres only runs
+# docker/postgres/init.sql on an empty data directory, so existing deployments
+# are brought up to date here at startup. Every statement is a no-op once applied.
+_MIGRATIONS = [
+    # Stored schemas, specs and sort orders carry their id; the load paths
+    # serve the documents without patching them
+    ("fill missing schema-id", """
+    UPDATE schemas SET schema_json = jsonb_set(schema_json, '{schema-id}', to_jsonb(schema_id))
+    WHERE COALESCE(jsonb_typeof(schema_json->'schema-id'), 'null') = 'null'
+    """),
+    ("fill missing spec-id", """
+    UPDATE partition_specs SET spec_json = jsonb_set(spec_json, '{spec-id}', to_jsonb(spec_id))
+    WHERE COALESCE(jsonb_typeof(spec_json->'spec-id'), 'null') = 'null'
+    """),
+    ("fill missing order-id", """
+    UPDATE sort_orders SET order_json = jsonb_set(order_json, '{order-id}', to_jsonb(order_id))
+    WHERE COALESCE(jsonb_typeof(order_json->'order-id'), 'null') = 'null'
+    """),
+    # Partition fields without a field-id are numbered after the table's
+    # last_partition_id, in field order
+    ("fill missing partition field-ids", """
+    UPDATE partition_specs p SET spec_json = jsonb_set(p.spec_json, '{fields}', (
+        SELECT jsonb_agg(
+            CASE WHEN f.missing THEN jsonb_set(f.field, '{field-id}', to_jsonb(t.last_partition_id + f.n))
+            ELSE f.field END
+            ORDER BY f.ord
+        )
+        FROM (
+            SELECT e.field, e.ord,
+                COALESCE(jsonb_typeof(e.field->'field-id'), 'null') = 'null' AS missing,
+                COUNT(*) FILTER (
+                    WHERE COALESCE(jsonb_typeof(e.field->'field-id'), 'null') = 'null'
+                ) OVER (ORDER BY e.ord) AS n
+            FROM jsonb_array_elements(p.spec_json->'fields') WITH ORDINALITY AS e(field, ord)
+        ) f
+    ))
+    FROM tables t
+    WHERE t.id = p.table_id
+      AND jsonb_typeof(p.spec_json->'fields') = 'array'
+      AND EXISTS (
+          SELECT 1 FROM jsonb_array_elements(p.spec_json->'fields') AS e(field)
+          WHERE COALESCE(jsonb_typeof(e.field->'field-id'), 'null') = 'null'
+      )
+    """),
+    # Ingest triggers an earlier init.sql installed; ids are assigned on write now
+    ("drop id normalization triggers", """
+    DROP TRIGGER IF EXISTS schemas_normalize_json ON schemas;
+    DROP TRIGGER IF EXISTS partition_specs_normalize_json ON partition_specs;
+    DROP FUNCTION IF EXISTS normalize_schema_json();
+    DROP FUNCTION IF EXISTS normalize_partition_spec_json();
+    """),
+]
+
+
+async def run_migrations() -> None:
+    """Apply the data migrations in one transaction"""
+    async with db.transaction():
+        for name, query in _MIGRATIONS:
+            result = await db.execute(query)
+            logger.info("Migration '%s': %s", name, result)
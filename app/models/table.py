@@ -1,5 +1,5 @@
 # app/models/table.py
-from typing import Dict, List, Optional, Union, Any, Literal
+from typing import Dict, List, Optional, Union, Any, Literal, TypedDict
 from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import date
@@ -82,6 +82,26 @@ class SnapshotReference(BaseModel):
     max_snapshot_age_ms: Optional[int] = Field(None, alias='max-snapshot-age-ms')
     min_snapshots_to_keep: Optional[int] = Field(None, alias='min-snapshots-to-keep')
 
+# Plain-dict shapes of snapshots and refs as served from stored metadata. They
+# pass through to the response unvalidated; the models above validate input.
+SnapshotDict = TypedDict("SnapshotDict", {
+    "snapshot-id": int,
+    "parent-snapshot-id": Optional[int],
+    "sequence-number": Optional[int],
+    "timestamp-ms": int,
+    "manifest-list": str,
+    "summary": Dict[str, Any],
+    "schema-id": Optional[int],
+})
+
+SnapshotRefDict = TypedDict("SnapshotRefDict", {
+    "type": str,
+    "snapshot-id": int,
+    "max-ref-age-ms": int,
+    "max-snapshot-age-ms": int,
+    "min-snapshots-to-keep": int,
+}, total=False)
+
 class TableMetadata(BaseModel):
     format_version: int = Field(..., alias='format-version', ge=1, le=2)
     table_uuid: str = Field(..., alias='table-uuid')
@@ -126,6 +146,14 @@ class LoadTableResult(BaseModel):
     config: Optional[Dict[str, str]] = None
     storage_credentials: Optional[List[StorageCredential]] = Field(None, alias='storage-credentials')
 
+# LoadTableResult as served, with the metadata as a plain alias-keyed dict
+LoadTableResultDict = TypedDict("LoadTableResultDict", {
+    "metadata-location": Optional[str],
+    "metadata": Dict[str, Any],
+    "config": Optional[Dict[str, str]],
+    "storage-credentials": Optional[List[Dict[str, Any]]],
+})
+
 class LoadCredentialsResponse(BaseModel):
     storage_credentials: List[StorageCredential] = Field(..., alias='storage-credentials')
 
@@ -190,6 +218,20 @@ class ReportMetricsRequest(BaseModel):
     metrics: Metrics
     metadata: Optional[Dict[str, str]] = None
 
+class ScanReport(ReportMetricsRequest):
+    filter: Optional[Any] = None  # Expression, kept as raw JSON
+    schema_id: int = Field(..., alias='schema-id')
+    projected_field_ids: List[int] = Field(..., alias='projected-field-ids')
+    projected_field_names: List[str] = Field(..., alias='projected-field-names')
+
+class CommitReport(ReportMetricsRequest):
+    sequence_number: Optional[int] = Field(None, alias='sequence-number')
+    operation: Optional[str] = None
+
+# Scan reports are tried first since they have required fields of their own;
+# anything else is stored as a commit report
+MetricsReport = Union[ScanReport, CommitReport]
+
 # Rename table model
 class RenameTableRequest(BaseModel):
     source: TableIdentifier
@@ -1,11 +1,19 @@
 # app/services/config.py
-import json
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 from app.database import db
 from app.models.config import CatalogConfig
 from app.utils.logger import logger
 
+# Seconds a fetched catalog configuration is served from memory. No API writes
+# catalog_config, so the cache is TTL-only: changes made directly in the
+# database apply within this many seconds.
+CONFIG_CACHE_TTL = 60
+
 class ConfigService:
+    # warehouse -> (configuration, expiry)
+    _config_cache: Dict[Optional[str], Tuple[CatalogConfig, float]] = {}
+
     @staticmethod
     async def get_config(warehouse: Optional[str] = None) -> CatalogConfig:
         """
@@ -13,7 +21,19 @@ class ConfigService:
         
         If warehouse is specified, return configuration for that specific warehouse.
         Otherwise, return the default configuration.
+        Results are cached for CONFIG_CACHE_TTL seconds.
         """
+        cached = ConfigService._config_cache.get(warehouse)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        
+        config = await ConfigService._fetch_config(warehouse)
+        ConfigService._config_cache[warehouse] = (config, time.monotonic() + CONFIG_CACHE_TTL)
+        return config
+
+    @staticmethod
+    async def _fetch_config(warehouse: Optional[str] = None) -> CatalogConfig:
+        """Fetch catalog configuration from the database."""
         # Query to fetch configuration from the database
         config_query = """
         SELECT config_json FROM catalog_config 
@@ -23,23 +43,18 @@ class ConfigService:
         # Use the provided warehouse or fall back to 'default'
         catalog_name = warehouse or "default"
         
-        logger.info(f"Fetching configuration for catalog: {catalog_name}")
+        logger.info("Fetching configuration for catalog: %s", catalog_name)
         
         try:
             # Execute the query
             config_data = await db.fetch_one(config_query, catalog_name)
             
             if config_data:
-                logger.debug(f"Found configuration data: {config_data}")
+                logger.debug("Found configuration data: %s", config_data)
                 
-                # Extract the configuration JSON and ensure it's a dictionary
+                # Extract the configuration JSON (jsonb, decoded by the pool's codec)
                 config_json = config_data["config_json"]
                 
-                # If it's a string, parse it into a dictionary
-                if isinstance(config_json, str):
-                    logger.debug("Parsing JSON string into dictionary")
-                    config_json = json.loads(config_json)
-                
                 # Return CatalogConfig
                 return CatalogConfig(
                     overrides=config_json.get("overrides", {}),
@@ -47,21 +62,16 @@ class ConfigService:
                     endpoints=config_json.get("endpoints")
                 )
             else:
-                logger.info(f"No configuration found for catalog: {catalog_name}")
+                logger.info("No configuration found for catalog: %s", catalog_name)
                 
                 # If the specific warehouse configuration is not found, try to fetch the default
                 if warehouse:
                     logger.info("Trying to fetch default configuration")
                     config_data = await db.fetch_one(config_query, "default")
                     if config_data:
-                        logger.debug(f"Found default configuration: {config_data}")
+                        logger.debug("Found default configuration: %s", config_data)
                         config_json = config_data["config_json"]
                         
-                        # If it's a string, parse it into a dictionary
-                        if isinstance(config_json, str):
-                            logger.debug("Parsing JSON string into dictionary")
-                            config_json = json.loads(config_json)
-                        
                         return CatalogConfig(
                             overrides=config_json.get("overrides", {}),
                             defaults=config_json.get("defaults", {}),
@@ -72,5 +82,5 @@ class ConfigService:
                 # Return empty configuration if nothing found
                 return CatalogConfig(overrides={}, defaults={}, endpoints=[])
         except Exception as e:
-            logger.error(f"Error fetching configuration: {str(e)}", exc_info=True)
+            logger.error("Error fetching configuration: %s", e, exc_info=True)
             raise
\ No newline at end of file
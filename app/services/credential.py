@@ -1,9 +1,69 @@
-import json
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from app.database import db
 from app.utils.logger import logger
 
+# Seconds the global (not table-specific) credentials are served from memory.
+# Writes through this service refresh them at once; the TTL bounds how long
+# changes made by other processes take to show up.
+GLOBAL_CREDENTIALS_CACHE_TTL = 60
+
+_GLOBAL_CREDENTIALS_SQL = """
+SELECT prefix, warehouse, config FROM storage_credentials
+WHERE table_id IS NULL
+ORDER BY LENGTH(warehouse) DESC
+"""
+
 class CredentialService:
+    # (global credential rows, longest warehouse first; expiry)
+    _global_credentials: Optional[Tuple[List[Dict], float]] = None
+    # Prefix index over the cached rows: (warehouse -> rows, distinct warehouse
+    # lengths longest first), built from the same snapshot as _global_credentials
+    _global_credentials_index: Tuple[Dict[str, List[Dict]], List[int]] = ({}, [])
+
+    @staticmethod
+    async def get_global_credentials() -> List[Dict]:
+        """Get all global credentials, longest warehouse first, cached for GLOBAL_CREDENTIALS_CACHE_TTL seconds."""
+        cached = CredentialService._global_credentials
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        
+        records = await db.fetch_all(_GLOBAL_CREDENTIALS_SQL)
+        by_warehouse: Dict[str, List[Dict]] = {}
+        for record in records:
+            by_warehouse.setdefault(record["warehouse"], []).append(record)
+        CredentialService._global_credentials_index = (
+            by_warehouse, sorted({len(warehouse) for warehouse in by_warehouse}, reverse=True)
+        )
+        CredentialService._global_credentials = (records, time.monotonic() + GLOBAL_CREDENTIALS_CACHE_TTL)
+        return records
+
+    @staticmethod
+    async def match_global_credentials(location: str) -> List[Dict]:
+        """
+        Get the global credentials whose warehouse is a prefix of location, longest first.
+        Probes the location's prefix at each distinct warehouse length, so the cost
+        depends on how many lengths there are rather than how many credentials.
+        """
+        await CredentialService.get_global_credentials()
+        by_warehouse, lengths = CredentialService._global_credentials_index
+        return [
+            record
+            for length in lengths if length <= len(location)
+            for record in by_warehouse.get(location[:length], ())
+        ]
+
+    @staticmethod
+    async def match_prefix_credentials(prefix: str) -> List[Dict]:
+        """Get the global credentials registered under prefix, longest warehouse first."""
+        records = await CredentialService.get_global_credentials()
+        return [record for record in records if record["prefix"] == prefix]
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Drop the cached global credentials, e.g. after storage_credentials changes."""
+        CredentialService._global_credentials = None
+
     @staticmethod
     async def get_credentials(
         prefix: str,
@@ -29,7 +89,7 @@ class CredentialService:
             record = await db.fetch_one(query, *params)
             return record if record else None
         except Exception as e:
-            logger.error(f"Error retrieving credentials: {str(e)}", exc_info=True)
+            logger.error("Error retrieving credentials: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -52,7 +112,8 @@ class CredentialService:
                 WHERE id = $2
                 RETURNING id
                 """
-                result = await db.fetch_one(query, json.dumps(config), existing["id"])
+                result = await db.fetch_one(query, config, existing["id"])
+                CredentialService.invalidate_cache()
                 return result["id"]
             else:
                 # Insert new credentials
@@ -61,10 +122,11 @@ class CredentialService:
                 VALUES ($1, $2, $3, $4)
                 RETURNING id
                 """
-                result = await db.fetch_one(query, prefix, warehouse, json.dumps(config), table_id)
+                result = await db.fetch_one(query, prefix, warehouse, config, table_id)
+                CredentialService.invalidate_cache()
                 return result["id"]
         except Exception as e:
-            logger.error(f"Error upserting credentials: {str(e)}", exc_info=True)
+            logger.error("Error upserting credentials: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -84,5 +146,5 @@ class CredentialService:
             records = await db.fetch_all(query, location)
             return records
         except Exception as e:
-            logger.error(f"Error retrieving credentials for location: {str(e)}", exc_info=True)
+            logger.error("Error retrieving credentials for location: %s", e, exc_info=True)
             raise
\ No newline at end of file
@@ -0,0 +1,147 @@
+# app/services/metrics.py
+import asyncio
+import time
+from typing import List, Optional, Tuple
+from app.database import db
+from app.utils.logger import logger
+
+# Inserts for operation_metrics rows whose table id is already known
+_INSERT_SCAN_METRICS_BY_ID_SQL = """
+INSERT INTO operation_metrics (
+    table_id, report_type, snapshot_id, filter_json,
+    schema_id, projected_field_ids, projected_field_names,
+    metrics_json, metadata_json, created_at
+) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, NOW())
+"""
+
+_INSERT_COMMIT_METRICS_BY_ID_SQL = """
+INSERT INTO operation_metrics (
+    table_id, report_type, snapshot_id, sequence_number,
+    operation, metrics_json, metadata_json, created_at
+) VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
+"""
+
+# operation_metrics columns filled by each report type, matching the order
+# of TableService._metrics_values (created_at is left to its default)
+_SCAN_METRICS_COLUMNS = [
+    "table_id", "report_type", "snapshot_id", "filter_json",
+    "schema_id", "projected_field_ids", "projected_field_names",
+    "metrics_json", "metadata_json"
+]
+
+_COMMIT_METRICS_COLUMNS = [
+    "table_id", "report_type", "snapshot_id", "sequence_number",
+    "operation", "metrics_json", "metadata_json"
+]
+
+# Batches larger than this are written with COPY instead of executemany
+METRICS_COPY_THRESHOLD = 1000
+
+# Background writer settings
+METRICS_QUEUE_SIZE = 10000
+METRICS_BATCH_SIZE = 500
+METRICS_FLUSH_INTERVAL = 0.05  # seconds
+
+# (is scan report, row values starting with table_id)
+MetricsRow = Tuple[bool, tuple]
+
+
+async def write_metrics_rows(scan_rows: List[tuple], commit_rows: List[tuple]) -> None:
+    """Insert operation_metrics rows, each starting with its table_id, in one transaction"""
+    async with db.transaction() as conn:
+        for rows, query, columns in (
+            (scan_rows, _INSERT_SCAN_METRICS_BY_ID_SQL, _SCAN_METRICS_COLUMNS),
+            (commit_rows, _INSERT_COMMIT_METRICS_BY_ID_SQL, _COMMIT_METRICS_COLUMNS),
+        ):
+            if not rows:
+                continue
+            if len(rows) > METRICS_COPY_THRESHOLD:
+                await conn.copy_records_to_table("operation_metrics", records=rows, columns=columns)
+            else:
+                await conn.executemany(query, rows)
+
+
+class MetricsWriter:
+    """
+    Buffers metrics rows in a queue and writes them in batches from a background task.
+    Rows are written inline when the writer is not running or the queue is full.
+    """
+
+    def __init__(self):
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the background writer task"""
+        if self.task is None:
+            self.queue = asyncio.Queue(maxsize=METRICS_QUEUE_SIZE)
+            self.task = asyncio.create_task(self._run())
+            logger.info("Metrics writer started")
+
+    async def stop(self):
+        """Stop the background writer, flushing anything still queued"""
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+        remaining = []
+        while not self.queue.empty():
+            remaining.append(self.queue.get_nowait())
+        if remaining:
+            await self._flush(remaining)
+        logger.info("Metrics writer stopped, flushed %s queued rows", len(remaining))
+
+    async def submit(self, is_scan: bool, row: tuple) -> None:
+        """Queue a metrics row for writing"""
+        if self.task is None:
+            await self._flush([(is_scan, row)])
+            return
+        try:
+            self.queue.put_nowait((is_scan, row))
+        except asyncio.QueueFull:
+            # Backpressure: make this caller wait for its own write
+            logger.warning("Metrics queue full, writing row inline")
+            await self._flush([(is_scan, row)])
+
+    async def _run(self):
+        """Collect up to METRICS_BATCH_SIZE rows or METRICS_FLUSH_INTERVAL seconds worth, then write"""
+        while True:
+            batch = [await self.queue.get()]
+            deadline = time.monotonic() + METRICS_FLUSH_INTERVAL
+            while len(batch) < METRICS_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[MetricsRow]) -> None:
+        """Write a batch, falling back to row-by-row so one bad row does not lose the rest"""
+        scan_rows = [row for is_scan, row in batch if is_scan]
+        commit_rows = [row for is_scan, row in batch if not is_scan]
+        try:
+            await write_metrics_rows(scan_rows, commit_rows)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error("Dropping metrics row for table %s: %s", batch[0][1][0], e)
+                return
+            logger.warning("Metrics batch of %s rows failed, retrying individually: %s", len(batch), e)
+
+        for is_scan, row in batch:
+            try:
+                await write_metrics_rows([row] if is_scan else [], [] if is_scan else [row])
+            except Exception as e:
+                logger.error("Dropping metrics row for table %s: %s", row[0], e)
+
+
+# Create a single metrics writer instance to be used throughout the application
+metrics_writer = MetricsWriter()
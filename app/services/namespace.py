@@ -1,5 +1,5 @@
 # app/services/namespace.py
-import json
+import time
 from typing import Dict, List, Optional, Tuple, Any
 from app.database import db
 from app.models.namespace import (
@@ -10,8 +10,39 @@ from app.models.namespace import (
 from app.utils.logger import logger
 import base64
 
+_NAMESPACE_ID_SQL = """
+SELECT id FROM namespaces WHERE levels = $1
+"""
+
+# Seconds a cached namespace levels -> namespace id mapping stays valid
+NAMESPACE_ID_CACHE_TTL = 30
+
 class NamespaceService:
     
+    # namespace levels -> (namespace id, expiry). Entries are dropped when the
+    # namespace is dropped here; other processes rely on the TTL.
+    _namespace_id_cache: Dict[Tuple[str, ...], Tuple[int, float]] = {}
+    
+    @staticmethod
+    async def get_namespace_id(namespace_levels: List[str]) -> Optional[int]:
+        """Get a namespace's id, or None if it does not exist, cached for NAMESPACE_ID_CACHE_TTL seconds."""
+        key = tuple(namespace_levels)
+        entry = NamespaceService._namespace_id_cache.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        
+        record = await db.fetch_one(_NAMESPACE_ID_SQL, namespace_levels)
+        if not record:
+            NamespaceService._namespace_id_cache.pop(key, None)
+            return None
+        NamespaceService._namespace_id_cache[key] = (record["id"], time.monotonic() + NAMESPACE_ID_CACHE_TTL)
+        return record["id"]
+    
+    @staticmethod
+    def evict_namespace_id(namespace_levels: List[str]) -> None:
+        """Forget the cached id of a namespace."""
+        NamespaceService._namespace_id_cache.pop(tuple(namespace_levels), None)
+    
     @staticmethod
     def encode_page_token(value: str) -> str:
         """Encode a page token value"""
@@ -48,7 +79,7 @@ class NamespaceService:
         List all namespaces at a certain level, optionally under a parent namespace.
         Supports pagination.
         """
-        logger.info(f"Listing namespaces. Parent: {parent}, Page token: {page_token}, Page size: {page_size}")
+        logger.info("Listing namespaces. Parent: %s, Page token: %s, Page size: %s", parent, page_token, page_size)
         
         # Parse parent namespace if provided
         parent_levels = None
@@ -58,7 +89,7 @@ class NamespaceService:
             # Verify parent namespace exists
             parent_exists = await NamespaceService.namespace_exists(parent_levels)
             if not parent_exists:
-                logger.warning(f"Parent namespace not found: {parent_levels}")
+                logger.warning("Parent namespace not found: %s", parent_levels)
                 raise ValueError(f"Parent namespace not found: {parent}")
         
         # Start building query
@@ -78,7 +109,7 @@ class NamespaceService:
                 query += f"{where_clause} levels > $%s"
                 params.append(last_seen)
             except Exception as e:
-                logger.error(f"Invalid page token: {page_token}", exc_info=True)
+                logger.error("Invalid page token: %s", page_token, exc_info=True)
                 raise ValueError(f"Invalid page token: {page_token}")
         
         # Add ordering
@@ -115,7 +146,7 @@ class NamespaceService:
             return response
             
         except Exception as e:
-            logger.error(f"Error listing namespaces: {str(e)}", exc_info=True)
+            logger.error("Error listing namespaces: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -123,12 +154,12 @@ class NamespaceService:
         """
         Create a new namespace with optional properties.
         """
-        logger.info(f"Creating namespace: {request.namespace.__root__}")
+        logger.info("Creating namespace: %s", request.namespace.__root__)
         
         # Check if namespace already exists
         namespace_exists = await NamespaceService.namespace_exists(request.namespace.__root__)
         if namespace_exists:
-            logger.warning(f"Namespace already exists: {request.namespace.__root__}")
+            logger.warning("Namespace already exists: %s", request.namespace.__root__)
             raise ValueError(f"Namespace already exists: {request.namespace.__root__}")
         
         # Insert new namespace
@@ -141,7 +172,7 @@ class NamespaceService:
         properties = request.properties or {}
         
         try:
-            await db.execute(query, request.namespace.__root__, json.dumps(properties))
+            await db.execute(query, request.namespace.__root__, properties)
             
             # Return the created namespace
             return CreateNamespaceResponse(
@@ -149,7 +180,7 @@ class NamespaceService:
                 properties=properties
             )
         except Exception as e:
-            logger.error(f"Error creating namespace: {str(e)}", exc_info=True)
+            logger.error("Error creating namespace: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -157,7 +188,7 @@ class NamespaceService:
         """
         Get metadata for a specific namespace.
         """
-        logger.info(f"Getting namespace metadata: {namespace_levels}")
+        logger.info("Getting namespace metadata: %s", namespace_levels)
         
         query = """
         SELECT levels, properties FROM namespaces
@@ -168,13 +199,10 @@ class NamespaceService:
             namespace_record = await db.fetch_one(query, namespace_levels)
             
             if not namespace_record:
-                logger.warning(f"Namespace not found: {namespace_levels}")
+                logger.warning("Namespace not found: %s", namespace_levels)
                 raise ValueError(f"Namespace not found: {namespace_levels}")
             
-            # Parse properties if it's a string
             properties = namespace_record["properties"]
-            if isinstance(properties, str):
-                properties = json.loads(properties)
             
             return GetNamespaceResponse(
                 namespace=Namespace(__root__=namespace_record["levels"]),
@@ -184,7 +212,7 @@ class NamespaceService:
             # Re-raise ValueError for not found
             raise
         except Exception as e:
-            logger.error(f"Error getting namespace: {str(e)}", exc_info=True)
+            logger.error("Error getting namespace: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -192,7 +220,7 @@ class NamespaceService:
         """
         Check if a namespace exists.
         """
-        logger.info(f"Checking if namespace exists: {namespace_levels}")
+        logger.info("Checking if namespace exists: %s", namespace_levels)
         
         query = """
         SELECT EXISTS(SELECT 1 FROM namespaces WHERE levels = $1)
@@ -202,7 +230,7 @@ class NamespaceService:
             result = await db.fetch_one(query, namespace_levels)
             return result and result["exists"]
         except Exception as e:
-            logger.error(f"Error checking namespace existence: {str(e)}", exc_info=True)
+            logger.error("Error checking namespace existence: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -210,12 +238,12 @@ class NamespaceService:
         """
         Drop a namespace. Namespace must be empty.
         """
-        logger.info(f"Dropping namespace: {namespace_levels}")
+        logger.info("Dropping namespace: %s", namespace_levels)
         
         # First check if namespace exists
         exists = await NamespaceService.namespace_exists(namespace_levels)
         if not exists:
-            logger.warning(f"Namespace not found: {namespace_levels}")
+            logger.warning("Namespace not found: %s", namespace_levels)
             raise ValueError(f"Namespace not found: {namespace_levels}")
         
         # Check if namespace has any tables or views
@@ -231,7 +259,7 @@ class NamespaceService:
             result = await db.fetch_one(query, namespace_levels)
             
             if result and result["has_children"]:
-                logger.warning(f"Cannot drop namespace, it is not empty: {namespace_levels}")
+                logger.warning("Cannot drop namespace, it is not empty: %s", namespace_levels)
                 raise ValueError(f"Namespace is not empty: {namespace_levels}")
             
             # Delete the namespace
@@ -240,12 +268,13 @@ class NamespaceService:
             """
             
             await db.execute(delete_query, namespace_levels)
+            NamespaceService.evict_namespace_id(namespace_levels)
             
         except ValueError:
             # Re-raise ValueError for not found or not empty
             raise
         except Exception as e:
-            logger.error(f"Error dropping namespace: {str(e)}", exc_info=True)
+            logger.error("Error dropping namespace: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -256,12 +285,12 @@ class NamespaceService:
         """
         Set or remove properties on a namespace.
         """
-        logger.info(f"Updating namespace properties: {namespace_levels}")
+        logger.info("Updating namespace properties: %s", namespace_levels)
         
         # Check if namespace exists
         exists = await NamespaceService.namespace_exists(namespace_levels)
         if not exists:
-            logger.warning(f"Namespace not found: {namespace_levels}")
+            logger.warning("Namespace not found: %s", namespace_levels)
             raise ValueError(f"Namespace not found: {namespace_levels}")
         
         # Check if any property key appears in both removals and updates
@@ -270,7 +299,7 @@ class NamespaceService:
         
         common_keys = set(removals).intersection(set(updates.keys()))
         if common_keys:
-            logger.warning(f"Property keys in both removals and updates: {common_keys}")
+            logger.warning("Property keys in both removals and updates: %s", common_keys)
             raise ValueError(f"Cannot remove and update the same property keys: {common_keys}")
         
         # Get current properties
@@ -281,10 +310,7 @@ class NamespaceService:
         try:
             namespace_record = await db.fetch_one(query, namespace_levels)
             
-            # Parse properties if it's a string
             properties = namespace_record["properties"]
-            if isinstance(properties, str):
-                properties = json.loads(properties)
             
             # Track missing properties (requested for removal but not found)
             missing_keys = []
@@ -311,7 +337,7 @@ class NamespaceService:
             WHERE levels = $2
             """
             
-            await db.execute(update_query, json.dumps(properties), namespace_levels)
+            await db.execute(update_query, properties, namespace_levels)
             
             # Prepare response
             response = UpdateNamespacePropertiesResponse(
@@ -328,5 +354,5 @@ class NamespaceService:
             # Re-raise ValueError for not found
             raise
         except Exception as e:
-            logger.error(f"Error updating namespace properties: {str(e)}", exc_info=True)
+            logger.error("Error updating namespace properties: %s", e, exc_info=True)
             raise
\ No newline at end of file
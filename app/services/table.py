@@ -1,32 +1,526 @@
 # app/services/table.py
-import json
+import asyncio
+import functools
+import itertools
+import logging
+import orjson
+import os
 import time
 import uuid
+from collections import Counter
+from urllib.parse import urlsplit
 from typing import Dict, List, Optional, Union, Any, Tuple
 from app.database import db
 from app.models.namespace import Namespace
+from app.services.namespace import NamespaceService
 from app.models.table import (
     TableIdentifier, ListTablesResponse, CreateTableRequest, RegisterTableRequest,
-    LoadTableResult, CommitTableRequest, CommitTableResponse, StorageCredential,
-    LoadCredentialsResponse, TableMetadata, PageToken, Schema, Snapshot, Summary,
-    PartitionSpec, SortOrder, ReportMetricsRequest, RenameTableRequest, 
+    LoadTableResult, LoadTableResultDict, CommitTableRequest, CommitTableResponse, StorageCredential,
+    LoadCredentialsResponse, TableMetadata, PageToken, SnapshotDict, SnapshotRefDict,
+    PartitionSpec, SortOrder, ReportMetricsRequest, ScanReport, RenameTableRequest, 
     TableRequirement, CommitTransactionRequest
 )
-from app.services.namespace import NamespaceService
 from app.utils.logger import logger
 import base64
+import asyncpg
+from cachetools import FIFOCache, LFUCache, LRUCache, TTLCache
 from app.services.credential import CredentialService
+from app.services.metrics import metrics_writer, write_metrics_rows
+
+# Static SQL used by the table service. Keeping these at module level avoids
+# rebuilding the strings on every call and keeps the text identical between
+# calls so asyncpg's per-connection statement cache can reuse the prepared plan.
+# list_tables variants (with/without page token, with/without page size).
+# Pagination is keyset-based: the page token carries the last name returned
+# and the next page starts after it, served by the UNIQUE (namespace_id, name)
+# index, so every page costs the same regardless of how deep it is.
+_LIST_TABLES_SQL = """
+SELECT name FROM tables
+WHERE namespace_id = $1
+ORDER BY name
+"""
+
+_LIST_TABLES_LIMIT_SQL = """
+SELECT name FROM tables
+WHERE namespace_id = $1
+ORDER BY name
+LIMIT $2
+"""
+
+_LIST_TABLES_AFTER_SQL = """
+SELECT name FROM tables
+WHERE namespace_id = $1 AND name > $2
+ORDER BY name
+"""
+
+_LIST_TABLES_AFTER_LIMIT_SQL = """
+SELECT name FROM tables
+WHERE namespace_id = $1 AND name > $2
+ORDER BY name
+LIMIT $3
+"""
+
+# Namespace id plus the id of table $2 in it, if there is one
+_NAMESPACE_ID_TABLE_EXISTS_SQL = """
+SELECT n.id, t.id AS table_id
+FROM namespaces n
+LEFT JOIN tables t ON t.namespace_id = n.id AND t.name = $2
+WHERE n.levels = $1
+"""
+
+_DEFAULT_WAREHOUSE_LOCATION_SQL = """
+SELECT config_json->'defaults'->>'warehouse.location' as warehouse_location
+FROM catalog_config
+LIMIT 1
+"""
+
+# Two unique-index probes: namespaces (levels), then tables (namespace_id, name)
+_TABLE_EXISTS_SQL = """
+SELECT EXISTS(
+    SELECT 1 FROM tables
+    WHERE namespace_id = (SELECT id FROM namespaces WHERE levels = $1)
+      AND name = $2
+)
+"""
+
+# Inserts the table row and its initial schema, partition spec and sort order
+# in one statement. $7, $9 and $11 double as the child rows' ids.
+_CREATE_TABLE_SQL = """
+WITH t AS (
+    INSERT INTO tables (
+        namespace_id, name, table_uuid, location,
+        last_updated_ms, last_column_id, schema_id,
+        current_schema_id, default_spec_id, last_partition_id,
+        default_sort_order_id, properties, format_version
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13
+    ) RETURNING id
+), s AS (
+    INSERT INTO schemas (table_id, schema_id, schema_json)
+    SELECT id, $7, $14 FROM t
+), p AS (
+    INSERT INTO partition_specs (table_id, spec_id, spec_json)
+    SELECT id, $9, $15 FROM t
+), o AS (
+    INSERT INTO sort_orders (table_id, order_id, order_json)
+    SELECT id, $11, $16 FROM t
+)
+SELECT id FROM t
+"""
+
+_TABLE_LOCATION_SQL = """
+SELECT location FROM tables WHERE id = $1
+"""
+
+# A table's location with one row per table-specific credential (NULL
+# credential columns when it has none)
+_TABLE_CREDENTIALS_SQL = """
+SELECT t.location, sc.prefix, sc.warehouse, sc.config
+FROM tables t
+LEFT JOIN storage_credentials sc ON sc.table_id = t.id
+WHERE t.id = $1
+"""
+
+_TABLE_CREDENTIALS_BY_NAME_SQL = """
+SELECT t.location, sc.prefix, sc.warehouse, sc.config
+FROM tables t
+JOIN namespaces n ON t.namespace_id = n.id
+LEFT JOIN storage_credentials sc ON sc.table_id = t.id
+WHERE n.levels = $1 AND t.name = $2
+"""
+
+_TABLE_BASIC_INFO_SQL = """
+SELECT t.id, t.table_uuid, t.last_updated_ms, t.format_version
+FROM tables t
+JOIN namespaces n ON t.namespace_id = n.id
+WHERE n.levels = $1 AND t.name = $2
+"""
+
+_TABLE_BASIC_INFO_BY_ID_SQL = """
+SELECT table_uuid, last_updated_ms, format_version FROM tables WHERE id = $1
+"""
+
+# Statistics upserts shared by the single and batched set-statistics handlers
+_UPSERT_TABLE_STATISTICS_SQL = """
+INSERT INTO table_statistics (
+    table_id, snapshot_id, statistics_path,
+    file_size_in_bytes, file_footer_size_in_bytes, blob_metadata
+)
+VALUES ($1, $2, $3, $4, $5, $6)
+ON CONFLICT (table_id, snapshot_id) DO UPDATE
+SET statistics_path = EXCLUDED.statistics_path,
+    file_size_in_bytes = EXCLUDED.file_size_in_bytes,
+    file_footer_size_in_bytes = EXCLUDED.file_footer_size_in_bytes,
+    blob_metadata = EXCLUDED.blob_metadata
+"""
+
+_UPSERT_PARTITION_STATISTICS_SQL = """
+INSERT INTO partition_statistics (
+    table_id, snapshot_id, statistics_path, file_size_in_bytes
+)
+VALUES ($1, $2, $3, $4)
+ON CONFLICT (table_id, snapshot_id) DO UPDATE
+SET statistics_path = EXCLUDED.statistics_path,
+    file_size_in_bytes = EXCLUDED.file_size_in_bytes
+"""
+
+# A table's row, all NULL if the namespace exists without the table and no
+# row at all if the namespace does not exist
+_TABLE_ROW_BY_NAME_SQL = """
+SELECT t.*
+FROM namespaces n
+LEFT JOIN tables t ON t.namespace_id = n.id AND t.name = $2
+WHERE n.levels = $1
+"""
+
+# Locks a table's row for the rest of the committing transaction, so concurrent
+# commits to the table run one after another, each against the committed state
+_LOCK_TABLE_ROW_SQL = """
+SELECT * FROM tables WHERE id = $1 FOR UPDATE
+"""
+
+# Moves a committed table's version: last_updated_ms only ever moves forward,
+# so the ETag and the content cache keys change with every commit
+_BUMP_TABLE_VERSION_SQL = """
+UPDATE tables SET
+    updated_at = clock_timestamp(),
+    last_updated_ms = GREATEST(
+        last_updated_ms + 1, (EXTRACT(EPOCH FROM clock_timestamp()) * 1000)::bigint
+    )
+WHERE id = $1
+"""
+
+# Requirement type -> check(table_record, requirement, ref_snapshot_ids), used
+# by TableService._validate_requirement
+_REQUIREMENT_CHECKS = {
+    # Table must not exist (never true here since the table was already loaded)
+    "assert-create": lambda table_record, requirement, refs: False,
+    "assert-table-uuid": lambda table_record, requirement, refs: (
+        str(table_record["table_uuid"]) == requirement.uuid
+    ),
+    # A null snapshot id means the ref must not exist
+    "assert-ref-snapshot-id": lambda table_record, requirement, refs: (
+        requirement.ref not in refs if requirement.snapshot_id is None
+        else refs.get(requirement.ref) == requirement.snapshot_id
+    ),
+    "assert-last-assigned-field-id": lambda table_record, requirement, refs: (
+        table_record["last_column_id"] == requirement.last_assigned_field_id
+    ),
+    "assert-current-schema-id": lambda table_record, requirement, refs: (
+        table_record["current_schema_id"] == requirement.current_schema_id
+    ),
+    "assert-last-assigned-partition-id": lambda table_record, requirement, refs: (
+        table_record["last_partition_id"] == requirement.last_assigned_partition_id
+    ),
+    "assert-default-spec-id": lambda table_record, requirement, refs: (
+        table_record["default_spec_id"] == requirement.default_spec_id
+    ),
+    "assert-default-sort-order-id": lambda table_record, requirement, refs: (
+        table_record["default_sort_order_id"] == requirement.default_sort_order_id
+    ),
+}
+
+# Current snapshot ids of the named refs $2, checked by assert-ref-snapshot-id
+_REF_SNAPSHOT_IDS_SQL = """
+SELECT name, snapshot_id FROM snapshot_refs
+WHERE table_id = $1 AND name = ANY($2::text[])
+"""
+
+# A table row together with everything under it, so a load is one round trip.
+# Child rows come back as jsonb arrays correlated on t.id, each row a positional
+# array in the column order listed so the loaders can unpack it directly. The
+# snapshot list is filtered by {mode} ('refs' for only referenced snapshots,
+# NULL for all) and capped at the {limit} most recent (NULL for no cap).
+_TABLE_COLUMNS = """
+       t.id, t.table_uuid, t.location, t.current_snapshot_id, t.last_sequence_number,
+       t.last_updated_ms, t.last_column_id, t.schema_id, t.current_schema_id,
+       t.default_spec_id, t.last_partition_id, t.default_sort_order_id,
+       t.properties, t.format_version, t.row_lineage, t.next_row_id,
+       COALESCE((
+           SELECT jsonb_agg(jsonb_build_array(schema_id, schema_json))
+           FROM schemas WHERE table_id = t.id
+       ), '[]') AS schemas,
+       COALESCE((
+           SELECT jsonb_agg(jsonb_build_array(spec_id, spec_json))
+           FROM partition_specs WHERE table_id = t.id
+       ), '[]') AS specs,
+       COALESCE((
+           SELECT jsonb_agg(jsonb_build_array(order_id, order_json))
+           FROM sort_orders WHERE table_id = t.id
+       ), '[]') AS orders,
+       COALESCE((
+           SELECT jsonb_agg(jsonb_build_array(
+               s.snapshot_id, s.parent_snapshot_id, s.sequence_number, s.timestamp_ms,
+               s.manifest_list, s.summary, s.schema_id
+           ) ORDER BY s.sequence_number) FROM (
+               SELECT snapshot_id, parent_snapshot_id, sequence_number, timestamp_ms,
+                      manifest_list, summary, schema_id
+               FROM snapshots sn
+               WHERE sn.table_id = t.id
+                 AND ({mode}::text IS DISTINCT FROM 'refs' OR EXISTS (
+                     SELECT 1 FROM snapshot_refs sr
+                     WHERE sr.table_id = sn.table_id AND sr.snapshot_id = sn.snapshot_id
+                 ))
+               ORDER BY sequence_number DESC
+               LIMIT {limit}::bigint
+           ) s
+       ), '[]') AS snapshots,
+       COALESCE((
+           SELECT jsonb_agg(jsonb_build_array(
+               r.name, r.snapshot_id, r.type, r.min_snapshots_to_keep,
+               r.max_snapshot_age_ms, r.max_ref_age_ms
+           )) FROM (
+               SELECT name, snapshot_id, type, min_snapshots_to_keep,
+                      max_snapshot_age_ms, max_ref_age_ms
+               FROM snapshot_refs WHERE table_id = t.id
+           ) r
+       ), '[]') AS refs
+"""
+
+_LOAD_TABLE_BY_ID_SQL = """
+SELECT {columns}
+FROM tables t
+WHERE t.id = $1
+""".format(columns=_TABLE_COLUMNS.format(mode="$2", limit="$3"))
+
+_TABLE_ID_LOCATION_SQL = """
+SELECT id, location FROM tables WHERE namespace_id = $1 AND name = $2
+"""
+
+_DELETE_TABLE_SQL = """
+DELETE FROM tables WHERE id = $1
+"""
+
+# Renames in a single statement. Returns no row if either namespace or the
+# source table is missing, or if the destination name is already taken.
+_RENAME_TABLE_SQL = """
+UPDATE tables
+SET namespace_id = dst.id, name = $4, updated_at = NOW()
+FROM namespaces src, namespaces dst
+WHERE src.levels = $1 AND dst.levels = $3
+  AND tables.namespace_id = src.id AND tables.name = $2
+  AND NOT EXISTS (
+      SELECT 1 FROM tables existing
+      WHERE existing.namespace_id = dst.id AND existing.name = $4
+  )
+RETURNING tables.id
+"""
+
+_RENAME_DIAGNOSTICS_SQL = """
+SELECT
+    EXISTS(SELECT 1 FROM namespaces WHERE levels = $1) AS source_namespace_exists,
+    EXISTS(SELECT 1 FROM namespaces WHERE levels = $3) AS destination_namespace_exists,
+    EXISTS(
+        SELECT 1 FROM tables t
+        JOIN namespaces n ON t.namespace_id = n.id
+        WHERE n.levels = $1 AND t.name = $2
+    ) AS source_table_exists,
+    EXISTS(
+        SELECT 1 FROM tables t
+        JOIN namespaces n ON t.namespace_id = n.id
+        WHERE n.levels = $3 AND t.name = $4
+    ) AS destination_table_exists
+"""
+
+# Metrics reports resolve the table id inside the INSERT; an unknown table
+# inserts nothing and returns no row.
+_INSERT_SCAN_METRICS_SQL = """
+INSERT INTO operation_metrics (
+    table_id, report_type, snapshot_id, filter_json,
+    schema_id, projected_field_ids, projected_field_names,
+    metrics_json, metadata_json, created_at
+)
+SELECT t.id, $3, $4, $5, $6, $7, $8, $9, $10, NOW()
+FROM tables t
+JOIN namespaces n ON t.namespace_id = n.id
+WHERE n.levels = $1 AND t.name = $2
+RETURNING table_id
+"""
+
+_INSERT_COMMIT_METRICS_SQL = """
+INSERT INTO operation_metrics (
+    table_id, report_type, snapshot_id, sequence_number,
+    operation, metrics_json, metadata_json, created_at
+)
+SELECT t.id, $3, $4, $5, $6, $7, $8, NOW()
+FROM tables t
+JOIN namespaces n ON t.namespace_id = n.id
+WHERE n.levels = $1 AND t.name = $2
+RETURNING table_id
+"""
+
+_TABLE_ID_SQL = """
+SELECT t.id FROM tables t
+JOIN namespaces n ON t.namespace_id = n.id
+WHERE n.levels = $1 AND t.name = $2
+"""
+
+# Seconds a cached (namespace, table name) -> table id mapping stays valid
+TABLE_ID_CACHE_TTL = 60
+
+# Seconds the default warehouse location from catalog_config is reused. The
+# catalog never writes catalog_config itself, so the cache is TTL-only: changes
+# made directly in the database apply within this many seconds.
+WAREHOUSE_LOCATION_CACHE_TTL = 60
+
+# Bounds of the table metadata cache used for 304 responses. The policy picks
+# which entry goes when the cache is full: "lru" (least recently read), "lfu"
+# (least often read) or "fifo" (oldest written). Independently of the policy,
+# each entry carries its own expiry and is dropped when read after the TTL,
+# which bounds staleness from commits made by other processes.
+TABLE_METADATA_CACHE_SIZE = int(os.getenv("TABLE_METADATA_CACHE_SIZE", "10000"))
+TABLE_METADATA_CACHE_TTL = int(os.getenv("TABLE_METADATA_CACHE_TTL", "300"))
+TABLE_METADATA_CACHE_POLICY = os.getenv("TABLE_METADATA_CACHE_POLICY", "lru").lower()
+
+
+# Conditional loads answer 304 from a short-lived (table id, ETag) cache, so
+# clients polling an unchanged table do not hit the database. Writes in this
+# process invalidate entries; the TTL bounds staleness from other processes.
+TABLE_ETAG_CACHE_SIZE = 50000
+TABLE_ETAG_CACHE_TTL = 2  # seconds
+
+
+def _make_table_metadata_cache():
+    """
+    Build the table metadata cache for the configured eviction policy. The cache
+    only evicts by size; TableService checks the expiry stored with each entry.
+    """
+    if TABLE_METADATA_CACHE_POLICY == "lfu":
+        return LFUCache(maxsize=TABLE_METADATA_CACHE_SIZE)
+    if TABLE_METADATA_CACHE_POLICY == "fifo":
+        return FIFOCache(maxsize=TABLE_METADATA_CACHE_SIZE)
+    return LRUCache(maxsize=TABLE_METADATA_CACHE_SIZE)
+
+
+# Built table metadata served by build_table_response_dict without re-querying
+TABLE_CONTENT_CACHE_SIZE = int(os.getenv("TABLE_CONTENT_CACHE_SIZE", "4096"))
+TABLE_CONTENT_CACHE_TTL = int(os.getenv("TABLE_CONTENT_CACHE_TTL", "60"))
+
+# Background refresh of the most loaded tables' cached metadata, so their loads
+# keep hitting the content cache. An interval of 0 disables it; keep it below
+# TABLE_CONTENT_CACHE_TTL so hot entries are rebuilt before they expire.
+TABLE_PREFETCH_INTERVAL_MS = int(os.getenv("TABLE_PREFETCH_INTERVAL_MS", "0"))
+TABLE_PREFETCH_HOT_TABLES = int(os.getenv("TABLE_PREFETCH_HOT_TABLES", "100"))
+
+
+# Metadata rows were written from validated request models, so by default they
+# are turned back into models without re-running validation. Set
+# TRUSTED_DB_ROWS=false to validate them again, e.g. after loading rows by hand.
+TRUSTED_DB_ROWS = os.getenv("TRUSTED_DB_ROWS", "true").lower() == "true"
+
+
+def _from_db_row(model, data: Dict):
+    """Build a model from alias-keyed data read back from the database."""
+    if TRUSTED_DB_ROWS:
+        return model.construct(**data)
+    return model.parse_obj(data)
+
+
+def _refs_from_rows(ref_records: List) -> Dict[str, SnapshotRefDict]:
+    """
+    Build the refs map from positional snapshot_refs rows, leaving out unset
+    retention settings (type and snapshot_id are NOT NULL columns).
+    """
+    return {
+        name: {
+            key: value for key, value in (
+                ("type", ref_type),
+                ("snapshot-id", snapshot_id),
+                ("min-snapshots-to-keep", min_snapshots_to_keep),
+                ("max-snapshot-age-ms", max_snapshot_age_ms),
+                ("max-ref-age-ms", max_ref_age_ms),
+            ) if value is not None
+        }
+        for name, snapshot_id, ref_type, min_snapshots_to_keep, max_snapshot_age_ms, max_ref_age_ms in ref_records
+    }
+
+
+def _table_metadata_dict(table_record, basic_metadata: Dict) -> Dict:
+    """
+    Assemble a _TABLE_COLUMNS row as an alias-keyed table metadata dict, taking
+    format-version, table-uuid and last-updated-ms from basic_metadata.
+    """
+    schema_records = table_record["schemas"]
+    spec_records = table_record["specs"]
+    order_records = table_record["orders"]
+    snapshot_records = table_record["snapshots"]
+    ref_records = table_record["refs"]
+    # schema-id, spec-id and partition field-ids are set on write (and by app.migrations for older rows),
+    # so the stored documents are copied out as-is
+    schemas = [schema_json for _, schema_json in schema_records]
+    partition_specs = [spec_json for _, spec_json in spec_records]
+    
+    # Build sort orders
+    sort_orders = [order_json for _, order_json in order_records]
+    
+    # Build snapshots
+    snapshots_list: List[SnapshotDict] = [
+        {
+            "snapshot-id": snapshot_id,
+            "parent-snapshot-id": parent_snapshot_id,
+            "sequence-number": sequence_number,
+            "timestamp-ms": timestamp_ms,
+            "manifest-list": manifest_list,
+            "summary": summary,
+            "schema-id": snapshot_schema_id
+        }
+        for (
+            snapshot_id, parent_snapshot_id, sequence_number, timestamp_ms,
+            manifest_list, summary, snapshot_schema_id
+        ) in snapshot_records
+    ]
+    
+    # Build snapshot references
+    refs = _refs_from_rows(ref_records)
+    
+    # Handle properties
+    properties = table_record["properties"]
+    
+    # Construct table metadata; row_lineage and next_row_id are left out since
+    # TableMetadata has no fields for them (format versions 1 and 2)
+    return {
+        "format-version": basic_metadata["format-version"],
+        "table-uuid": basic_metadata["table-uuid"],
+        "location": table_record["location"],
+        "last-updated-ms": basic_metadata.get("last-updated-ms", table_record["last_updated_ms"]),
+        "properties": properties or {},
+        "schemas": schemas,
+        "current-schema-id": table_record["current_schema_id"],
+        "last-column-id": table_record["last_column_id"],
+        "partition-specs": partition_specs,
+        "default-spec-id": table_record["default_spec_id"],
+        "last-partition-id": table_record["last_partition_id"],
+        "sort-orders": sort_orders,
+        "default-sort-order-id": table_record["default_sort_order_id"],
+        "snapshots": snapshots_list,
+        "refs": refs,
+        "current-snapshot-id": table_record["current_snapshot_id"],
+        "last-sequence-number": table_record["last_sequence_number"]
+    }
+
+
 class TableService:
     
     @staticmethod
     def encode_page_token(value: str) -> str:
-        """Encode a page token value"""
-        return base64.b64encode(value.encode()).decode()
+        """Encode a page token value as unpadded URL-safe base64 JSON, leaving room for more sort keys"""
+        return base64.urlsafe_b64encode(orjson.dumps({"n": value})).rstrip(b"=").decode("ascii")
     
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def decode_page_token(token: str) -> str:
-        """Decode a page token value"""
-        return base64.b64decode(token.encode()).decode()
+        """
+        Decode a page token value, accepting the older padded and plain base64 forms too.
+        Memoized since paginating clients tend to replay the same tokens.
+        """
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        try:
+            decoded = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            decoded = None
+        if isinstance(decoded, dict) and "n" in decoded:
+            return decoded["n"]
+        return raw.decode()
     
     @staticmethod
     async def list_tables(
@@ -37,52 +531,39 @@ class TableService:
         """
         List all table identifiers under a given namespace.
         """
-        logger.info(f"Listing tables in namespace: {namespace_levels}")
+        logger.info("Listing tables in namespace: %s", namespace_levels)
         
-        # Verify namespace exists
-        namespace_exists = await NamespaceService.namespace_exists(namespace_levels)
-        if not namespace_exists:
-            logger.warning(f"Namespace not found: {namespace_levels}")
+        # Get namespace ID; None means the namespace does not exist
+        namespace_id = await NamespaceService.get_namespace_id(namespace_levels)
+        if namespace_id is None:
+            logger.warning("Namespace not found: %s", namespace_levels)
             raise ValueError(f"Namespace not found: {namespace_levels}")
-        
-        # Get namespace ID
-        query = """
-        SELECT id FROM namespaces WHERE levels = $1
-        """
-        namespace_record = await db.fetch_one(query, namespace_levels)
-        namespace_id = namespace_record["id"]
-        
-        # Build query for tables
-        tables_query = """
-        SELECT name FROM tables 
-        WHERE namespace_id = $1
-        """
+
+        # Pick the static query variant for the requested pagination
         params = [namespace_id]
-        
+
         # Handle page token
         if page_token:
             try:
                 last_seen = TableService.decode_page_token(page_token)
-                tables_query += " AND name > $2"
                 params.append(last_seen)
-                logger.debug(f"Using page token, starting after: {last_seen}")
+                logger.debug("Using page token, starting after: %s", last_seen)
             except Exception as e:
-                logger.error(f"Invalid page token: {page_token}", exc_info=True)
+                logger.error("Invalid page token: %s", page_token, exc_info=True)
                 raise ValueError(f"Invalid page token: {page_token}")
-        
-        # Add ordering
-        tables_query += " ORDER BY name"
-        
+
         # Add limit for pagination
         if page_size:
             # Request one more than needed to check if there are more results
-            tables_query += f" LIMIT ${len(params) + 1}"
             params.append(page_size + 1)
-            logger.debug(f"Using page size: {page_size}")
+            logger.debug("Using page size: %s", page_size)
+            tables_query = _LIST_TABLES_AFTER_LIMIT_SQL if page_token else _LIST_TABLES_LIMIT_SQL
+        else:
+            tables_query = _LIST_TABLES_AFTER_SQL if page_token else _LIST_TABLES_SQL
         
         # Execute query
         try:
-            logger.debug(f"Executing query: {tables_query}")
+            logger.debug("Executing query: %s", tables_query)
             table_records = await db.fetch_all(tables_query, *params)
             
             # Handle pagination
@@ -99,7 +580,7 @@ class TableService:
                 ) for record in table_records
             ]
             
-            logger.info(f"Found {len(identifiers)} tables in namespace {namespace_levels}")
+            logger.info("Found %s tables in namespace %s", len(identifiers), namespace_levels)
             
             # Build response
             response = ListTablesResponse(identifiers=identifiers)
@@ -109,35 +590,41 @@ class TableService:
                 last_table = table_records[-1]["name"]
                 next_token = TableService.encode_page_token(last_table)
                 response.next_page_token = PageToken(__root__=next_token)
-                logger.debug(f"More tables exist, generated next page token")
+                logger.debug("More tables exist, generated next page token")
             
             return response
             
         except Exception as e:
-            logger.error(f"Error listing tables: {str(e)}", exc_info=True)
+            logger.error("Error listing tables: %s", e, exc_info=True)
             raise
     
+    # (default warehouse location, expiry)
+    _warehouse_location_cache: Optional[Tuple[str, float]] = None
+
     @staticmethod
     async def get_default_warehouse_location() -> str:
-        """Get the default warehouse location from catalog config."""
+        """Get the default warehouse location from catalog config, cached for WAREHOUSE_LOCATION_CACHE_TTL seconds."""
+        cached = TableService._warehouse_location_cache
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        
         try:
-            query = """
-            SELECT config_json->'defaults'->>'warehouse.location' as warehouse_location
-            FROM catalog_config
-            LIMIT 1
-            """
-            result = await db.fetch_one(query)
+            result = await db.fetch_one(_DEFAULT_WAREHOUSE_LOCATION_SQL)
             
             if result and result["warehouse_location"]:
                 warehouse_location = result["warehouse_location"]
-                logger.debug(f"Using configured warehouse location: {warehouse_location}")
-                return warehouse_location
+                logger.debug("Using configured warehouse location: %s", warehouse_location)
+            else:
+                # Fallback to default if not configured
+                logger.warning("Default warehouse location not configured, using fallback value")
+                warehouse_location = "s3://default-warehouse"
             
-            # Fallback to default if not configured
-            logger.warning("Default warehouse location not configured, using fallback value")
-            return "s3://default-warehouse"
+            TableService._warehouse_location_cache = (
+                warehouse_location, time.monotonic() + WAREHOUSE_LOCATION_CACHE_TTL
+            )
+            return warehouse_location
         except Exception as e:
-            logger.error(f"Error fetching default warehouse location: {str(e)}", exc_info=True)
+            logger.error("Error fetching default warehouse location: %s", e, exc_info=True)
             return "s3://default-warehouse"  # Fallback to default
 
     @staticmethod
@@ -145,23 +632,15 @@ class TableService:
         """
         Check if a table exists within a namespace.
         """
-        logger.info(f"Checking if table exists: {namespace_levels}.{table_name}")
-        
-        query = """
-        SELECT EXISTS(
-            SELECT 1 FROM tables t
-            JOIN namespaces n ON t.namespace_id = n.id
-            WHERE n.levels = $1 AND t.name = $2
-        )
-        """
-        
+        logger.info("Checking if table exists: %s.%s", namespace_levels, table_name)
+
         try:
-            result = await db.fetch_one(query, namespace_levels, table_name)
+            result = await db.fetch_one(_TABLE_EXISTS_SQL, namespace_levels, table_name)
             exists = result and result["exists"]
-            logger.info(f"Table {namespace_levels}.{table_name} exists: {exists}")
+            logger.info("Table %s.%s exists: %s", namespace_levels, table_name, exists)
             return exists
         except Exception as e:
-            logger.error(f"Error checking table existence: {str(e)}", exc_info=True)
+            logger.error("Error checking table existence: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -173,29 +652,30 @@ class TableService:
         """
         Create a new table in the given namespace.
         """
-        logger.info(f"Creating table {request.name} in namespace {namespace_levels}")
+        logger.info("Creating table %s in namespace %s", request.name, namespace_levels)
         
-        # Verify namespace exists
-        namespace_exists = await NamespaceService.namespace_exists(namespace_levels)
-        if not namespace_exists:
-            logger.warning(f"Namespace not found: {namespace_levels}")
+        # Resolve the namespace and check for an existing table in one query, looking up
+        # the default warehouse location alongside it when the request has no location
+        namespace_query = db.fetch_one(_NAMESPACE_ID_TABLE_EXISTS_SQL, namespace_levels, request.name)
+        if request.location:
+            namespace_record = await namespace_query
+        else:
+            namespace_record, default_warehouse = await asyncio.gather(
+                namespace_query, TableService.get_default_warehouse_location()
+            )
+        if not namespace_record:
+            logger.warning("Namespace not found: %s", namespace_levels)
             raise ValueError(f"Namespace not found: {namespace_levels}")
         
-        # Check if table already exists
-        table_exists = await TableService.table_exists(namespace_levels, request.name)
-        if table_exists:
-            logger.warning(f"Table already exists: {namespace_levels}.{request.name}")
+        if namespace_record["table_id"] is not None:
+            logger.warning("Table already exists: %s.%s", namespace_levels, request.name)
             raise ValueError(f"Table already exists: {namespace_levels}.{request.name}")
         
-        # Get namespace ID
-        query = """
-        SELECT id FROM namespaces WHERE levels = $1
-        """
-        namespace_record = await db.fetch_one(query, namespace_levels)
         namespace_id = namespace_record["id"]
-        
-        # Generate table UUID and other metadata
-        table_uuid = str(uuid.uuid4())
+
+        # Generate table UUID and other metadata. The UUID goes to asyncpg as-is
+        # (binary uuid); the response model takes its string form.
+        table_uuid = uuid.uuid4()
         now_ms = int(time.time() * 1000)
         format_version = 2  # Default to the latest version
         
@@ -205,37 +685,32 @@ class TableService:
             # # Default location based on namespace and table name
             # location = f"s3://default-warehouse/{'.'.join(namespace_levels)}/{request.name}"
             # logger.debug(f"Using default location: {location}")
-            # Get default warehouse location from config
-            default_warehouse = await TableService.get_default_warehouse_location()
+            # Default warehouse location from config, fetched above
             location = f"{default_warehouse}/{'.'.join(namespace_levels)}/{request.name}"
-            logger.debug(f"Using default location: {location}")
+            logger.debug("Using default location: %s", location)
         try:
             async with db.transaction():
                 # Process schema - Ensure schema_id is properly set
-                schema_json = json.loads(request.schema_.json(by_alias=True))
+                schema_json = request.schema_.dict(by_alias=True)
                 schema_id = 0  # Initial schema ID
                 
-                # Add schema_id to schema_json if not already present
-                if "schema-id" not in schema_json:
+                # Add schema_id to schema_json if not already set (the dumped model
+                # carries the key with a None value)
+                if schema_json.get("schema-id") is None:
                     schema_json["schema-id"] = schema_id
                 
-                # Check for identifier fields (primary keys)
-                identifier_field_ids = []
-                for field in request.schema_.fields:
-                    # We can add logic here to detect primary key fields 
-                    # For now, we'll set an empty array which is valid for tables without primary keys
-                    if hasattr(field, 'is_primary_key') and field.is_primary_key:
-                        identifier_field_ids.append(field.id)
+                # Check for identifier fields (primary keys). No field model defines
+                # is_primary_key yet, so this is normally empty, which is valid for
+                # tables without primary keys.
+                fields = request.schema_.fields
+                identifier_field_ids = [f.id for f in fields if getattr(f, 'is_primary_key', False)]
                 
                 # Add identifier_field_ids to schema if we found any
                 if identifier_field_ids:
                     schema_json["identifier-field-ids"] = identifier_field_ids
                 
                 # Calculate last column ID based on schema
-                last_column_id = 0
-                for field in request.schema_.fields:
-                    if field.id > last_column_id:
-                        last_column_id = field.id
+                last_column_id = max((f.id for f in fields), default=0)
                 
                 # Process partition spec - Ensure spec_id is properly set
                 partition_spec_json = None
@@ -243,10 +718,10 @@ class TableService:
                 last_partition_id = 0
                 
                 if request.partition_spec:
-                    partition_spec_json = json.loads(request.partition_spec.json(by_alias=True))
+                    partition_spec_json = request.partition_spec.dict(by_alias=True)
                     
-                    # Add spec-id if not present
-                    if "spec-id" not in partition_spec_json:
+                    # Add spec-id if not set
+                    if partition_spec_json.get("spec-id") is None:
                         partition_spec_json["spec-id"] = spec_id
                     
                     # Ensure all partition fields have field_id
@@ -268,8 +743,10 @@ class TableService:
                 sort_order_id = 0
                 
                 if request.write_order:
-                    sort_order_json = json.loads(request.write_order.json(by_alias=True))
-                    sort_order_id = request.write_order.order_id
+                    sort_order_json = request.write_order.dict(by_alias=True)
+                    if sort_order_json.get("order-id") is None:
+                        sort_order_json["order-id"] = sort_order_id
+                    sort_order_id = sort_order_json["order-id"]
                 else:
                     # Create empty default sort order
                     sort_order_json = {"order-id": 0, "fields": []}
@@ -277,59 +754,31 @@ class TableService:
                 # Convert properties
                 properties = request.properties or {}
                 
-                # Insert table record
-                table_insert_query = """
-                INSERT INTO tables (
-                    namespace_id, name, table_uuid, location, 
-                    last_updated_ms, last_column_id, schema_id, 
-                    current_schema_id, default_spec_id, last_partition_id,
-                    default_sort_order_id, properties, format_version
-                ) VALUES (
-                    $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13
-                ) RETURNING id
-                """
-                
+                # Insert the table record together with its schema, partition spec and sort order.
+                # The jsonb values go in as dicts; the pool's codec serializes them with orjson.
                 table_record = await db.fetch_one(
-                    table_insert_query,
+                    _CREATE_TABLE_SQL,
                     namespace_id, request.name, table_uuid, location,
                     now_ms, last_column_id, schema_id, schema_id, spec_id,
-                    last_partition_id, sort_order_id, json.dumps(properties),
-                    format_version
+                    last_partition_id, sort_order_id, properties,
+                    format_version,
+                    schema_json,
+                    partition_spec_json,
+                    sort_order_json
                 )
                 
                 table_id = table_record["id"]
-                logger.debug(f"Created table record with ID: {table_id}")
-                
-                # Insert schema
-                schema_insert_query = """
-                INSERT INTO schemas (table_id, schema_id, schema_json)
-                VALUES ($1, $2, $3)
-                """
-                await db.execute(schema_insert_query, table_id, schema_id, json.dumps(schema_json))
-                logger.debug(f"Added schema {schema_id} to table {table_id}")
-                
-                # Insert partition spec
-                spec_insert_query = """
-                INSERT INTO partition_specs (table_id, spec_id, spec_json)
-                VALUES ($1, $2, $3)
-                """
-                await db.execute(spec_insert_query, table_id, spec_id, json.dumps(partition_spec_json))
-                logger.debug(f"Added partition spec {spec_id} to table {table_id}")
-                
-                # Insert sort order
-                order_insert_query = """
-                INSERT INTO sort_orders (table_id, order_id, order_json)
-                VALUES ($1, $2, $3)
-                """
-                await db.execute(order_insert_query, table_id, sort_order_id, json.dumps(sort_order_json))
-                logger.debug(f"Added sort order {sort_order_id} to table {table_id}")
+                logger.debug(
+                    "Created table record with ID: %s, schema %s, partition spec %s, sort order %s",
+                    table_id, schema_id, spec_id, sort_order_id
+                )
 
                 # Handle credentials if provided
                 if hasattr(request, 'credentials') and request.credentials:
                     # Process credentials
                     prefix = namespace_levels[0] if namespace_levels else 'default'
-                    warehouse_parts = location.split('/')
-                    warehouse = '/'.join(warehouse_parts[:3]) + '/'  # e.g., s3://bucket/
+                    location_parts = urlsplit(location)
+                    warehouse = f"{location_parts.scheme}://{location_parts.netloc}/"  # e.g., s3://bucket/
                     
                     existing_creds = await CredentialService.get_credentials_for_location(location)
                     
@@ -340,12 +789,12 @@ class TableService:
                             request.credentials.config,
                             None
                         )
-                        logger.debug(f"Added credentials with ID: {cred_id} for warehouse: {warehouse}")
+                        logger.debug("Added credentials with ID: %s for warehouse: %s", cred_id, warehouse)
                 
                 # Prepare response metadata
                 table_metadata = TableMetadata.parse_obj({
                     "format-version": format_version,
-                    "table-uuid": table_uuid,
+                    "table-uuid": str(table_uuid),
                     "location": location,
                     "last-updated-ms": now_ms,
                     "properties": properties,
@@ -365,10 +814,10 @@ class TableService:
                 
                 # Generate metadata location - This is critical!
                 metadata_location = f"{location}/metadata/00000-{uuid.uuid4()}.metadata.json"
-                logger.info(f"Created table {request.name} in namespace {namespace_levels} with UUID {table_uuid}")
+                logger.info("Created table %s in namespace %s with UUID %s", request.name, namespace_levels, table_uuid)
                 
                 # Get table configuration
-                config = await TableService.get_table_config(table_id)
+                config = await TableService.get_table_config(table_id, location=location)
                 
                 # Get storage credentials if requested
                 storage_credentials = None
@@ -387,56 +836,39 @@ class TableService:
             # Re-raise ValueError for not found or table exists
             raise
         except Exception as e:
-            logger.error(f"Error creating table: {str(e)}", exc_info=True)
+            logger.error("Error creating table: %s", e, exc_info=True)
             raise
     
     @staticmethod
-    async def get_table_config(table_id: int) -> Dict[str, str]:
+    async def get_table_config(table_id: int, location: Optional[str] = None) -> Dict[str, str]:
         """
         Get table-specific configuration from credentials.
+        The table location is looked up unless the caller already has it.
         """
-        logger.debug(f"Getting table config for table ID: {table_id}")
+        logger.debug("Getting table config for table ID: %s", table_id)
         
         # Get table location
-        location_query = """
-        SELECT location FROM tables WHERE id = $1
-        """
-        location_record = await db.fetch_one(location_query, table_id)
-        
-        if not location_record:
-            logger.warning(f"No table found with ID: {table_id}")
-            return {}
+        if location is None:
+            location_record = await db.fetch_one(_TABLE_LOCATION_SQL, table_id)
             
-        location = location_record["location"]
-        logger.debug(f"Table location: {location}")
-        
-        # Get all credentials
-        all_creds_query = """
-        SELECT prefix, warehouse, config FROM storage_credentials
-        WHERE table_id IS NULL
-        """
-        all_creds = await db.fetch_all(all_creds_query)
-        logger.debug(f"Found {len(all_creds)} total credentials to check")
-        
-        # Find matching credential by direct string comparison
-        matched_cred = None
-        for cred in all_creds:
-            warehouse = cred["warehouse"]
-            logger.debug(f"Checking if location '{location}' starts with warehouse '{warehouse}'")
-            if location.startswith(warehouse):
-                logger.debug(f"MATCH FOUND: '{location}' starts with '{warehouse}'")
-                matched_cred = cred
-                break
+            if not location_record:
+                logger.warning("No table found with ID: %s", table_id)
+                return {}
+                
+            location = location_record["location"]
+        logger.debug("Table location: %s", location)
+        
+        # Find the credential whose warehouse is the longest prefix of the location
+        matches = await CredentialService.match_global_credentials(location)
+        matched_cred = matches[0] if matches else None
+        logger.debug("Matching credential found for '%s': %s", location, matched_cred is not None)
         
         if matched_cred:
             # Convert credential to table config
             config = matched_cred["config"]
-            logger.debug(f"Credential config --->: {config}")
-            if isinstance(config, str):
-                config = json.loads(config)
-                logger.debug(f"Credential config: {config}")
+            logger.debug("Credential config: %s", config)
             
-            logger.info(f"Using credential with prefix={matched_cred['prefix']}, warehouse={matched_cred['warehouse']}")
+            logger.info("Using credential with prefix=%s, warehouse=%s", matched_cred['prefix'], matched_cred['warehouse'])
             
             # Convert the credential format to table config format
             table_config = {}
@@ -457,11 +889,11 @@ class TableService:
             if "use-instance-credentials" in config and config["use-instance-credentials"] == "true":
                 table_config["s3.use-instance-credentials"] = "true"
             
-            logger.debug(f"Generated table config: {table_config}")
+            logger.debug("Generated table config: %s", table_config)
             return table_config
         
         # Fallback to defaults only when needed
-        logger.warning(f"No matching credentials found for {location}, using defaults")
+        logger.warning("No matching credentials found for %s, using defaults", location)
         return {
             "client.region": "us-east-1", 
             "s3.use-instance-credentials": "true"
@@ -474,17 +906,17 @@ class TableService:
         if_none_match: Optional[str] = None
     ) -> Tuple[int, str, Optional[Dict]]:
         """Get basic table info and check if it matches the ETag."""
-        query = """
-        SELECT t.id, t.table_uuid, t.last_updated_ms, t.format_version
-        FROM tables t
-        JOIN namespaces n ON t.namespace_id = n.id
-        WHERE n.levels = $1 AND t.name = $2
-        """
+        cache_key = (tuple(namespace_levels), table_name)
+        if if_none_match:
+            cached = TableService._table_etag_cache.get(cache_key)
+            if cached and cached[1] == if_none_match:
+                logger.info("Table %s.%s not modified (cached ETag), returning 304", namespace_levels, table_name)
+                return cached[0], cached[1], None
         
-        table_record = await db.fetch_one(query, namespace_levels, table_name)
+        table_record = await db.fetch_one(_TABLE_BASIC_INFO_SQL, namespace_levels, table_name)
         
         if not table_record:
-            logger.warning(f"Table not found: {namespace_levels}.{table_name}")
+            logger.warning("Table not found: %s.%s", namespace_levels, table_name)
             raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
         
         table_id = table_record["id"]
@@ -493,879 +925,348 @@ class TableService:
         
         # Generate ETag
         etag = f'"{table_uuid}-{last_updated_ms}"'
+        TableService._table_etag_cache[cache_key] = (table_id, etag)
         
         # Check If-None-Match header
         if if_none_match and if_none_match == etag:
-            logger.info(f"Table {namespace_levels}.{table_name} not modified, returning 304")
+            logger.info("Table %s.%s not modified, returning 304", namespace_levels, table_name)
             return table_id, etag, None
         
         # Return basic table metadata
         return table_id, etag, {
             "format-version": table_record["format_version"],
             "table-uuid": table_uuid,
+            "last-updated-ms": last_updated_ms,
         }
     
-    # Simple in-memory cache for table metadata to support 304 responses
-    _table_metadata_cache = {}
+    # Bounded in-memory cache for table metadata to support 304 responses, keyed
+    # by (namespace levels, table name); see TABLE_METADATA_CACHE_* for size,
+    # TTL and eviction policy
+    _table_metadata_cache = _make_table_metadata_cache()
+
+    # (table id, last-updated-ms, snapshots, max_snapshots) -> (metadata location,
+    # metadata dict); see TABLE_CONTENT_CACHE_*. Commits do not always move
+    # last-updated-ms, so writes evict a table's entries through
+    # evict_table_content() and the TTL bounds what other processes change.
+    _table_content_cache = TTLCache(maxsize=TABLE_CONTENT_CACHE_SIZE, ttl=TABLE_CONTENT_CACHE_TTL)
+    # Content cache key -> lock held while that entry is built, so concurrent
+    # loads of the same table run the metadata query once
+    _table_content_locks: Dict[Tuple, asyncio.Lock] = {}
+
+    # (table id, snapshots, max_snapshots) -> loads since the last prefetch round
+    _table_load_counts: Counter = Counter()
+    _prefetch_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def start_prefetcher(interval_ms: int, table_ids: Optional[List[int]] = None) -> None:
+        """
+        Start refreshing cached table metadata every interval_ms in the background.
+        Covers the given table_ids plus the most loaded tables of each interval.
+        """
+        if TableService._prefetch_task is None:
+            TableService._prefetch_task = asyncio.create_task(
+                TableService._prefetch_loop(interval_ms / 1000, list(table_ids or []))
+            )
+            logger.info("Table metadata prefetcher started, interval %s ms", interval_ms)
+
+    @staticmethod
+    async def stop_prefetcher() -> None:
+        """Stop the background metadata prefetcher"""
+        task = TableService._prefetch_task
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        TableService._prefetch_task = None
+        logger.info("Table metadata prefetcher stopped")
+
+    @staticmethod
+    async def _prefetch_loop(interval: float, table_ids: List[int]) -> None:
+        """Rebuild the cached metadata of pinned and recently hot tables, then sleep"""
+        while True:
+            await asyncio.sleep(interval)
+            hot = TableService._table_load_counts.most_common(TABLE_PREFETCH_HOT_TABLES)
+            TableService._table_load_counts.clear()
+            keys = dict.fromkeys([(table_id, None, None) for table_id in table_ids] + [key for key, _ in hot])
+            for table_id, snapshots, max_snapshots in keys:
+                try:
+                    await TableService._prefetch_table(table_id, snapshots, max_snapshots)
+                except Exception as e:
+                    logger.warning("Prefetch of table %s failed: %s", table_id, e)
+
+    @staticmethod
+    async def _prefetch_table(table_id: int, snapshots: Optional[str], max_snapshots: Optional[int]) -> None:
+        """Rebuild and cache one table's metadata, replacing any cached entry"""
+        record = await db.fetch_one(_TABLE_BASIC_INFO_BY_ID_SQL, table_id)
+        if not record:
+            return
+        basic_metadata = {
+            "format-version": record["format_version"],
+            "table-uuid": str(record["table_uuid"]),
+            "last-updated-ms": record["last_updated_ms"],
+        }
+        TableService._table_content_cache[
+            (table_id, record["last_updated_ms"], snapshots, max_snapshots)
+        ] = await TableService._build_table_content(table_id, basic_metadata, snapshots, max_snapshots)
+
+    @staticmethod
+    def evict_table_content(table_id: int) -> None:
+        """Forget every cached metadata build of a table."""
+        cache = TableService._table_content_cache
+        for key in [key for key in list(cache.keys()) if key[0] == table_id]:
+            cache.pop(key, None)
 
     @staticmethod
     async def cache_table_metadata(namespace_levels: List[str], table_name: str, metadata: Dict) -> None:
-        """Cache table metadata for future 304 responses."""
-        cache_key = f"{'.'.join(namespace_levels)}.{table_name}"
-        TableService._table_metadata_cache[cache_key] = metadata
+        """
+        Cache a table's serialized load response metadata. The router stores the
+        metadata bytes with the ETag and snapshot filter they were built for;
+        config and credentials are attached per request.
+        """
+        # The expiry is kept with the entry, the same way for every eviction policy
+        TableService._table_metadata_cache[(tuple(namespace_levels), table_name)] = (
+            metadata, time.monotonic() + TABLE_METADATA_CACHE_TTL
+        )
 
     @staticmethod
     async def get_cached_table_metadata(namespace_levels: List[str], table_name: str) -> Optional[Dict]:
-        """Get cached table metadata."""
-        cache_key = f"{'.'.join(namespace_levels)}.{table_name}"
-        return TableService._table_metadata_cache.get(cache_key)
+        """Get cached table metadata, unless it is older than TABLE_METADATA_CACHE_TTL."""
+        key = (tuple(namespace_levels), table_name)
+        entry = TableService._table_metadata_cache.get(key)
+        if entry is None:
+            return None
+        metadata, expires_at = entry
+        if expires_at <= time.monotonic():
+            TableService._table_metadata_cache.pop(key, None)
+            return None
+        return metadata
     
-    # @staticmethod
-    # async def build_table_response(table_id: int, basic_metadata: Dict, snapshots: Optional[str] = None) -> LoadTableResult:
-    #     """Build the full table response including all metadata."""
-    #     # Fetch the remaining table details
-    #     query = """
-    #     SELECT t.location, t.current_snapshot_id, t.last_sequence_number,
-    #         t.last_column_id, t.schema_id, t.current_schema_id,
-    #         t.default_spec_id, t.last_partition_id, t.default_sort_order_id,
-    #         t.properties, t.row_lineage, t.next_row_id, t.last_updated_ms
-    #     FROM tables t
-    #     WHERE t.id = $1
-    #     """
-        
-    #     table_record = await db.fetch_one(query, table_id)
-        
-    #     # Fetch schemas
-    #     schemas_query = """
-    #     SELECT schema_id, schema_json FROM schemas WHERE table_id = $1
-    #     """
-    #     schema_records = await db.fetch_all(schemas_query, table_id)
-    #     schemas = []
-        
-    #     for record in schema_records:
-    #         schema_json = record["schema_json"]
-    #         if isinstance(schema_json, str):
-    #             schema_json = json.loads(schema_json)
-    #         schema = Schema.parse_obj(schema_json)
-    #         schemas.append(schema)
-        
-    #     # Fetch partition specs
-    #     specs_query = """
-    #     SELECT spec_id, spec_json FROM partition_specs WHERE table_id = $1
-    #     """
-    #     spec_records = await db.fetch_all(specs_query, table_id)
-    #     partition_specs = []
-        
-    #     for record in spec_records:
-    #         spec_json = record["spec_json"]
-    #         if isinstance(spec_json, str):
-    #             spec_json = json.loads(spec_json)
-    #         spec = PartitionSpec.parse_obj(spec_json)
-    #         partition_specs.append(spec)
-        
-    #     # Fetch sort orders
-    #     orders_query = """
-    #     SELECT order_id, order_json FROM sort_orders WHERE table_id = $1
-    #     """
-    #     order_records = await db.fetch_all(orders_query, table_id)
-    #     sort_orders = []
-        
-    #     for record in order_records:
-    #         order_json = record["order_json"]
-    #         if isinstance(order_json, str):
-    #             order_json = json.loads(order_json)
-    #         order = SortOrder.parse_obj(order_json)
-    #         sort_orders.append(order)
-        
-    #     # Fetch snapshots
-    #     snapshots_query = """
-    #     SELECT snapshot_id, parent_snapshot_id, sequence_number, timestamp_ms,
-    #         manifest_list, summary, schema_id
-    #     FROM snapshots
-    #     WHERE table_id = $1
-    #     """
-        
-    #     # Add filtering based on snapshots parameter
-    #     if snapshots == "refs":
-    #         snapshots_query += """
-    #         AND snapshot_id IN (SELECT snapshot_id FROM snapshot_refs WHERE table_id = $1)
-    #         """
-        
-    #     snapshot_records = await db.fetch_all(snapshots_query, table_id)
-    #     snapshots_list = []
-        
-    #     for record in snapshot_records:
-    #         summary_json = record["summary"]
-    #         if isinstance(summary_json, str):
-    #             summary_json = json.loads(summary_json)
-            
-    #         snapshot = Snapshot(
-    #             snapshot_id=record["snapshot_id"],
-    #             parent_snapshot_id=record["parent_snapshot_id"],
-    #             sequence_number=record["sequence_number"],
-    #             timestamp_ms=record["timestamp_ms"],
-    #             manifest_list=record["manifest_list"],
-    #             summary=Summary.parse_obj(summary_json),
-    #             schema_id=record["schema_id"]
-    #         )
-    #         snapshots_list.append(snapshot)
-        
-    #     # Fetch snapshot references
-    #     refs_query = """
-    #     SELECT name, snapshot_id, type, min_snapshots_to_keep,
-    #         max_snapshot_age_ms, max_ref_age_ms
-    #     FROM snapshot_refs
-    #     WHERE table_id = $1
-    #     """
-    #     ref_records = await db.fetch_all(refs_query, table_id)
-    #     refs = {}
-        
-    #     for record in ref_records:
-    #         ref = {
-    #             "type": record["type"],
-    #             "snapshot-id": record["snapshot_id"],
-    #         }
-            
-    #         if record["min_snapshots_to_keep"] is not None:
-    #             ref["min-snapshots-to-keep"] = record["min_snapshots_to_keep"]
-            
-    #         if record["max_snapshot_age_ms"] is not None:
-    #             ref["max-snapshot-age-ms"] = record["max_snapshot_age_ms"]
-                
-    #         if record["max_ref_age_ms"] is not None:
-    #             ref["max-ref-age-ms"] = record["max_ref_age_ms"]
-            
-    #         refs[record["name"]] = ref
-        
-    #     # Try to fetch statistics if available
-    #     statistics_list = []
-    #     partition_statistics_list = []
-        
-    #     try:
-    #         # Fetch table statistics
-    #         statistics_query = """
-    #         SELECT snapshot_id, statistics_path, file_size_in_bytes,
-    #             file_footer_size_in_bytes, blob_metadata
-    #         FROM table_statistics
-    #         WHERE table_id = $1
-    #         """
-    #         statistics_records = await db.fetch_all(statistics_query, table_id)
-            
-    #         for record in statistics_records:
-    #             blob_metadata_json = record["blob_metadata"]
-    #             if isinstance(blob_metadata_json, str):
-    #                 blob_metadata_json = json.loads(blob_metadata_json)
-                    
-    #             from app.models.table import StatisticsFile, BlobMetadata
-    #             statistics = StatisticsFile(
-    #                 snapshot_id=record["snapshot_id"],
-    #                 statistics_path=record["statistics_path"],
-    #                 file_size_in_bytes=record["file_size_in_bytes"],
-    #                 file_footer_size_in_bytes=record["file_footer_size_in_bytes"],
-    #                 blob_metadata=[BlobMetadata.parse_obj(bm) for bm in blob_metadata_json]
-    #             )
-    #             statistics_list.append(statistics)
-            
-    #         # Fetch partition statistics
-    #         partition_query = """
-    #         SELECT snapshot_id, statistics_path, file_size_in_bytes
-    #         FROM partition_statistics
-    #         WHERE table_id = $1
-    #         """
-    #         partition_records = await db.fetch_all(partition_query, table_id)
-            
-    #         for record in partition_records:
-    #             from app.models.table import PartitionStatisticsFile
-    #             partition_stats = PartitionStatisticsFile(
-    #                 snapshot_id=record["snapshot_id"],
-    #                 statistics_path=record["statistics_path"],
-    #                 file_size_in_bytes=record["file_size_in_bytes"]
-    #             )
-    #             partition_statistics_list.append(partition_stats)
-    #     except Exception as e:
-    #         logger.warning(f"Error fetching statistics: {str(e)}. Continuing without statistics.")
-        
-    #     # Handle properties
-    #     properties = table_record["properties"]
-    #     if isinstance(properties, str):
-    #         properties = json.loads(properties)
-        
-    #     # Construct table metadata
-    #     table_metadata_dict = {
-    #         "format-version": basic_metadata["format-version"],
-    #         "table-uuid": basic_metadata["table-uuid"],
-    #         "location": table_record["location"],
-    #         "last-updated-ms": basic_metadata.get("last-updated-ms", table_record["last_updated_ms"]),
-    #         "properties": properties or {},
-    #         "schemas": schemas,
-    #         "current-schema-id": table_record["current_schema_id"],
-    #         "last-column-id": table_record["last_column_id"],
-    #         "partition-specs": partition_specs,
-    #         "default-spec-id": table_record["default_spec_id"],
-    #         "last-partition-id": table_record["last_partition_id"],
-    #         "sort-orders": sort_orders,
-    #         "default-sort-order-id": table_record["default_sort_order_id"],
-    #         "snapshots": snapshots_list,
-    #         "refs": refs,
-    #         "current-snapshot-id": table_record["current_snapshot_id"],
-    #         "last-sequence-number": table_record["last_sequence_number"]
-    #     }
-        
-    #     # Add optional fields if they exist
-    #     if statistics_list:
-    #         table_metadata_dict["statistics"] = statistics_list
-        
-    #     if partition_statistics_list:
-    #         table_metadata_dict["partition-statistics"] = partition_statistics_list
-        
-    #     if table_record.get("row_lineage") is not None:
-    #         table_metadata_dict["row-lineage"] = table_record["row_lineage"]
-        
-    #     if table_record.get("next_row_id") is not None:
-    #         table_metadata_dict["next-row-id"] = table_record["next_row_id"]
-        
-    #     # Parse into TableMetadata object
-    #     table_metadata = TableMetadata.parse_obj(table_metadata_dict)
-        
-    #     # Generate metadata location
-    #     metadata_location = f"{table_record['location']}/metadata/current.metadata.json"
-        
-    #     # Get table configuration and credentials
-    #     config = await TableService.get_table_config(table_id)
-    #     storage_credentials = await TableService.get_storage_credentials(table_id)
-        
-    #     # Cache the table metadata for future 304 responses
-    #     namespace_from_metadata = await TableService.get_table_namespace(table_id)
-    #     table_name = await TableService.get_table_name(table_id)
-    #     await TableService.cache_table_metadata(namespace_from_metadata, table_name, table_metadata.dict(by_alias=True))
-        
-    #     # Return the LoadTableResult
-    #     return LoadTableResult(
-    #         metadata_location=metadata_location,
-    #         metadata=table_metadata,
-    #         config=config,
-    #         storage_credentials=storage_credentials
-    #     )
-
-    @staticmethod
-    async def build_table_response(table_id: int, basic_metadata: Dict, snapshots: Optional[str] = None) -> LoadTableResult:
-        """Build the full table response including all metadata."""
-        # Fetch the remaining table details
-        query = """
-        SELECT t.location, t.current_snapshot_id, t.last_sequence_number,
-            t.last_column_id, t.schema_id, t.current_schema_id,
-            t.default_spec_id, t.last_partition_id, t.default_sort_order_id,
-            t.properties, t.row_lineage, t.next_row_id, t.last_updated_ms
-        FROM tables t
-        WHERE t.id = $1
+    # (namespace levels, table name) -> (table id, expiry) for hot id lookups.
+    # Entries are dropped on rename/drop here; other processes rely on the TTL.
+    _table_id_cache: Dict[Tuple[Tuple[str, ...], str], Tuple[int, float]] = {}
+
+    @staticmethod
+    def get_cached_table_id(namespace_levels: List[str], table_name: str) -> Optional[int]:
+        """Get a cached table id, if present and not expired."""
+        entry = TableService._table_id_cache.get((tuple(namespace_levels), table_name))
+        if entry is None:
+            return None
+        table_id, expires_at = entry
+        if expires_at < time.monotonic():
+            TableService.evict_table_id(namespace_levels, table_name)
+            return None
+        return table_id
+
+    @staticmethod
+    def cache_table_id(namespace_levels: List[str], table_name: str, table_id: int) -> None:
+        """Cache the id of a table for TABLE_ID_CACHE_TTL seconds."""
+        TableService._table_id_cache[(tuple(namespace_levels), table_name)] = (
+            table_id, time.monotonic() + TABLE_ID_CACHE_TTL
+        )
+
+    @staticmethod
+    def evict_table_id(namespace_levels: List[str], table_name: str) -> None:
+        """Forget the cached id of a table."""
+        TableService._table_id_cache.pop((tuple(namespace_levels), table_name), None)
+
+    # (namespace levels, table name) -> (table id, ETag), see TABLE_ETAG_CACHE_*
+    _table_etag_cache = TTLCache(maxsize=TABLE_ETAG_CACHE_SIZE, ttl=TABLE_ETAG_CACHE_TTL)
+
+    @staticmethod
+    def invalidate_table(namespace_levels: List[str], table_name: str, table_id: Optional[int] = None) -> None:
         """
-        
-        table_record = await db.fetch_one(query, table_id)
-        
-        # Fetch schemas
-        schemas_query = """
-        SELECT schema_id, schema_json FROM schemas WHERE table_id = $1
+        Drop cached lookups for a table after it was changed, renamed or dropped.
+        Pass table_id when the table's metadata changed to also drop its cached builds.
         """
-        schema_records = await db.fetch_all(schemas_query, table_id)
-        schemas = []
-        
-        for record in schema_records:
-            schema_json = record["schema_json"]
-            if isinstance(schema_json, str):
-                schema_json = json.loads(schema_json)
-            
-            # # Ensure schema_id is set
-            # if "schema-id" not in schema_json and record["schema_id"] is not None:
-            #     schema_json["schema-id"] = record["schema_id"]
-            # Ensure schema_id is set - this is critical!
-            if "schema-id" not in schema_json or schema_json["schema-id"] is None:
-                schema_json["schema-id"] = record["schema_id"]
-                logger.debug(f"Added missing schema-id {record['schema_id']} to schema")
-
-            schema = Schema.parse_obj(schema_json)
-            schemas.append(schema)
-        
-        # Fetch partition specs
-        specs_query = """
-        SELECT spec_id, spec_json FROM partition_specs WHERE table_id = $1
-        """
-        spec_records = await db.fetch_all(specs_query, table_id)
-        partition_specs = []
-        
-        for record in spec_records:
-            spec_json = record["spec_json"]
-            if isinstance(spec_json, str):
-                spec_json = json.loads(spec_json)
-            
-            # Ensure spec_id is set
-            # if "spec-id" not in spec_json and record["spec_id"] is not None:
-            #     spec_json["spec-id"] = record["spec_id"]
-            if "spec-id" not in spec_json or spec_json["spec-id"] is None:
-                spec_json["spec-id"] = record["spec_id"]
-                logger.debug(f"Added missing spec-id {record['spec_id']} to partition spec")
-
-            # Ensure all partition fields have field_id
-            last_field_id = table_record["last_partition_id"]
-            if "fields" in spec_json:
-                for field in spec_json["fields"]:
-                    if "field-id" not in field or field["field-id"] is None:
-                        last_field_id += 1
-                        field["field-id"] = last_field_id
-                        logger.debug(f"Added missing field-id {last_field_id} to partition field")
-            
-            spec = PartitionSpec.parse_obj(spec_json)
-            partition_specs.append(spec)
-            # if "fields" in spec_json:
-            #     for field in spec_json["fields"]:
-            #         if "field-id" not in field or field["field-id"] is None:
-            #             # Generate a field-id if missing
-            #             field["field-id"] = table_record["last_partition_id"] + 1
-                
-            # spec = PartitionSpec.parse_obj(spec_json)
-            # partition_specs.append(spec)
-        
-        # Fetch sort orders
-        orders_query = """
-        SELECT order_id, order_json FROM sort_orders WHERE table_id = $1
+        TableService._table_etag_cache.pop((tuple(namespace_levels), table_name), None)
+        TableService._table_metadata_cache.pop((tuple(namespace_levels), table_name), None)
+        TableService.evict_table_id(namespace_levels, table_name)
+        if table_id is not None:
+            TableService.evict_table_content(table_id)
+    
+    @staticmethod
+    def _snapshot_filter(snapshots: Optional[str] = None, max_snapshots: Optional[int] = None) -> Tuple:
+        """Parameters for the snapshot filter of the table load queries"""
+        if snapshots == "refs":
+            # Already bounded by the number of refs
+            return "refs", None
+        return None, max_snapshots or None
+
+    @staticmethod
+    async def build_table_response_dict(
+        table_id: int,
+        basic_metadata: Dict,
+        snapshots: Optional[str] = None,
+        max_snapshots: Optional[int] = None
+    ) -> LoadTableResultDict:
         """
-        order_records = await db.fetch_all(orders_query, table_id)
-        sort_orders = []
-        
-        for record in order_records:
-            order_json = record["order_json"]
-            if isinstance(order_json, str):
-                order_json = json.loads(order_json)
-            order = SortOrder.parse_obj(order_json)
-            sort_orders.append(order)
-        
-        # Fetch snapshots
-        snapshots_query = """
-        SELECT snapshot_id, parent_snapshot_id, sequence_number, timestamp_ms,
-            manifest_list, summary, schema_id
-        FROM snapshots
-        WHERE table_id = $1
+        Build the full table response as a plain alias-keyed dict, ready to serialize.
+        If max_snapshots is set, only the most recent snapshots are returned.
         """
-        
-        # Add filtering based on snapshots parameter
-        if snapshots == "refs":
-            snapshots_query += """
-            AND snapshot_id IN (SELECT snapshot_id FROM snapshot_refs WHERE table_id = $1)
-            """
-        
-        snapshot_records = await db.fetch_all(snapshots_query, table_id)
-        snapshots_list = []
-        
-        for record in snapshot_records:
-            summary_json = record["summary"]
-            if isinstance(summary_json, str):
-                summary_json = json.loads(summary_json)
-            
-            snapshot = Snapshot(
-                snapshot_id=record["snapshot_id"],
-                parent_snapshot_id=record["parent_snapshot_id"],
-                sequence_number=record["sequence_number"],
-                timestamp_ms=record["timestamp_ms"],
-                manifest_list=record["manifest_list"],
-                summary=Summary.parse_obj(summary_json),
-                schema_id=record["schema_id"]
-            )
-            snapshots_list.append(snapshot)
-        
-        # Fetch snapshot references
-        refs_query = """
-        SELECT name, snapshot_id, type, min_snapshots_to_keep,
-            max_snapshot_age_ms, max_ref_age_ms
-        FROM snapshot_refs
-        WHERE table_id = $1
-        """
-        ref_records = await db.fetch_all(refs_query, table_id)
-        refs = {}
-        
-        for record in ref_records:
-            ref = {
-                "type": record["type"],
-                "snapshot-id": record["snapshot_id"],
-            }
-            
-            if record["min_snapshots_to_keep"] is not None:
-                ref["min-snapshots-to-keep"] = record["min_snapshots_to_keep"]
-            
-            if record["max_snapshot_age_ms"] is not None:
-                ref["max-snapshot-age-ms"] = record["max_snapshot_age_ms"]
-                
-            if record["max_ref_age_ms"] is not None:
-                ref["max-ref-age-ms"] = record["max_ref_age_ms"]
-            
-            refs[record["name"]] = ref
-        
-        # Handle properties
-        properties = table_record["properties"]
-        if isinstance(properties, str):
-            properties = json.loads(properties)
-        
-        # Construct table metadata
-        table_metadata_dict = {
-            "format-version": basic_metadata["format-version"],
-            "table-uuid": basic_metadata["table-uuid"],
-            "location": table_record["location"],
-            "last-updated-ms": basic_metadata.get("last-updated-ms", table_record["last_updated_ms"]),
-            "properties": properties or {},
-            "schemas": schemas,
-            "current-schema-id": table_record["current_schema_id"],
-            "last-column-id": table_record["last_column_id"],
-            "partition-specs": partition_specs,
-            "default-spec-id": table_record["default_spec_id"],
-            "last-partition-id": table_record["last_partition_id"],
-            "sort-orders": sort_orders,
-            "default-sort-order-id": table_record["default_sort_order_id"],
-            "snapshots": snapshots_list,
-            "refs": refs,
-            "current-snapshot-id": table_record["current_snapshot_id"],
-            "last-sequence-number": table_record["last_sequence_number"]
-        }
-        
-        # Add optional fields if they exist
-        if table_record.get("row_lineage") is not None:
-            table_metadata_dict["row-lineage"] = table_record["row_lineage"]
-        
-        if table_record.get("next_row_id") is not None:
-            table_metadata_dict["next-row-id"] = table_record["next_row_id"]
-        
-        # Parse into TableMetadata object
-        table_metadata = TableMetadata.parse_obj(table_metadata_dict)
-        
-        # Generate metadata location - This is critical!
-        metadata_location = f"{table_record['location']}/metadata/current.metadata.json"
-        
-        # Get table configuration and credentials
-        config = await TableService.get_table_config(table_id)
-        storage_credentials = await TableService.get_storage_credentials(table_id)
-        
-        # Create the full response dictionary for caching
-        result_dict = {
-            "metadata-location": metadata_location,  # Ensure this is set
-            "metadata": table_metadata.dict(by_alias=True),
+        metadata_location, table_metadata = await TableService._get_table_content(
+            table_id, basic_metadata, snapshots, max_snapshots
+        )
+        config, storage_credentials = await TableService.get_table_access(table_id, table_metadata["location"])
+        return {
+            "metadata-location": metadata_location,
+            "metadata": table_metadata,
             "config": config,
-            "storage-credentials": [c.dict(by_alias=True) for c in storage_credentials] if storage_credentials else None
+            "storage-credentials": storage_credentials,
         }
-        
-        # Cache the table metadata for future 304 responses
-        namespace_from_metadata = await TableService.get_table_namespace(table_id)
-        table_name = await TableService.get_table_name(table_id)
-        await TableService.cache_table_metadata(namespace_from_metadata, table_name, result_dict)
-        
-        # Return the LoadTableResult
-        return LoadTableResult(
-            metadata_location=metadata_location,  # Ensure metadata_location is included
-            metadata=table_metadata,
-            config=config,
-            storage_credentials=storage_credentials
-        )
 
     @staticmethod
-    async def get_table_namespace(table_id: int) -> List[str]:
-        """Get the namespace for a table by ID."""
-        query = """
-        SELECT n.levels FROM namespaces n
-        JOIN tables t ON t.namespace_id = n.id
-        WHERE t.id = $1
+    async def get_table_access(table_id: int, location: str) -> Tuple[Dict[str, str], Optional[List[Dict]]]:
         """
-        
-        record = await db.fetch_one(query, table_id)
-        return record["levels"] if record else []
+        Get a load response's config and alias-keyed storage credentials.
+        Never cached with the metadata, so rotated credentials apply to the next load.
+        """
+        config, storage_credentials = await asyncio.gather(
+            TableService.get_table_config(table_id, location=location),
+            TableService.get_storage_credentials(table_id)
+        )
+        return config, [c.dict(by_alias=True) for c in storage_credentials] or None
 
     @staticmethod
-    async def get_table_name(table_id: int) -> str:
-        """Get the name of a table by ID."""
-        query = """
-        SELECT name FROM tables
-        WHERE id = $1
+    async def _get_table_content(
+        table_id: int,
+        basic_metadata: Dict,
+        snapshots: Optional[str] = None,
+        max_snapshots: Optional[int] = None
+    ) -> Tuple[str, Dict]:
+        """
+        Return (metadata location, metadata dict) for a table, from the content
+        cache while its last-updated-ms is unchanged.
         """
+        if TableService._prefetch_task is not None:
+            TableService._table_load_counts[(table_id, snapshots, max_snapshots)] += 1
+        
+        last_updated_ms = basic_metadata.get("last-updated-ms")
+        if last_updated_ms is None:
+            return await TableService._build_table_content(table_id, basic_metadata, snapshots, max_snapshots)
+        
+        content_key = (table_id, last_updated_ms, snapshots, max_snapshots)
+        cached = TableService._table_content_cache.get(content_key)
+        if cached:
+            logger.debug("Table content cache hit for table ID: %s", table_id)
+            return cached
+        
+        lock = TableService._table_content_locks.setdefault(content_key, asyncio.Lock())
+        async with lock:
+            # Another request may have built it while we waited
+            cached = TableService._table_content_cache.get(content_key)
+            if cached:
+                return cached
+            try:
+                content = await TableService._build_table_content(
+                    table_id, basic_metadata, snapshots, max_snapshots
+                )
+            finally:
+                TableService._table_content_locks.pop(content_key, None)
+            TableService._table_content_cache[content_key] = content
+            return content
+
+    @staticmethod
+    async def _build_table_content(
+        table_id: int,
+        basic_metadata: Dict,
+        snapshots: Optional[str] = None,
+        max_snapshots: Optional[int] = None
+    ) -> Tuple[str, Dict]:
+        """Query a table's metadata and assemble it as a plain alias-keyed dict."""
+        # Fetch the table row with its schemas, specs, sort orders, snapshots and refs
+        table_record = await db.fetch_one(
+            _LOAD_TABLE_BY_ID_SQL, table_id, *TableService._snapshot_filter(snapshots, max_snapshots)
+        )
+        table_metadata_dict = _table_metadata_dict(table_record, basic_metadata)
         
-        record = await db.fetch_one(query, table_id)
-        return record["name"] if record else ""
-    
+        # The dict is served as is; only validate it when the rows are not trusted
+        if not TRUSTED_DB_ROWS:
+            TableMetadata.parse_obj(table_metadata_dict)
+        
+        # Generate metadata location - This is critical!
+        metadata_location = f"{table_record['location']}/metadata/current.metadata.json"
+        
+        return metadata_location, table_metadata_dict
+
     @staticmethod
     async def get_storage_credentials(table_id: int) -> List[StorageCredential]:
         """
         Get storage credentials for a table.
         """
-        # Get the table location
-        query = """
-        SELECT location FROM tables
-        WHERE id = $1
-        """
-        logger.debug(f"Fetching location for table ID: {table_id}")
-        table_record = await db.fetch_one(query, table_id)
-        if not table_record:
-            logger.warning(f"No table found with ID: {table_id}")
+        # Get the table location and any table-specific credentials in one round trip
+        logger.debug("Fetching location and credentials for table ID: %s", table_id)
+        records = await db.fetch_all(_TABLE_CREDENTIALS_SQL, table_id)
+        if not records:
+            logger.warning("No table found with ID: %s", table_id)
             return []
         
-        location = table_record["location"]
-        logger.debug(f"Found table location: {location}")
+        location = records[0]["location"]
+        logger.debug("Found table location: %s", location)
         
         # 1. Try table-specific credentials
-        query = """
-        SELECT prefix, warehouse, config FROM storage_credentials
-        WHERE table_id = $1
-        """
-        cred_records = await db.fetch_all(query, table_id)
-        logger.debug(f"Found {len(cred_records) if cred_records else 0} table-specific credentials")
-        
-        if not cred_records or len(cred_records) == 0:
-            # 2. Try location-based credentials - use simplified exact prefix matching
-            query = """
-            SELECT prefix, warehouse, config FROM storage_credentials
-            WHERE table_id IS NULL AND $1 LIKE (warehouse || '%')
-            ORDER BY LENGTH(warehouse) DESC
-            """
-            logger.debug(f"Executing query for location {location}: {query}")
-            cred_records = await db.fetch_all(query, location)
-            logger.debug(f"Found {len(cred_records) if cred_records else 0} location-based credentials for {location}")
-
-            # If still no records, try a more direct approach
-            if not cred_records or len(cred_records) == 0:
-                # 3. Direct query to debug
-                query = """
-                SELECT prefix, warehouse, config FROM storage_credentials
-                WHERE table_id IS NULL
-                """
-                all_records = await db.fetch_all(query)
-                logger.debug(f"All available global credentials: {len(all_records)}")
-                
-                for record in all_records:
-                    warehouse = record["warehouse"]
-                    logger.debug(f"Checking if {location} starts with {warehouse}")
-                    if location.startswith(warehouse):
-                        logger.debug(f"Match found for warehouse: {warehouse}")
-                        cred_records = [record]
-                        break
+        cred_records = [record for record in records if record["warehouse"] is not None]
+        logger.debug("Found %s table-specific credentials", len(cred_records))
+        
+        if not cred_records:
+            # 2. Try location-based credentials, matched in memory against the
+            # cached global credentials (longest warehouse prefix first)
+            cred_records = await CredentialService.match_global_credentials(location)
+            logger.debug("Found %s location-based credentials for %s", len(cred_records), location)
         
         # Convert results to StorageCredential models
-        credentials = []
-        for record in cred_records:
-            config = record["config"]
-            if isinstance(config, str):
-                config = json.loads(config)
-            
-            credentials.append(
-                StorageCredential(
-                    prefix=record["warehouse"], 
-                    config=config
-                )
-            )
+        credentials = [
+            StorageCredential(prefix=record["warehouse"], config=record["config"])
+            for record in cred_records
+        ]
         
-        logger.info(f"Returning {len(credentials)} credentials for table ID: {table_id}")
-        for cred in credentials:
-            logger.debug(f"Credential prefix: {cred.prefix}, config: {cred.config}")
+        logger.info("Returning %s credentials for table ID: %s", len(credentials), table_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            for cred in credentials:
+                logger.debug("Credential prefix: %s, config: %s", cred.prefix, cred.config)
         
         return credentials
     
     @staticmethod
-    async def load_table(
+    async def drop_table(
         namespace_levels: List[str],
         table_name: str,
-        snapshots: Optional[str] = None,
-        x_iceberg_access_delegation: Optional[str] = None,
-        if_none_match: Optional[str] = None
-    ) -> LoadTableResult:
-        """
-        Load a table's metadata.
+        purge_requested: bool = False
+    ) -> None:
         """
-        logger.info(f"Loading table {namespace_levels}.{table_name}")
-        
-        # Build query to get table details
-        query = """
-        SELECT t.id, t.table_uuid, t.location, t.current_snapshot_id, t.last_sequence_number,
-               t.last_updated_ms, t.last_column_id, t.schema_id, t.current_schema_id,
-               t.default_spec_id, t.last_partition_id, t.default_sort_order_id,
-               t.properties, t.format_version, t.row_lineage, t.next_row_id
-        FROM tables t
-        JOIN namespaces n ON t.namespace_id = n.id
-        WHERE n.levels = $1 AND t.name = $2
+        Drop a table from the catalog.
         """
+        logger.info("Dropping table %s.%s, purge_requested: %s", namespace_levels, table_name, purge_requested)
         
         try:
-            # Check if table exists
-            table_record = await db.fetch_one(query, namespace_levels, table_name)
+            # Get namespace ID
+            namespace_id = await NamespaceService.get_namespace_id(namespace_levels)
+            
+            if namespace_id is None:
+                logger.warning("Namespace not found: %s", namespace_levels)
+                raise ValueError(f"Namespace not found: {namespace_levels}")
+            
+            # Check if table exists and get its location
+            table_record = await db.fetch_one(_TABLE_ID_LOCATION_SQL, namespace_id, table_name)
             
             if not table_record:
-                logger.warning(f"Table not found: {namespace_levels}.{table_name}")
+                logger.warning("Table not found: %s.%s", namespace_levels, table_name)
                 raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
             
             table_id = table_record["id"]
-            logger.debug(f"Found table with ID: {table_id}")
-            
-            # Generate ETag from table_uuid and last_updated_ms
-            table_uuid = table_record["table_uuid"]
-            last_updated_ms = table_record["last_updated_ms"]
-            etag = f'"{table_uuid}-{last_updated_ms}"'
-            
-            # Check If-None-Match header
-            if if_none_match and if_none_match == etag:
-                logger.info(f"Table {namespace_levels}.{table_name} not modified, returning 304")
-                return None  # Signal to the router to return 304 Not Modified
+            location = table_record["location"]
             
-            # Fetch schemas
-            schemas_query = """
-            SELECT schema_id, schema_json FROM schemas WHERE table_id = $1
-            """
-            schema_records = await db.fetch_all(schemas_query, table_id)
-            schemas = []
+            # Delete the table (cascade will delete related records)
+            await db.execute(_DELETE_TABLE_SQL, table_id)
+            TableService.invalidate_table(namespace_levels, table_name, table_id)
             
-            # for record in schema_records:
-            #     schema_json = record["schema_json"]
-            #     if isinstance(schema_json, str):
-            #         schema_json = json.loads(schema_json)
-            #     schema = Schema.parse_obj(schema_json)
-            #     schemas.append(schema)
-            
-            # When processing schemas in build_table_response
-            for record in schema_records:
-                schema_json = record["schema_json"]
-                if isinstance(schema_json, str):
-                    schema_json = json.loads(schema_json)
-                
-                # Ensure schema_id is set - this is critical!
-                if "schema-id" not in schema_json or schema_json["schema-id"] is None:
-                    schema_json["schema-id"] = record["schema_id"]
-                    logger.debug(f"Added missing schema-id {record['schema_id']} to schema")
-                
-                schema = Schema.parse_obj(schema_json)
-                schemas.append(schema)
-
-            # Fetch partition specs
-            specs_query = """
-            SELECT spec_id, spec_json FROM partition_specs WHERE table_id = $1
-            """
-            spec_records = await db.fetch_all(specs_query, table_id)
-            partition_specs = []
-            
-            for record in spec_records:
-                spec_json = record["spec_json"]
-                if isinstance(spec_json, str):
-                    spec_json = json.loads(spec_json)
-                
-                # Ensure spec_id is set - this is critical!
-                if "spec-id" not in spec_json or spec_json["spec-id"] is None:
-                    spec_json["spec-id"] = record["spec_id"]
-                    logger.debug(f"Added missing spec-id {record['spec_id']} to partition spec")
-                
-                # Ensure all partition fields have field_id
-                last_field_id = table_record["last_partition_id"]
-                if "fields" in spec_json:
-                    for field in spec_json["fields"]:
-                        if "field-id" not in field or field["field-id"] is None:
-                            last_field_id += 1
-                            field["field-id"] = last_field_id
-                            logger.debug(f"Added missing field-id {last_field_id} to partition field")
-                
-                spec = PartitionSpec.parse_obj(spec_json)
-                partition_specs.append(spec)
-            
-            # Fetch sort orders
-            orders_query = """
-            SELECT order_id, order_json FROM sort_orders WHERE table_id = $1
-            """
-            order_records = await db.fetch_all(orders_query, table_id)
-            sort_orders = []
-            
-            for record in order_records:
-                order_json = record["order_json"]
-                if isinstance(order_json, str):
-                    order_json = json.loads(order_json)
-                order = SortOrder.parse_obj(order_json)
-                sort_orders.append(order)
-            
-            # Fetch snapshots
-            snapshots_query = """
-            SELECT snapshot_id, parent_snapshot_id, sequence_number, timestamp_ms,
-                   manifest_list, summary, schema_id
-            FROM snapshots
-            WHERE table_id = $1
-            """
-            
-            # Add filtering based on snapshots parameter
-            if snapshots == "refs":
-                snapshots_query += """
-                AND snapshot_id IN (SELECT snapshot_id FROM snapshot_refs WHERE table_id = $1)
-                """
-            
-            snapshot_records = await db.fetch_all(snapshots_query, table_id)
-            snapshots_list = []
-            
-            for record in snapshot_records:
-                summary_json = record["summary"]
-                if isinstance(summary_json, str):
-                    summary_json = json.loads(summary_json)
-                
-                snapshot = Snapshot(
-                    snapshot_id=record["snapshot_id"],
-                    parent_snapshot_id=record["parent_snapshot_id"],
-                    sequence_number=record["sequence_number"],
-                    timestamp_ms=record["timestamp_ms"],
-                    manifest_list=record["manifest_list"],
-                    summary=Summary.parse_obj(summary_json),
-                    schema_id=record["schema_id"]
-                )
-                snapshots_list.append(snapshot)
-            
-            # Fetch snapshot references
-            refs_query = """
-            SELECT name, snapshot_id, type, min_snapshots_to_keep,
-                   max_snapshot_age_ms, max_ref_age_ms
-            FROM snapshot_refs
-            WHERE table_id = $1
-            """
-            ref_records = await db.fetch_all(refs_query, table_id)
-            refs = {}
-            
-            for record in ref_records:
-                ref = {
-                    "type": record["type"],
-                    "snapshot-id": record["snapshot_id"],
-                }
-                
-                if record["min_snapshots_to_keep"] is not None:
-                    ref["min-snapshots-to-keep"] = record["min_snapshots_to_keep"]
-                
-                if record["max_snapshot_age_ms"] is not None:
-                    ref["max-snapshot-age-ms"] = record["max_snapshot_age_ms"]
-                    
-                if record["max_ref_age_ms"] is not None:
-                    ref["max-ref-age-ms"] = record["max_ref_age_ms"]
-                
-                refs[record["name"]] = ref
-            
-            # Handle properties
-            properties = table_record["properties"]
-            if isinstance(properties, str):
-                properties = json.loads(properties)
-            
-            # Construct table metadata
-            # table_metadata = TableMetadata(
-            #     format_version=table_record["format_version"],
-            #     table_uuid=table_record["table_uuid"],
-            #     location=table_record["location"],
-            #     last_updated_ms=table_record["last_updated_ms"],
-            #     properties=properties,
-            #     schemas=schemas,
-            #     current_schema_id=table_record["current_schema_id"],
-            #     last_column_id=table_record["last_column_id"],
-            #     partition_specs=partition_specs,
-            #     default_spec_id=table_record["default_spec_id"],
-            #     last_partition_id=table_record["last_partition_id"],
-            #     sort_orders=sort_orders,
-            #     default_sort_order_id=table_record["default_sort_order_id"],
-            #     snapshots=snapshots_list,
-            #     refs=refs,
-            #     current_snapshot_id=table_record["current_snapshot_id"],
-            #     last_sequence_number=table_record["last_sequence_number"]
-            # )
-
-            # Construct table metadata
-            table_metadata = TableMetadata.parse_obj({
-                "format-version": table_record["format_version"],
-                "table-uuid": str(table_record["table_uuid"]),
-                "location": table_record["location"],
-                "last-updated-ms": table_record["last_updated_ms"],
-                "properties": properties,
-                "schemas": schemas,
-                "current-schema-id": table_record["current_schema_id"],
-                "last-column-id": table_record["last_column_id"],
-                "partition-specs": partition_specs,
-                "default-spec-id": table_record["default_spec_id"],
-                "last-partition-id": table_record["last_partition_id"],
-                "sort-orders": sort_orders,
-                "default-sort-order-id": table_record["default_sort_order_id"],
-                "snapshots": snapshots_list,
-                "refs": refs,
-                "current-snapshot-id": table_record["current_snapshot_id"],
-                "last-sequence-number": table_record["last_sequence_number"]
-            })
-            
-            # Generate metadata location
-            metadata_location = f"{table_record['location']}/metadata/current.metadata.json"
-            logger.info(f"Loaded table {namespace_levels}.{table_name}")
-            
-            # Get table configuration
-            config = await TableService.get_table_config(table_id)
-            
-            # Get storage credentials if requested
-            # the below code will vend credentials only with header x-iceberg-access-delegation
-            # commenting this out for now as we are not using it
-            # storage_credentials = None
-            # if x_iceberg_access_delegation:
-            #     storage_credentials = await TableService.get_storage_credentials(table_id)
-            
-            # the below code will vend credentials for all tables without any header
-            storage_credentials = await TableService.get_storage_credentials(table_id)
-            logger.debug(f"Found {len(storage_credentials)} credentials for table {table_id}")
-            # Use parse_obj to handle aliased field properly
-            result = LoadTableResult.parse_obj({
-                "metadata-location": metadata_location,
-                "metadata": table_metadata.dict(by_alias=True),
-                "config": config,
-                "storage-credentials": storage_credentials
-            })
-            return result, etag
-            
-        except ValueError:
-            # Re-raise ValueError for not found
-            raise
-        except Exception as e:
-            logger.error(f"Error loading table: {str(e)}", exc_info=True)
-            raise
-    
-    @staticmethod
-    async def drop_table(
-        namespace_levels: List[str],
-        table_name: str,
-        purge_requested: bool = False
-    ) -> None:
-        """
-        Drop a table from the catalog.
-        """
-        logger.info(f"Dropping table {namespace_levels}.{table_name}, purge_requested: {purge_requested}")
-        
-        # Get namespace ID
-        namespace_query = """
-        SELECT id FROM namespaces WHERE levels = $1
-        """
-        
-        try:
-            namespace_record = await db.fetch_one(namespace_query, namespace_levels)
-            
-            if not namespace_record:
-                logger.warning(f"Namespace not found: {namespace_levels}")
-                raise ValueError(f"Namespace not found: {namespace_levels}")
-            
-            namespace_id = namespace_record["id"]
-            
-            # Check if table exists and get its location
-            table_query = """
-            SELECT id, location FROM tables WHERE namespace_id = $1 AND name = $2
-            """
-            table_record = await db.fetch_one(table_query, namespace_id, table_name)
-            
-            if not table_record:
-                logger.warning(f"Table not found: {namespace_levels}.{table_name}")
-                raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
-            
-            table_id = table_record["id"]
-            location = table_record["location"]
-            
-            # Delete the table (cascade will delete related records)
-            delete_query = """
-            DELETE FROM tables WHERE id = $1
-            """
-            await db.execute(delete_query, table_id)
-            
-            logger.info(f"Dropped table {namespace_levels}.{table_name}")
+            logger.info("Dropped table %s.%s", namespace_levels, table_name)
             
             # If purge is requested, we would clean up data files here
             if purge_requested:
-                logger.info(f"Purge requested for table {namespace_levels}.{table_name} at location {location}")
+                logger.info("Purge requested for table %s.%s at location %s", namespace_levels, table_name, location)
                 # In a real implementation, this would schedule a data purge job
                 pass
                 
@@ -1373,7 +1274,7 @@ class TableService:
             # Re-raise ValueError for not found
             raise
         except Exception as e:
-            logger.error(f"Error dropping table: {str(e)}", exc_info=True)
+            logger.error("Error dropping table: %s", e, exc_info=True)
             raise
     
     @staticmethod
@@ -1382,66 +1283,36 @@ class TableService:
         table_name: str
     ) -> LoadCredentialsResponse:
         """Load credentials for a table from the catalog."""
-        logger.info(f"Loading credentials for table {namespace_levels}.{table_name}")
+        logger.info("Loading credentials for table %s.%s", namespace_levels, table_name)
         
-        # Check if table exists and get its location
-        query = """
-        SELECT t.id, t.location FROM tables t
-        JOIN namespaces n ON t.namespace_id = n.id
-        WHERE n.levels = $1 AND t.name = $2
-        """
-        table_record = await db.fetch_one(query, namespace_levels, table_name)
+        # Check if table exists, getting its location and any table-specific credentials
+        records = await db.fetch_all(_TABLE_CREDENTIALS_BY_NAME_SQL, namespace_levels, table_name)
         
-        if not table_record:
-            logger.warning(f"Table not found: {namespace_levels}.{table_name}")
+        if not records:
+            logger.warning("Table not found: %s.%s", namespace_levels, table_name)
             raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
         
-        table_id = table_record["id"]
-        location = table_record["location"]
+        location = records[0]["location"]
         
         # 1. Try table-specific credentials
-        query = """
-        SELECT prefix, warehouse, config FROM storage_credentials
-        WHERE table_id = $1
-        """
-        cred_records = await db.fetch_all(query, table_id)
+        cred_records = [record for record in records if record["warehouse"] is not None]
         
         if not cred_records:
-            # 2. Try location-based credentials
-            query = """
-            SELECT prefix, warehouse, config FROM storage_credentials
-            WHERE table_id IS NULL AND 
-                $1 LIKE CONCAT(warehouse, '%')
-            ORDER BY LENGTH(warehouse) DESC
-            """
-            cred_records = await db.fetch_all(query, location)
+            # 2. Try location-based credentials, from the cached global credentials
+            cred_records = await CredentialService.match_global_credentials(location)
         
         if not cred_records:
             # 3. Try namespace prefix-based credentials
             namespace_prefix = namespace_levels[0] if namespace_levels else 'default'
-            query = """
-            SELECT prefix, warehouse, config FROM storage_credentials
-            WHERE table_id IS NULL AND
-                prefix = $1
-            ORDER BY LENGTH(warehouse) DESC
-            """
-            cred_records = await db.fetch_all(query, namespace_prefix)
+            cred_records = await CredentialService.match_prefix_credentials(namespace_prefix)
         
-        # Convert results to StorageCredential models
-        credentials = []
-        for record in cred_records:
-            config = record["config"]
-            if isinstance(config, str):
-                config = json.loads(config)
-            
-            credentials.append(
-                StorageCredential(
-                    prefix=record["warehouse"],  # This matches the API model
-                    config=config
-                )
-            )
+        # Convert results to StorageCredential models (warehouse is the API's prefix)
+        credentials = [
+            StorageCredential(prefix=record["warehouse"], config=record["config"])
+            for record in cred_records
+        ]
         
-        logger.info(f"Loaded {len(credentials)} credential(s) for table {namespace_levels}.{table_name}")
+        logger.info("Loaded %s credential(s) for table %s.%s", len(credentials), namespace_levels, table_name)
         
         # Use parse_obj to handle field aliases
         return LoadCredentialsResponse.parse_obj({
@@ -1460,64 +1331,65 @@ class TableService:
         destination_namespace = request.destination.namespace.__root__
         destination_name = request.destination.name
         
-        logger.info(f"Renaming table {source_namespace}.{source_name} to {destination_namespace}.{destination_name}")
+        logger.info("Renaming table %s.%s to %s.%s", source_namespace, source_name, destination_namespace, destination_name)
         
         try:
-            # Verify source namespace exists
-            source_namespace_exists = await NamespaceService.namespace_exists(source_namespace)
-            if not source_namespace_exists:
-                logger.warning(f"Source namespace not found: {source_namespace}")
-                raise ValueError(f"Source namespace not found: {source_namespace}")
-            
-            # Verify destination namespace exists
-            destination_namespace_exists = await NamespaceService.namespace_exists(destination_namespace)
-            if not destination_namespace_exists:
-                logger.warning(f"Destination namespace not found: {destination_namespace}")
-                raise ValueError(f"Destination namespace not found: {destination_namespace}")
-            
-            # Verify source table exists
-            source_table_exists = await TableService.table_exists(source_namespace, source_name)
-            if not source_table_exists:
-                logger.warning(f"Source table not found: {source_namespace}.{source_name}")
-                raise ValueError(f"Source table not found: {source_namespace}.{source_name}")
-            
-            # Verify destination table does not exist
-            destination_table_exists = await TableService.table_exists(destination_namespace, destination_name)
-            if destination_table_exists:
-                logger.warning(f"Destination table already exists: {destination_namespace}.{destination_name}")
+            try:
+                # Move the table in one statement; the namespaces are resolved inline
+                record = await db.fetch_one(
+                    _RENAME_TABLE_SQL,
+                    source_namespace, source_name, destination_namespace, destination_name
+                )
+            except asyncpg.UniqueViolationError:
+                # Lost a race with a concurrent create/rename to the same name
+                logger.warning("Destination table already exists: %s.%s", destination_namespace, destination_name)
                 raise ValueError(f"Destination table already exists: {destination_namespace}.{destination_name}")
             
-            # Get namespace IDs
-            source_namespace_query = """
-            SELECT id FROM namespaces WHERE levels = $1
-            """
-            source_namespace_record = await db.fetch_one(source_namespace_query, source_namespace)
-            source_namespace_id = source_namespace_record["id"]
-            
-            destination_namespace_query = """
-            SELECT id FROM namespaces WHERE levels = $1
-            """
-            destination_namespace_record = await db.fetch_one(destination_namespace_query, destination_namespace)
-            destination_namespace_id = destination_namespace_record["id"]
-            
-            # Update table record
-            update_query = """
-            UPDATE tables 
-            SET namespace_id = $1, name = $2, updated_at = NOW()
-            WHERE namespace_id = $3 AND name = $4
-            """
-            
-            await db.execute(update_query, destination_namespace_id, destination_name, source_namespace_id, source_name)
+            TableService.invalidate_table(source_namespace, source_name)
+
+            if not record:
+                # Nothing was renamed, work out why
+                await TableService._raise_rename_failure(
+                    source_namespace, source_name, destination_namespace, destination_name
+                )
             
-            logger.info(f"Successfully renamed table {source_namespace}.{source_name} to {destination_namespace}.{destination_name}")
+            logger.info("Successfully renamed table %s.%s to %s.%s", source_namespace, source_name, destination_namespace, destination_name)
             
         except ValueError:
             # Re-raise ValueError for not found or table exists
             raise
         except Exception as e:
-            logger.error(f"Error renaming table: {str(e)}", exc_info=True)
+            logger.error("Error renaming table: %s", e, exc_info=True)
             raise
     
+    @staticmethod
+    async def _raise_rename_failure(
+        source_namespace: List[str],
+        source_name: str,
+        destination_namespace: List[str],
+        destination_name: str
+    ) -> None:
+        """Raise the error explaining why a rename matched no table."""
+        record = await db.fetch_one(
+            _RENAME_DIAGNOSTICS_SQL,
+            source_namespace, source_name, destination_namespace, destination_name
+        )
+        
+        if not record["source_namespace_exists"]:
+            logger.warning("Source namespace not found: %s", source_namespace)
+            raise ValueError(f"Source namespace not found: {source_namespace}")
+        
+        if not record["destination_namespace_exists"]:
+            logger.warning("Destination namespace not found: %s", destination_namespace)
+            raise ValueError(f"Destination namespace not found: {destination_namespace}")
+        
+        if not record["source_table_exists"]:
+            logger.warning("Source table not found: %s.%s", source_namespace, source_name)
+            raise ValueError(f"Source table not found: {source_namespace}.{source_name}")
+        
+        logger.warning("Destination table already exists: %s.%s", destination_namespace, destination_name)
+        raise ValueError(f"Destination table already exists: {destination_namespace}.{destination_name}")
+    
     @staticmethod
     async def report_metrics(
         namespace_levels: List[str],
@@ -1527,74 +1399,90 @@ class TableService:
         """
         Submit metrics about table operations.
         """
-        logger.info(f"Reporting metrics for table {namespace_levels}.{table_name}")
+        logger.info("Reporting metrics for table %s.%s", namespace_levels, table_name)
         
-        # Check if table exists
-        table_exists = await TableService.table_exists(namespace_levels, table_name)
-        if not table_exists:
-            logger.warning(f"Table not found: {namespace_levels}.{table_name}")
-            raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
+        is_scan, values = TableService._metrics_values(request)
         
-        # Get table ID
-        query = """
-        SELECT t.id FROM tables t
-        JOIN namespaces n ON t.namespace_id = n.id
-        WHERE n.levels = $1 AND t.name = $2
+        # With a cached table id the row is handed to the background writer and
+        # the request returns without waiting on the database. A table dropped by
+        # another process within the cache TTL makes that write fail and be logged.
+        table_id = TableService.get_cached_table_id(namespace_levels, table_name)
+        if table_id is not None:
+            await metrics_writer.submit(is_scan, (table_id, *values))
+        else:
+            # The table lookup is part of the INSERT, so no row back means no such table
+            insert_query = _INSERT_SCAN_METRICS_SQL if is_scan else _INSERT_COMMIT_METRICS_SQL
+            inserted = await db.fetch_one(insert_query, namespace_levels, table_name, *values)
+            if not inserted:
+                logger.warning("Table not found: %s.%s", namespace_levels, table_name)
+                raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
+            TableService.cache_table_id(namespace_levels, table_name, inserted["table_id"])
+            
+        logger.info("Recorded metrics for table %s.%s, report type: %s", namespace_levels, table_name, request.report_type)
+
+    @staticmethod
+    def _metrics_values(request: ReportMetricsRequest) -> Tuple[bool, tuple]:
         """
-        table_record = await db.fetch_one(query, namespace_levels, table_name)
-        table_id = table_record["id"]
-        
-        # Store metrics in database
-        metrics_json = json.loads(request.metrics.json(by_alias=True))
-        metadata_json = request.metadata or {}
-        
-        # Determine the type of metrics report (scan or commit) and store appropriately
-        if hasattr(request, 'filter') and hasattr(request, 'schema_id'):
-            # This is a scan report
-            insert_query = """
-            INSERT INTO operation_metrics (
-                table_id, report_type, snapshot_id, filter_json, 
-                schema_id, projected_field_ids, projected_field_names,
-                metrics_json, metadata_json, created_at
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, NOW())
-            """
-            # Convert filter to JSON if present
-            filter_json = None
-            if hasattr(request, 'filter') and request.filter:
-                filter_json = json.loads(request.filter.json(by_alias=True))
-                
-            await db.execute(
-                insert_query, 
-                table_id, 
+        Collect the operation_metrics column values of a report, without table_id.
+        Returns whether it is a scan report along with the values.
+        """
+        # The pool's jsonb codec serializes these, so plain values are passed through.
+        # Custom-root models keep their value under __root__ in dict().
+        metrics_json = request.metrics.dict(by_alias=True)["__root__"] or {}
+        metadata_json = request.metadata or None
+        
+        # Determine the type of metrics report (scan or commit)
+        if isinstance(request, ScanReport):
+            return True, (
                 request.report_type, 
                 request.snapshot_id, 
-                json.dumps(filter_json) if filter_json else None,
-                getattr(request, 'schema_id', None),
-                getattr(request, 'projected_field_ids', None),
-                getattr(request, 'projected_field_names', None),
-                json.dumps(metrics_json),
-                json.dumps(metadata_json) if metadata_json else None
+                request.filter,
+                request.schema_id,
+                request.projected_field_ids,
+                request.projected_field_names,
+                metrics_json,
+                metadata_json
             )
-        else:
-            # This is a commit report
-            insert_query = """
-            INSERT INTO operation_metrics (
-                table_id, report_type, snapshot_id, sequence_number,
-                operation, metrics_json, metadata_json, created_at
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
-            """
-            await db.execute(
-                insert_query, 
-                table_id, 
-                request.report_type, 
-                request.snapshot_id,
-                getattr(request, 'sequence_number', None),
-                getattr(request, 'operation', None),
-                json.dumps(metrics_json),
-                json.dumps(metadata_json) if metadata_json else None
-            )
-            
-        logger.info(f"Recorded metrics for table {namespace_levels}.{table_name}, report type: {request.report_type}")
+        
+        # Anything else is stored as a commit report
+        return False, (
+            request.report_type, 
+            request.snapshot_id,
+            getattr(request, 'sequence_number', None),
+            getattr(request, 'operation', None),
+            metrics_json,
+            metadata_json
+        )
+
+    @staticmethod
+    async def report_metrics_batch(
+        namespace_levels: List[str],
+        table_name: str,
+        requests: List[ReportMetricsRequest]
+    ) -> None:
+        """
+        Submit several metrics reports for a table in one go.
+        """
+        logger.info("Reporting %s metrics for table %s.%s", len(requests), namespace_levels, table_name)
+        
+        table_id = TableService.get_cached_table_id(namespace_levels, table_name)
+        if table_id is None:
+            table_record = await db.fetch_one(_TABLE_ID_SQL, namespace_levels, table_name)
+            if not table_record:
+                logger.warning("Table not found: %s.%s", namespace_levels, table_name)
+                raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
+            table_id = table_record["id"]
+            TableService.cache_table_id(namespace_levels, table_name, table_id)
+        
+        scan_rows = []
+        commit_rows = []
+        for request in requests:
+            is_scan, values = TableService._metrics_values(request)
+            (scan_rows if is_scan else commit_rows).append((table_id, *values))
+        
+        await write_metrics_rows(scan_rows, commit_rows)
+        
+        logger.info("Recorded %s scan and %s commit metrics for table %s.%s", len(scan_rows), len(commit_rows), namespace_levels, table_name)
 
     @staticmethod
     async def update_table(
@@ -1607,773 +1495,621 @@ class TableService:
         Handles table evolution including schema evolution, partition evolution,
         snapshot management, etc.
         """
-        logger.info(f"Processing table update for {namespace_levels}.{table_name}")
+        logger.info("Processing table update for %s.%s", namespace_levels, table_name)
         
-        # Get namespace ID and table ID
-        namespace_id = await TableService._get_namespace_id(namespace_levels)
-        if namespace_id is None:
-            raise ValueError(f"Namespace not found: {namespace_levels}")
-        
-        # Get table details
-        query = """
-        SELECT t.id, t.table_uuid, t.location, t.current_snapshot_id, t.last_sequence_number,
-            t.last_updated_ms, t.last_column_id, t.schema_id, t.current_schema_id,
-            t.default_spec_id, t.last_partition_id, t.default_sort_order_id,
-            t.properties, t.format_version, t.row_lineage, t.next_row_id
-        FROM tables t
-        WHERE t.namespace_id = $1 AND t.name = $2
-        """
-        
-        table_record = await db.fetch_one(query, namespace_id, table_name)
-        if not table_record:
-            raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
+        # Get table details, checking the namespace in the same query
+        table_record = await TableService._fetch_table_row(namespace_levels, table_name)
         
         table_id = table_record["id"]
-        table_uuid = str(table_record["table_uuid"])
-        location = table_record["location"]
         
         try:
+            updates = [update.__root__ for update in request.updates]
             async with db.transaction():
-                # Verify all requirements are met
-                for requirement in request.requirements:
-                    if not await TableService._validate_requirement(table_id, table_record, requirement):
-                        requirement_type = getattr(requirement, "type", "Unknown")
-                        raise ValueError(f"Table requirement not met: {requirement_type}")
-                
-                # Process all updates
-                for update in request.updates:
-                    await TableService._apply_update(table_id, table_record, update.__root__)
-                    
-                # Reload table record after updates
-                table_record = await db.fetch_one(query, namespace_id, table_name)
+                # Lock the row and re-read it under the lock, so requirements are
+                # checked against the state this commit builds on
+                table_record = await TableService._lock_table_row(namespace_levels, table_name, table_id)
+                await TableService._check_requirements(table_id, table_record, request.requirements)
+                await TableService._apply_updates(table_id, table_record, updates)
                 
-                # Generate new metadata location
+                # Generate new metadata location, named for the format version the
+                # commit leaves the table at
+                location = table_record["location"]
+                format_version = table_record["format_version"]
+                for update in updates:
+                    if getattr(update, "action", None) == "upgrade-format-version":
+                        format_version = update.format_version
                 now_ms = int(time.time() * 1000)
                 metadata_file_uuid = uuid.uuid4()
-                metadata_location = f"{location}/metadata/{table_record['format_version']:05d}-{metadata_file_uuid}.metadata.json"
+                metadata_location = f"{location}/metadata/{format_version:05d}-{metadata_file_uuid}.metadata.json"
                 
-                # Create metadata log entry
+                # Log the metadata file as part of the commit, so it exists exactly
+                # when the commit does
                 log_query = """
                 INSERT INTO metadata_log (table_id, metadata_file, timestamp_ms)
                 VALUES ($1, $2, $3)
                 """
                 await db.execute(log_query, table_id, metadata_location, now_ms)
-                
-                # Construct the updated table metadata
-                table_metadata = await TableService._build_table_metadata(table_id)
-                
-                logger.info(f"Successfully updated table {namespace_levels}.{table_name}")
-                
-                # Return updated metadata
-                return CommitTableResponse(
-                    metadata_location=metadata_location,
-                    metadata=table_metadata
-                )
+            
+            TableService.invalidate_table(namespace_levels, table_name, table_id)
+            
+            # Build the response from the committed state
+            table_metadata = await TableService._build_table_metadata(table_id)
+            
+            logger.info("Successfully updated table %s.%s", namespace_levels, table_name)
+            
+            # Return updated metadata
+            return CommitTableResponse(
+                metadata_location=metadata_location,
+                metadata=table_metadata
+            )
         except ValueError:
             # Re-raise ValueError
             raise
         except Exception as e:
-            logger.error(f"Error updating table: {str(e)}", exc_info=True)
+            logger.error("Error updating table: %s", e, exc_info=True)
             raise
 
     @staticmethod
-    async def _get_namespace_id(namespace_levels: List[str]) -> Optional[int]:
-        """Helper method to get namespace ID from namespace levels."""
-        query = """
-        SELECT id FROM namespaces WHERE levels = $1
+    async def _lock_table_row(namespace_levels: List[str], table_name: str, table_id: int) -> Dict:
+        """
+        Lock a table's row until the caller's transaction ends and move its version.
+        Returns the row as read under the lock.
         """
-        record = await db.fetch_one(query, namespace_levels)
-        return record["id"] if record else None
+        record = await db.fetch_one(_LOCK_TABLE_ROW_SQL, table_id)
+        if not record:
+            raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
+        await db.execute(_BUMP_TABLE_VERSION_SQL, table_id)
+        return record
 
     @staticmethod
-    async def _validate_requirement(
+    async def _fetch_table_row(namespace_levels: List[str], table_name: str) -> Dict:
+        """
+        Get a table's row by namespace and name in one query.
+        Raises ValueError naming whichever of the namespace or table is missing.
+        """
+        record = await db.fetch_one(_TABLE_ROW_BY_NAME_SQL, namespace_levels, table_name)
+        if not record:
+            raise ValueError(f"Namespace not found: {namespace_levels}")
+        if record["id"] is None:
+            raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
+        return record
+
+    @staticmethod
+    async def _check_requirements(
         table_id: int,
         table_record: Dict,
-        requirement: TableRequirement
+        requirements: List[TableRequirement]
+    ) -> None:
+        """
+        Raise ValueError for the first requirement that is not met.
+        Refs named by assert-ref-snapshot-id requirements are fetched in one query;
+        the other requirements are checked against table_record.
+        """
+        ref_names = [r.ref for r in requirements if getattr(r, "type", None) == "assert-ref-snapshot-id"]
+        ref_snapshot_ids = {}
+        if ref_names:
+            records = await db.fetch_all(_REF_SNAPSHOT_IDS_SQL, table_id, ref_names)
+            ref_snapshot_ids = {record["name"]: record["snapshot_id"] for record in records}
+        
+        for requirement in requirements:
+            if not TableService._validate_requirement(table_record, requirement, ref_snapshot_ids):
+                requirement_type = getattr(requirement, "type", "Unknown")
+                raise ValueError(f"Table requirement not met: {requirement_type}")
+
+    @staticmethod
+    def _validate_requirement(
+        table_record: Dict,
+        requirement: TableRequirement,
+        ref_snapshot_ids: Dict[str, int]
     ) -> bool:
-        """Validate that a table requirement is met."""
+        """
+        Validate that a table requirement is met.
+        ref_snapshot_ids maps the refs named by assert-ref-snapshot-id requirements
+        to their current snapshot ids (refs that do not exist are absent).
+        """
         requirement_type = getattr(requirement, "type", None)
-        logger.debug(f"Validating requirement type: {requirement_type}")
+        logger.debug("Validating requirement type: %s", requirement_type)
         
-        if requirement_type == "assert-create":
-            # Table must not exist (this should never be true here since we already loaded the table)
+        check = _REQUIREMENT_CHECKS.get(requirement_type)
+        if check is None:
+            # Unknown requirement type
+            logger.warning("Unknown requirement type: %s", requirement_type)
             return False
-        
-        elif requirement_type == "assert-table-uuid":
-            # Table UUID must match
-            return str(table_record["table_uuid"]) == requirement.uuid
-        
-        elif requirement_type == "assert-ref-snapshot-id":
-            # Check if ref exists and points to the right snapshot
-            query = """
-            SELECT snapshot_id FROM snapshot_refs 
-            WHERE table_id = $1 AND name = $2
-            """
-            record = await db.fetch_one(query, table_id, requirement.ref)
-            
-            if requirement.snapshot_id is None:
-                # Ref must not exist
-                return record is None
-            else:
-                # Ref must exist and point to the right snapshot
-                return record and record["snapshot_id"] == requirement.snapshot_id
-        
-        elif requirement_type == "assert-last-assigned-field-id":
-            # Last column ID must match
-            return table_record["last_column_id"] == requirement.last_assigned_field_id
-        
-        elif requirement_type == "assert-current-schema-id":
-            # Current schema ID must match
-            return table_record["current_schema_id"] == requirement.current_schema_id
-        
-        elif requirement_type == "assert-last-assigned-partition-id":
-            # Last partition ID must match
-            return table_record["last_partition_id"] == requirement.last_assigned_partition_id
-        
-        elif requirement_type == "assert-default-spec-id":
-            # Default spec ID must match
-            return table_record["default_spec_id"] == requirement.default_spec_id
-        
-        elif requirement_type == "assert-default-sort-order-id":
-            # Default sort order ID must match
-            return table_record["default_sort_order_id"] == requirement.default_sort_order_id
-        
-        # Unknown requirement type
-        logger.warning(f"Unknown requirement type: {requirement_type}")
-        return False
+        return check(table_record, requirement, ref_snapshot_ids)
+
+    @staticmethod
+    async def _apply_updates(
+        table_id: int,
+        table_record: Dict,
+        updates: List[Any]
+    ) -> None:
+        """
+        Apply a commit's updates in order, on the caller's transaction connection.
+        Consecutive updates with the same action are merged into one statement
+        where _BATCH_UPDATE_HANDLERS has a handler for it.
+        Only add-spec reads the table row (last_partition_id); it returns the
+        updated row, which later updates see instead.
+        """
+        record = table_record
+        for update_type, run in itertools.groupby(updates, key=lambda u: getattr(u, "action", None)):
+            run = list(run)
+            batch_handler = _BATCH_UPDATE_HANDLERS.get(update_type)
+            if batch_handler is not None and len(run) > 1:
+                # Consecutive updates of one action merge into a single statement
+                logger.info("Applying %s %s updates as one batch", len(run), update_type)
+                await batch_handler(table_id, run)
+                continue
+            for update in run:
+                record = await TableService._apply_update(table_id, record, update) or record
 
     @staticmethod
     async def _apply_update(
         table_id: int,
         table_record: Dict,
         update: Any
-    ) -> None:
-        """Apply a single update to the table."""
+    ) -> Optional[Dict]:
+        """
+        Apply a single update to the table, dispatching on its action.
+        Returns the updated table row for handlers that write one back, else None.
+        """
         update_type = getattr(update, "action", None)
-        logger.info(f"Applying update: {update_type}")
-        
-        if update_type == "assign-uuid":
-            # Update table UUID
-            query = """
-            UPDATE tables SET table_uuid = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, update.uuid, table_id)
-        
-        elif update_type == "upgrade-format-version":
-            # Upgrade format version
-            query = """
-            UPDATE tables SET format_version = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, update.format_version, table_id)
-        
-        elif update_type == "add-schema":
-            # Add new schema
-            schema_json = json.loads(update.schema_.json(by_alias=True))
-            
-            # Set schema_id if not already set
-            schema_id = schema_json.get("schema-id")
-            if schema_id is None:
-                # Get the highest schema ID and increment
-                query = """
-                SELECT MAX(schema_id) as max_schema_id FROM schemas WHERE table_id = $1
-                """
-                record = await db.fetch_one(query, table_id)
-                max_schema_id = record["max_schema_id"] if record and record["max_schema_id"] is not None else -1
-                schema_id = max_schema_id + 1
-                schema_json["schema-id"] = schema_id
-            
-            # Calculate last_column_id
-            last_column_id = table_record["last_column_id"]
-            for field in schema_json.get("fields", []):
-                if field.get("id", 0) > last_column_id:
-                    last_column_id = field["id"]
-            
-            # Insert new schema
-            query = """
+        logger.info("Applying update: %s", update_type)
+        
+        handler = _UPDATE_HANDLERS.get(update_type)
+        if handler is None:
+            # Unknown update type
+            logger.warning("Unknown update type: %s", update_type)
+            raise ValueError(f"Unsupported update type: {update_type}")
+        return await handler(table_id, table_record, update)
+
+    @staticmethod
+    async def _apply_assign_uuid(table_id: int, table_record: Dict, update: Any) -> None:
+        """Update table UUID."""
+        query = """
+        UPDATE tables SET table_uuid = $1, updated_at = NOW()
+        WHERE id = $2
+        """
+        await db.execute(query, update.uuid, table_id)
+
+    @staticmethod
+    async def _apply_upgrade_format_version(table_id: int, table_record: Dict, update: Any) -> None:
+        """Upgrade format version."""
+        query = """
+        UPDATE tables SET format_version = $1, updated_at = NOW()
+        WHERE id = $2
+        """
+        await db.execute(query, update.format_version, table_id)
+
+    @staticmethod
+    async def _apply_add_schema(table_id: int, table_record: Dict, update: Any) -> None:
+        """Add new schema."""
+        schema_json = update.schema_.dict(by_alias=True)
+        
+        # Highest column ID in the new schema
+        max_column_id = max((field.get("id", 0) for field in schema_json.get("fields", [])), default=0)
+        
+        # Insert the schema, taking the next schema ID if none is set and
+        # writing the chosen ID into schema-id, and raise the table's
+        # last_column_id in the same statement
+        query = """
+        WITH new_schema AS (
             INSERT INTO schemas (table_id, schema_id, schema_json)
-            VALUES ($1, $2, $3)
-            """
-            await db.execute(query, table_id, schema_id, json.dumps(schema_json))
-            
-            # Update table's last_column_id
-            query = """
-            UPDATE tables SET last_column_id = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, last_column_id, table_id)
-        
-        elif update_type == "set-current-schema":
-            # Set current schema
-            schema_id = update.schema_id
-            
-            # If schema_id is -1, set to the latest schema
-            if schema_id == -1:
-                query = """
-                SELECT MAX(schema_id) as schema_id FROM schemas WHERE table_id = $1
-                """
-                record = await db.fetch_one(query, table_id)
-                schema_id = record["schema_id"] if record else 0
-            
-            # Update current schema ID
-            query = """
-            UPDATE tables SET current_schema_id = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, schema_id, table_id)
-        
-        elif update_type == "add-spec":
-            # Add partition spec
-            spec_json = json.loads(update.spec.json(by_alias=True))
-            
-            # Set spec_id if not already set
-            spec_id = spec_json.get("spec-id")
-            if spec_id is None:
-                # Get the highest spec ID and increment
-                query = """
-                SELECT MAX(spec_id) as max_spec_id FROM partition_specs WHERE table_id = $1
-                """
-                record = await db.fetch_one(query, table_id)
-                max_spec_id = record["max_spec_id"] if record and record["max_spec_id"] is not None else -1
-                spec_id = max_spec_id + 1
-                spec_json["spec-id"] = spec_id
-            
-            # Calculate last_partition_id
-            last_partition_id = table_record["last_partition_id"]
-            for field in spec_json.get("fields", []):
-                if "field-id" in field and field["field-id"] is not None:
-                    if field["field-id"] > last_partition_id:
-                        last_partition_id = field["field-id"]
-                else:
-                    # Auto-assign field-id if missing
-                    last_partition_id += 1
-                    field["field-id"] = last_partition_id
-            
-            # Insert new partition spec
-            query = """
-            INSERT INTO partition_specs (table_id, spec_id, spec_json)
-            VALUES ($1, $2, $3)
-            """
-            await db.execute(query, table_id, spec_id, json.dumps(spec_json))
-            
-            # Update table's last_partition_id
-            query = """
-            UPDATE tables SET last_partition_id = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, last_partition_id, table_id)
-        
-        elif update_type == "set-default-spec":
-            # Set default partition spec
-            spec_id = update.spec_id
-            
-            # If spec_id is -1, set to the latest spec
-            if spec_id == -1:
-                query = """
-                SELECT MAX(spec_id) as spec_id FROM partition_specs WHERE table_id = $1
-                """
-                record = await db.fetch_one(query, table_id)
-                spec_id = record["spec_id"] if record else 0
-            
-            # Update default spec ID
-            query = """
-            UPDATE tables SET default_spec_id = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, spec_id, table_id)
-        
-        elif update_type == "add-sort-order":
-            # Add sort order
-            order_json = json.loads(update.sort_order.json(by_alias=True))
-            order_id = order_json.get("order-id")
-            
-            # Insert new sort order
-            query = """
-            INSERT INTO sort_orders (table_id, order_id, order_json)
-            VALUES ($1, $2, $3)
-            """
-            await db.execute(query, table_id, order_id, json.dumps(order_json))
-        
-        elif update_type == "set-default-sort-order":
-            # Set default sort order
-            order_id = update.sort_order_id
-            
-            # If order_id is -1, set to the latest order
-            if order_id == -1:
-                query = """
-                SELECT MAX(order_id) as order_id FROM sort_orders WHERE table_id = $1
-                """
-                record = await db.fetch_one(query, table_id)
-                order_id = record["order_id"] if record else 0
-            
-            # Update default sort order ID
-            query = """
-            UPDATE tables SET default_sort_order_id = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, order_id, table_id)
-        
-        elif update_type == "add-snapshot":
-            # Add snapshot
-            snapshot_json = json.loads(update.snapshot.json(by_alias=True))
-            snapshot_id = snapshot_json.get("snapshot-id")
-            parent_snapshot_id = snapshot_json.get("parent-snapshot-id")
-            sequence_number = snapshot_json.get("sequence-number")
-            timestamp_ms = snapshot_json.get("timestamp-ms")
-            manifest_list = snapshot_json.get("manifest-list")
-            summary = snapshot_json.get("summary", {})
-            schema_id = snapshot_json.get("schema-id")
-            
-            # Insert new snapshot
-            query = """
-            INSERT INTO snapshots (
-                table_id, snapshot_id, parent_snapshot_id, sequence_number,
-                timestamp_ms, manifest_list, summary, schema_id
-            )
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            """
-            await db.execute(
-                query, table_id, snapshot_id, parent_snapshot_id, sequence_number,
-                timestamp_ms, manifest_list, json.dumps(summary), schema_id
-            )
-            
-            # Update table's current_snapshot_id and last_sequence_number
-            query = """
-            UPDATE tables SET 
-                current_snapshot_id = $1, 
-                last_sequence_number = GREATEST(last_sequence_number, $2),
-                updated_at = NOW()
-            WHERE id = $3
-            """
-            await db.execute(query, snapshot_id, sequence_number, table_id)
-        
-        elif update_type == "set-snapshot-ref":
-            # Set snapshot reference (branch/tag)
-            ref_name = update.ref_name
-            snapshot_id = update.snapshot_id
-            ref_type = update.type
-            min_snapshots_to_keep = getattr(update, "min_snapshots_to_keep", None)
-            max_snapshot_age_ms = getattr(update, "max_snapshot_age_ms", None)
-            max_ref_age_ms = getattr(update, "max_ref_age_ms", None)
-            
-            # Check if ref already exists
-            query = """
-            SELECT id FROM snapshot_refs
-            WHERE table_id = $1 AND name = $2
-            """
-            record = await db.fetch_one(query, table_id, ref_name)
-            
-            if record:
-                # Update existing ref
-                query = """
-                UPDATE snapshot_refs
-                SET snapshot_id = $1, type = $2, min_snapshots_to_keep = $3,
-                    max_snapshot_age_ms = $4, max_ref_age_ms = $5, updated_at = NOW()
-                WHERE table_id = $6 AND name = $7
-                """
-                await db.execute(
-                    query, snapshot_id, ref_type, min_snapshots_to_keep,
-                    max_snapshot_age_ms, max_ref_age_ms, table_id, ref_name
-                )
+            SELECT $1, chosen.id, jsonb_set($3::jsonb, '{schema-id}', to_jsonb(chosen.id))
+            FROM (SELECT COALESCE($2::integer, (
+                SELECT COALESCE(MAX(schema_id), -1) + 1 FROM schemas WHERE table_id = $1
+            )) AS id) AS chosen
+        )
+        UPDATE tables SET last_column_id = GREATEST(last_column_id, $4), updated_at = NOW()
+        WHERE id = $1
+        """
+        await db.execute(
+            query, table_id, schema_json.get("schema-id"), schema_json, max_column_id
+        )
+
+    @staticmethod
+    async def _apply_set_current_schema(table_id: int, table_record: Dict, update: Any) -> None:
+        """Set current schema; -1 means the latest schema."""
+        query = """
+        UPDATE tables SET current_schema_id = CASE WHEN $1::integer = -1 THEN COALESCE((
+            SELECT MAX(schema_id) FROM schemas WHERE table_id = $2
+        ), 0) ELSE $1 END, updated_at = NOW()
+        WHERE id = $2
+        """
+        await db.execute(query, update.schema_id, table_id)
+
+    @staticmethod
+    async def _apply_add_spec(table_id: int, table_record: Dict, update: Any) -> Dict:
+        """Add partition spec, returning the updated table row."""
+        spec_json = update.spec.dict(by_alias=True)
+        
+        # Calculate last_partition_id
+        last_partition_id = table_record["last_partition_id"]
+        for field in spec_json.get("fields", []):
+            if "field-id" in field and field["field-id"] is not None:
+                if field["field-id"] > last_partition_id:
+                    last_partition_id = field["field-id"]
             else:
-                # Insert new ref
-                query = """
-                INSERT INTO snapshot_refs (
-                    table_id, name, snapshot_id, type,
-                    min_snapshots_to_keep, max_snapshot_age_ms, max_ref_age_ms
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                """
-                await db.execute(
-                    query, table_id, ref_name, snapshot_id, ref_type,
-                    min_snapshots_to_keep, max_snapshot_age_ms, max_ref_age_ms
-                )
+                # Auto-assign field-id if missing
+                last_partition_id += 1
+                field["field-id"] = last_partition_id
         
-        elif update_type == "remove-snapshots":
-            # Remove snapshots
-            snapshot_ids = update.snapshot_ids
-            
-            # Delete snapshots
-            query = """
-            DELETE FROM snapshots
-            WHERE table_id = $1 AND snapshot_id = ANY($2)
-            """
-            await db.execute(query, table_id, snapshot_ids)
-        
-        elif update_type == "remove-snapshot-ref":
-            # Remove snapshot reference
-            ref_name = update.ref_name
-            
-            # Delete ref
-            query = """
-            DELETE FROM snapshot_refs
-            WHERE table_id = $1 AND name = $2
-            """
-            await db.execute(query, table_id, ref_name)
-        
-        elif update_type == "set-location":
-            # Set table location
-            new_location = update.location
-            
-            # Update location
-            query = """
-            UPDATE tables SET location = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, new_location, table_id)
-        
-        elif update_type == "set-properties":
-            # Set table properties
-            updates = update.updates
-            
-            # Get current properties
-            current_properties = table_record["properties"]
-            if isinstance(current_properties, str):
-                current_properties = json.loads(current_properties)
-            elif current_properties is None:
-                current_properties = {}
-            
-            # Update properties
-            for key, value in updates.items():
-                current_properties[key] = value
-            
-            # Save updated properties
-            query = """
-            UPDATE tables SET properties = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, json.dumps(current_properties), table_id)
-        
-        elif update_type == "remove-properties":
-            # Remove table properties
-            removals = update.removals
-            
-            # Get current properties
-            current_properties = table_record["properties"]
-            if isinstance(current_properties, str):
-                current_properties = json.loads(current_properties)
-            elif current_properties is None:
-                current_properties = {}
-            
-            # Remove properties
-            for key in removals:
-                if key in current_properties:
-                    del current_properties[key]
-            
-            # Save updated properties
-            query = """
-            UPDATE tables SET properties = $1, updated_at = NOW()
-            WHERE id = $2
-            """
-            await db.execute(query, json.dumps(current_properties), table_id)
-        
-        elif update_type == "set-statistics":
-            # Set table statistics
-            statistics = update.statistics
-            snapshot_id = statistics.snapshot_id
-            statistics_path = statistics.statistics_path
-            file_size_in_bytes = statistics.file_size_in_bytes
-            file_footer_size_in_bytes = statistics.file_footer_size_in_bytes
-            blob_metadata_json = json.loads(json.dumps([b.dict(by_alias=True) for b in statistics.blob_metadata]))
-            
-            # Check if statistics already exist for this snapshot
-            query = """
-            SELECT id FROM table_statistics
-            WHERE table_id = $1 AND snapshot_id = $2
-            """
-            record = await db.fetch_one(query, table_id, snapshot_id)
-            
-            if record:
-                # Update existing statistics
-                query = """
-                UPDATE table_statistics
-                SET statistics_path = $1, file_size_in_bytes = $2,
-                    file_footer_size_in_bytes = $3, blob_metadata = $4
-                WHERE table_id = $5 AND snapshot_id = $6
-                """
-                await db.execute(
-                    query, statistics_path, file_size_in_bytes,
-                    file_footer_size_in_bytes, json.dumps(blob_metadata_json),
-                    table_id, snapshot_id
-                )
-            else:
-                # Insert new statistics
-                query = """
-                INSERT INTO table_statistics (
-                    table_id, snapshot_id, statistics_path,
-                    file_size_in_bytes, file_footer_size_in_bytes, blob_metadata
-                )
-                VALUES ($1, $2, $3, $4, $5, $6)
-                """
-                await db.execute(
-                    query, table_id, snapshot_id, statistics_path,
-                    file_size_in_bytes, file_footer_size_in_bytes, json.dumps(blob_metadata_json)
-                )
+        # Insert the spec, taking the next spec ID if none is set and writing
+        # the chosen ID into spec-id, and raise the table's last_partition_id
+        # in the same statement
+        query = """
+        WITH new_spec AS (
+            INSERT INTO partition_specs (table_id, spec_id, spec_json)
+            SELECT $1, chosen.id, jsonb_set($3::jsonb, '{spec-id}', to_jsonb(chosen.id))
+            FROM (SELECT COALESCE($2::integer, (
+                SELECT COALESCE(MAX(spec_id), -1) + 1 FROM partition_specs WHERE table_id = $1
+            )) AS id) AS chosen
+        )
+        UPDATE tables SET last_partition_id = GREATEST(last_partition_id, $4), updated_at = NOW()
+        WHERE id = $1
+        RETURNING *
+        """
+        return await db.fetch_one(
+            query, table_id, spec_json.get("spec-id"), spec_json, last_partition_id
+        )
+
+    @staticmethod
+    async def _apply_set_default_spec(table_id: int, table_record: Dict, update: Any) -> None:
+        """Set default partition spec; -1 means the latest spec."""
+        query = """
+        UPDATE tables SET default_spec_id = CASE WHEN $1::integer = -1 THEN COALESCE((
+            SELECT MAX(spec_id) FROM partition_specs WHERE table_id = $2
+        ), 0) ELSE $1 END, updated_at = NOW()
+        WHERE id = $2
+        """
+        await db.execute(query, update.spec_id, table_id)
+
+    @staticmethod
+    async def _apply_add_sort_order(table_id: int, table_record: Dict, update: Any) -> None:
+        """Add sort order."""
+        order_json = update.sort_order.dict(by_alias=True)
         
-        elif update_type == "set-partition-statistics":
-            # Set partition statistics
-            partition_statistics = update.partition_statistics
-            snapshot_id = partition_statistics.snapshot_id
-            statistics_path = partition_statistics.statistics_path
-            file_size_in_bytes = partition_statistics.file_size_in_bytes
-            
-            # Check if partition statistics already exist for this snapshot
-            query = """
-            SELECT id FROM partition_statistics
-            WHERE table_id = $1 AND snapshot_id = $2
-            """
-            record = await db.fetch_one(query, table_id, snapshot_id)
-            
-            if record:
-                # Update existing statistics
-                query = """
-                UPDATE partition_statistics
-                SET statistics_path = $1, file_size_in_bytes = $2
-                WHERE table_id = $3 AND snapshot_id = $4
-                """
-                await db.execute(
-                    query, statistics_path, file_size_in_bytes, table_id, snapshot_id
-                )
-            else:
-                # Insert new statistics
-                query = """
-                INSERT INTO partition_statistics (
-                    table_id, snapshot_id, statistics_path, file_size_in_bytes
-                )
-                VALUES ($1, $2, $3, $4)
-                """
-                await db.execute(
-                    query, table_id, snapshot_id, statistics_path, file_size_in_bytes
-                )
+        # Insert new sort order, taking the next order ID if none is set and
+        # writing the chosen ID into order-id
+        query = """
+        INSERT INTO sort_orders (table_id, order_id, order_json)
+        SELECT $1, chosen.id, jsonb_set($3::jsonb, '{order-id}', to_jsonb(chosen.id))
+        FROM (SELECT COALESCE($2::integer, (
+            SELECT COALESCE(MAX(order_id), -1) + 1 FROM sort_orders WHERE table_id = $1
+        )) AS id) AS chosen
+        """
+        await db.execute(query, table_id, order_json.get("order-id"), order_json)
+
+    @staticmethod
+    async def _apply_set_default_sort_order(table_id: int, table_record: Dict, update: Any) -> None:
+        """Set default sort order; -1 means the latest order."""
+        query = """
+        UPDATE tables SET default_sort_order_id = CASE WHEN $1::integer = -1 THEN COALESCE((
+            SELECT MAX(order_id) FROM sort_orders WHERE table_id = $2
+        ), 0) ELSE $1 END, updated_at = NOW()
+        WHERE id = $2
+        """
+        await db.execute(query, update.sort_order_id, table_id)
+
+    @staticmethod
+    async def _apply_add_snapshot(table_id: int, table_record: Dict, update: Any) -> None:
+        """Add snapshot."""
+        snapshot_json = update.snapshot.dict(by_alias=True)
+        snapshot_id = snapshot_json.get("snapshot-id")
+        parent_snapshot_id = snapshot_json.get("parent-snapshot-id")
+        sequence_number = snapshot_json.get("sequence-number")
+        timestamp_ms = snapshot_json.get("timestamp-ms")
+        manifest_list = snapshot_json.get("manifest-list")
+        summary = snapshot_json.get("summary", {})
+        schema_id = snapshot_json.get("schema-id")
+        
+        # Insert new snapshot
+        query = """
+        INSERT INTO snapshots (
+            table_id, snapshot_id, parent_snapshot_id, sequence_number,
+            timestamp_ms, manifest_list, summary, schema_id
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+        """
+        await db.execute(
+            query, table_id, snapshot_id, parent_snapshot_id, sequence_number,
+            timestamp_ms, manifest_list, summary, schema_id
+        )
         
-        elif update_type == "remove-statistics":
-            # Remove statistics
-            snapshot_id = update.snapshot_id
-            
-            # Delete statistics
-            query = """
-            DELETE FROM table_statistics
-            WHERE table_id = $1 AND snapshot_id = $2
-            """
-            await db.execute(query, table_id, snapshot_id)
-        
-        elif update_type == "remove-partition-statistics":
-            # Remove partition statistics
-            snapshot_id = update.snapshot_id
-            
-            # Delete partition statistics
-            query = """
-            DELETE FROM partition_statistics
-            WHERE table_id = $1 AND snapshot_id = $2
-            """
-            await db.execute(query, table_id, snapshot_id)
-        
-        elif update_type == "remove-partition-specs":
-            # Remove partition specs
-            spec_ids = update.spec_ids
-            
-            # Delete partition specs
-            query = """
-            DELETE FROM partition_specs
-            WHERE table_id = $1 AND spec_id = ANY($2)
-            """
-            await db.execute(query, table_id, spec_ids)
-        
-        elif update_type == "remove-schemas":
-            # Remove schemas
-            schema_ids = update.schema_ids
-            
-            # Delete schemas
-            query = """
-            DELETE FROM schemas
-            WHERE table_id = $1 AND schema_id = ANY($2)
-            """
-            await db.execute(query, table_id, schema_ids)
-        
-        elif update_type == "enable-row-lineage":
-            # Enable row lineage
-            query = """
-            UPDATE tables SET row_lineage = TRUE, updated_at = NOW()
-            WHERE id = $1
-            """
-            await db.execute(query, table_id)
+        # Update table's current_snapshot_id and last_sequence_number
+        query = """
+        UPDATE tables SET 
+            current_snapshot_id = $1, 
+            last_sequence_number = GREATEST(last_sequence_number, $2),
+            updated_at = NOW()
+        WHERE id = $3
+        """
+        await db.execute(query, snapshot_id, sequence_number, table_id)
+
+    @staticmethod
+    async def _apply_set_snapshot_ref(table_id: int, table_record: Dict, update: Any) -> None:
+        """Set snapshot reference (branch/tag)."""
+        ref_name = update.ref_name
+        snapshot_id = update.snapshot_id
+        ref_type = update.type
+        min_snapshots_to_keep = getattr(update, "min_snapshots_to_keep", None)
+        max_snapshot_age_ms = getattr(update, "max_snapshot_age_ms", None)
+        max_ref_age_ms = getattr(update, "max_ref_age_ms", None)
+        
+        # Insert the ref, or update it in place if the name is taken
+        query = """
+        INSERT INTO snapshot_refs (
+            table_id, name, snapshot_id, type,
+            min_snapshots_to_keep, max_snapshot_age_ms, max_ref_age_ms
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        ON CONFLICT (table_id, name) DO UPDATE
+        SET snapshot_id = EXCLUDED.snapshot_id, type = EXCLUDED.type,
+            min_snapshots_to_keep = EXCLUDED.min_snapshots_to_keep,
+            max_snapshot_age_ms = EXCLUDED.max_snapshot_age_ms,
+            max_ref_age_ms = EXCLUDED.max_ref_age_ms, updated_at = NOW()
+        """
+        await db.execute(
+            query, table_id, ref_name, snapshot_id, ref_type,
+            min_snapshots_to_keep, max_snapshot_age_ms, max_ref_age_ms
+        )
+
+    @staticmethod
+    async def _apply_remove_snapshots(table_id: int, table_record: Dict, update: Any) -> None:
+        """Remove snapshots."""
+        snapshot_ids = update.snapshot_ids
         
-        else:
-            # Unknown update type
-            logger.warning(f"Unknown update type: {update_type}")
-            raise ValueError(f"Unsupported update type: {update_type}")
+        # Delete snapshots
+        query = """
+        DELETE FROM snapshots
+        WHERE table_id = $1 AND snapshot_id = ANY($2)
+        """
+        await db.execute(query, table_id, snapshot_ids)
 
     @staticmethod
-    async def _build_table_metadata(table_id: int) -> TableMetadata:
-        """Build complete table metadata object."""
-        # Get table details
+    async def _apply_remove_snapshot_ref(table_id: int, table_record: Dict, update: Any) -> None:
+        """Remove snapshot reference."""
+        ref_name = update.ref_name
+        
+        # Delete ref
         query = """
-        SELECT t.table_uuid, t.location, t.current_snapshot_id, t.last_sequence_number,
-            t.last_updated_ms, t.last_column_id, t.schema_id, t.current_schema_id,
-            t.default_spec_id, t.last_partition_id, t.default_sort_order_id,
-            t.properties, t.format_version, t.row_lineage, t.next_row_id
-        FROM tables t
-        WHERE t.id = $1
+        DELETE FROM snapshot_refs
+        WHERE table_id = $1 AND name = $2
         """
+        await db.execute(query, table_id, ref_name)
+
+    @staticmethod
+    async def _apply_set_location(table_id: int, table_record: Dict, update: Any) -> None:
+        """Set table location."""
+        new_location = update.location
         
-        table_record = await db.fetch_one(query, table_id)
+        # Update location
+        query = """
+        UPDATE tables SET location = $1, updated_at = NOW()
+        WHERE id = $2
+        """
+        await db.execute(query, new_location, table_id)
+
+    @staticmethod
+    async def _apply_set_properties(table_id: int, table_record: Dict, update: Any) -> None:
+        """Set table properties."""
+        updates = update.updates
         
-        # Fetch schemas
-        schemas_query = """
-        SELECT schema_id, schema_json FROM schemas WHERE table_id = $1
+        # Merge the new properties into the stored ones in one statement
+        query = """
+        UPDATE tables SET properties = COALESCE(properties, '{}'::jsonb) || $1::jsonb, updated_at = NOW()
+        WHERE id = $2
         """
-        schema_records = await db.fetch_all(schemas_query, table_id)
-        schemas = []
+        await db.execute(query, updates, table_id)
+
+    @staticmethod
+    async def _apply_remove_properties(table_id: int, table_record: Dict, update: Any) -> None:
+        """Remove table properties."""
+        removals = update.removals
         
-        for record in schema_records:
-            schema_json = record["schema_json"]
-            if isinstance(schema_json, str):
-                schema_json = json.loads(schema_json)
-            
-            # Ensure schema_id is set
-            if "schema-id" not in schema_json and record["schema_id"] is not None:
-                schema_json["schema-id"] = record["schema_id"]
-                
-            schema = Schema.parse_obj(schema_json)
-            schemas.append(schema)
+        # Drop the keys from the stored properties in one statement
+        query = """
+        UPDATE tables SET properties = COALESCE(properties, '{}'::jsonb) - $1::text[], updated_at = NOW()
+        WHERE id = $2
+        """
+        await db.execute(query, list(removals), table_id)
+
+    @staticmethod
+    async def _apply_set_statistics(table_id: int, table_record: Dict, update: Any) -> None:
+        """Set table statistics."""
+        statistics = update.statistics
+        snapshot_id = statistics.snapshot_id
+        statistics_path = statistics.statistics_path
+        file_size_in_bytes = statistics.file_size_in_bytes
+        file_footer_size_in_bytes = statistics.file_footer_size_in_bytes
+        
+        # Insert the statistics, or replace those already set for this snapshot
+        await db.execute(
+            _UPSERT_TABLE_STATISTICS_SQL, table_id, snapshot_id, statistics_path,
+            file_size_in_bytes, file_footer_size_in_bytes,
+            [b.dict(by_alias=True) for b in statistics.blob_metadata]
+        )
+
+    @staticmethod
+    async def _apply_set_partition_statistics(table_id: int, table_record: Dict, update: Any) -> None:
+        """Set partition statistics."""
+        partition_statistics = update.partition_statistics
+        snapshot_id = partition_statistics.snapshot_id
+        statistics_path = partition_statistics.statistics_path
+        file_size_in_bytes = partition_statistics.file_size_in_bytes
+        
+        # Insert the partition statistics, or replace those already set for this snapshot
+        await db.execute(
+            _UPSERT_PARTITION_STATISTICS_SQL, table_id, snapshot_id, statistics_path, file_size_in_bytes
+        )
+
+    @staticmethod
+    async def _apply_remove_statistics(table_id: int, table_record: Dict, update: Any) -> None:
+        """Remove statistics."""
+        snapshot_id = update.snapshot_id
         
-        # Fetch partition specs
-        specs_query = """
-        SELECT spec_id, spec_json FROM partition_specs WHERE table_id = $1
+        # Delete statistics
+        query = """
+        DELETE FROM table_statistics
+        WHERE table_id = $1 AND snapshot_id = $2
         """
-        spec_records = await db.fetch_all(specs_query, table_id)
-        partition_specs = []
+        await db.execute(query, table_id, snapshot_id)
+
+    @staticmethod
+    async def _apply_remove_partition_statistics(table_id: int, table_record: Dict, update: Any) -> None:
+        """Remove partition statistics."""
+        snapshot_id = update.snapshot_id
         
-        for record in spec_records:
-            spec_json = record["spec_json"]
-            if isinstance(spec_json, str):
-                spec_json = json.loads(spec_json)
-            
-            # Ensure spec_id is set
-            if "spec-id" not in spec_json and record["spec_id"] is not None:
-                spec_json["spec-id"] = record["spec_id"]
-                
-            # Ensure all partition fields have field_id
-            if "fields" in spec_json:
-                for field in spec_json["fields"]:
-                    if "field-id" not in field or field["field-id"] is None:
-                        # Generate a field-id if missing
-                        field["field-id"] = table_record["last_partition_id"] + 1
-                
-            spec = PartitionSpec.parse_obj(spec_json)
-            partition_specs.append(spec)
-        
-        # Fetch sort orders
-        orders_query = """
-        SELECT order_id, order_json FROM sort_orders WHERE table_id = $1
-        """
-        order_records = await db.fetch_all(orders_query, table_id)
-        sort_orders = []
-        
-        for record in order_records:
-            order_json = record["order_json"]
-            if isinstance(order_json, str):
-                order_json = json.loads(order_json)
-            order = SortOrder.parse_obj(order_json)
-            sort_orders.append(order)
-        
-        # Fetch snapshots
-        snapshots_query = """
-        SELECT snapshot_id, parent_snapshot_id, sequence_number, timestamp_ms,
-            manifest_list, summary, schema_id
-        FROM snapshots
-        WHERE table_id = $1
-        """
-        
-        snapshot_records = await db.fetch_all(snapshots_query, table_id)
-        snapshots_list = []
-        
-        for record in snapshot_records:
-            summary_json = record["summary"]
-            if isinstance(summary_json, str):
-                summary_json = json.loads(summary_json)
-            
-            snapshot = Snapshot(
-                snapshot_id=record["snapshot_id"],
-                parent_snapshot_id=record["parent_snapshot_id"],
-                sequence_number=record["sequence_number"],
-                timestamp_ms=record["timestamp_ms"],
-                manifest_list=record["manifest_list"],
-                summary=Summary.parse_obj(summary_json),
-                schema_id=record["schema_id"]
+        # Delete partition statistics
+        query = """
+        DELETE FROM partition_statistics
+        WHERE table_id = $1 AND snapshot_id = $2
+        """
+        await db.execute(query, table_id, snapshot_id)
+
+    @staticmethod
+    async def _apply_add_snapshots_batch(table_id: int, updates: List[Any]) -> None:
+        """Add several snapshots with one INSERT, moving the table to the last of them."""
+        snapshots = [update.snapshot.dict(by_alias=True) for update in updates]
+        query = """
+        WITH inserted AS (
+            INSERT INTO snapshots (
+                table_id, snapshot_id, parent_snapshot_id, sequence_number,
+                timestamp_ms, manifest_list, summary, schema_id
             )
-            snapshots_list.append(snapshot)
-        
-        # Fetch snapshot references
-        refs_query = """
-        SELECT name, snapshot_id, type, min_snapshots_to_keep,
-            max_snapshot_age_ms, max_ref_age_ms
-        FROM snapshot_refs
-        WHERE table_id = $1
-        """
-        ref_records = await db.fetch_all(refs_query, table_id)
-        refs = {}
-        
-        for record in ref_records:
-            ref = {
-                "type": record["type"],
-                "snapshot-id": record["snapshot_id"],
-            }
-            
-            if record["min_snapshots_to_keep"] is not None:
-                ref["min-snapshots-to-keep"] = record["min_snapshots_to_keep"]
-            
-            if record["max_snapshot_age_ms"] is not None:
-                ref["max-snapshot-age-ms"] = record["max_snapshot_age_ms"]
-                
-            if record["max_ref_age_ms"] is not None:
-                ref["max-ref-age-ms"] = record["max_ref_age_ms"]
-            
-            refs[record["name"]] = ref
+            SELECT $1, * FROM unnest(
+                $2::bigint[], $3::bigint[], $4::bigint[], $5::bigint[],
+                $6::text[], $7::jsonb[], $8::integer[]
+            )
+        )
+        UPDATE tables SET
+            current_snapshot_id = $9,
+            last_sequence_number = GREATEST(last_sequence_number, $10),
+            updated_at = NOW()
+        WHERE id = $1
+        """
+        await db.execute(
+            query, table_id,
+            [s.get("snapshot-id") for s in snapshots],
+            [s.get("parent-snapshot-id") for s in snapshots],
+            [s.get("sequence-number") for s in snapshots],
+            [s.get("timestamp-ms") for s in snapshots],
+            [s.get("manifest-list") for s in snapshots],
+            [s.get("summary", {}) for s in snapshots],
+            [s.get("schema-id") for s in snapshots],
+            snapshots[-1].get("snapshot-id"),
+            # GREATEST skips NULL, as in the single add-snapshot update
+            max((s["sequence-number"] for s in snapshots if s.get("sequence-number") is not None), default=None)
+        )
+
+    @staticmethod
+    async def _apply_remove_snapshots_batch(table_id: int, updates: List[Any]) -> None:
+        """Remove the snapshots of several remove-snapshots updates with one DELETE."""
+        query = """
+        DELETE FROM snapshots
+        WHERE table_id = $1 AND snapshot_id = ANY($2)
+        """
+        await db.execute(query, table_id, [i for update in updates for i in update.snapshot_ids])
+
+    @staticmethod
+    async def _apply_remove_snapshot_refs_batch(table_id: int, updates: List[Any]) -> None:
+        """Remove several snapshot references with one DELETE."""
+        query = """
+        DELETE FROM snapshot_refs
+        WHERE table_id = $1 AND name = ANY($2::text[])
+        """
+        await db.execute(query, table_id, [update.ref_name for update in updates])
+
+    @staticmethod
+    async def _apply_set_statistics_batch(table_id: int, updates: List[Any]) -> None:
+        """Upsert the statistics of several snapshots with one pipelined executemany."""
+        await db.executemany(_UPSERT_TABLE_STATISTICS_SQL, [
+            (
+                table_id, s.snapshot_id, s.statistics_path,
+                s.file_size_in_bytes, s.file_footer_size_in_bytes,
+                [b.dict(by_alias=True) for b in s.blob_metadata]
+            )
+            for s in (update.statistics for update in updates)
+        ])
+
+    @staticmethod
+    async def _apply_set_partition_statistics_batch(table_id: int, updates: List[Any]) -> None:
+        """Upsert the partition statistics of several snapshots with one pipelined executemany."""
+        await db.executemany(_UPSERT_PARTITION_STATISTICS_SQL, [
+            (table_id, s.snapshot_id, s.statistics_path, s.file_size_in_bytes)
+            for s in (update.partition_statistics for update in updates)
+        ])
+
+    @staticmethod
+    async def _apply_remove_statistics_batch(table_id: int, updates: List[Any]) -> None:
+        """Remove the statistics of several snapshots with one DELETE."""
+        query = """
+        DELETE FROM table_statistics
+        WHERE table_id = $1 AND snapshot_id = ANY($2::bigint[])
+        """
+        await db.execute(query, table_id, [update.snapshot_id for update in updates])
+
+    @staticmethod
+    async def _apply_remove_partition_statistics_batch(table_id: int, updates: List[Any]) -> None:
+        """Remove the partition statistics of several snapshots with one DELETE."""
+        query = """
+        DELETE FROM partition_statistics
+        WHERE table_id = $1 AND snapshot_id = ANY($2::bigint[])
+        """
+        await db.execute(query, table_id, [update.snapshot_id for update in updates])
+
+    @staticmethod
+    async def _apply_remove_partition_specs(table_id: int, table_record: Dict, update: Any) -> None:
+        """Remove partition specs."""
+        spec_ids = update.spec_ids
         
-        # Handle properties
-        properties = table_record["properties"]
-        if isinstance(properties, str):
-            properties = json.loads(properties)
+        # Delete partition specs
+        query = """
+        DELETE FROM partition_specs
+        WHERE table_id = $1 AND spec_id = ANY($2)
+        """
+        await db.execute(query, table_id, spec_ids)
+
+    @staticmethod
+    async def _apply_remove_schemas(table_id: int, table_record: Dict, update: Any) -> None:
+        """Remove schemas."""
+        schema_ids = update.schema_ids
         
-        # Construct table metadata
-        table_metadata_dict = {
+        # Delete schemas
+        query = """
+        DELETE FROM schemas
+        WHERE table_id = $1 AND schema_id = ANY($2)
+        """
+        await db.execute(query, table_id, schema_ids)
+
+    @staticmethod
+    async def _apply_enable_row_lineage(table_id: int, table_record: Dict, update: Any) -> None:
+        """Enable row lineage."""
+        query = """
+        UPDATE tables SET row_lineage = TRUE, updated_at = NOW()
+        WHERE id = $1
+        """
+        await db.execute(query, table_id)
+
+    @staticmethod
+    async def _build_table_metadata(table_id: int) -> TableMetadata:
+        """Build complete table metadata object."""
+        # Get table details with its schemas, specs, sort orders, snapshots and refs
+        table_record = await db.fetch_one(_LOAD_TABLE_BY_ID_SQL, table_id, None, None)
+        table_metadata_dict = _table_metadata_dict(table_record, {
             "format-version": table_record["format_version"],
             "table-uuid": str(table_record["table_uuid"]),
-            "location": table_record["location"],
             "last-updated-ms": table_record["last_updated_ms"],
-            "properties": properties or {},
-            "schemas": schemas,
-            "current-schema-id": table_record["current_schema_id"],
-            "last-column-id": table_record["last_column_id"],
-            "partition-specs": partition_specs,
-            "default-spec-id": table_record["default_spec_id"],
-            "last-partition-id": table_record["last_partition_id"],
-            "sort-orders": sort_orders,
-            "default-sort-order-id": table_record["default_sort_order_id"],
-            "snapshots": snapshots_list,
-            "refs": refs,
-            "current-snapshot-id": table_record["current_snapshot_id"],
-            "last-sequence-number": table_record["last_sequence_number"]
-        }
-        
-        # Add optional fields if they exist
-        if table_record.get("row_lineage") is not None:
-            table_metadata_dict["row-lineage"] = table_record["row_lineage"]
-        
-        if table_record.get("next_row_id") is not None:
-            table_metadata_dict["next-row-id"] = table_record["next_row_id"]
+        })
         
         # Parse into TableMetadata object
-        return TableMetadata.parse_obj(table_metadata_dict)
+        return _from_db_row(TableMetadata, table_metadata_dict)
     
     @staticmethod
     async def commit_transaction(request: CommitTransactionRequest) -> None:
         """
         Commits multiple table changes in a single transaction.
         """
-        logger.info(f"Processing transaction with {len(request.table_changes)} table changes")
+        logger.info("Processing transaction with %s table changes", len(request.table_changes))
         
         try:
             async with db.transaction():
@@ -2385,48 +2121,40 @@ class TableService:
                 """
                 await db.execute(transaction_query, str(transaction_id), "committing")
                 
-                # Process each table change
+                # Get each changed table's record
+                changes = []
                 for table_change in request.table_changes:
                     if not table_change.identifier:
                         raise ValueError("Table identifier is required for transaction changes")
                     
                     namespace_levels = table_change.identifier.namespace.__root__
                     table_name = table_change.identifier.name
-                    
-                    # Get namespace ID
-                    namespace_id = await TableService._get_namespace_id(namespace_levels)
-                    if namespace_id is None:
-                        raise ValueError(f"Namespace not found: {namespace_levels}")
-                    
-                    # Get table ID
-                    query = """
-                    SELECT id FROM tables
-                    WHERE namespace_id = $1 AND name = $2
-                    """
-                    table_record = await db.fetch_one(query, namespace_id, table_name)
-                    if not table_record:
-                        raise ValueError(f"Table not found: {namespace_levels}.{table_name}")
-                    
+                    table_record = await TableService._fetch_table_row(namespace_levels, table_name)
+                    changes.append((namespace_levels, table_name, table_record, table_change))
+                
+                # Lock every table's row like update_table does, in table id order so
+                # concurrent multi-table commits cannot deadlock on the row locks
+                locked = {}
+                for namespace_levels, table_name, table_record, _ in sorted(changes, key=lambda c: c[2]["id"]):
+                    if table_record["id"] not in locked:
+                        locked[table_record["id"]] = await TableService._lock_table_row(
+                            namespace_levels, table_name, table_record["id"]
+                        )
+                
+                # Check requirements and apply updates against the locked rows; a table
+                # changed twice is reloaded so its second change sees the first
+                applied = set()
+                for namespace_levels, table_name, table_record, table_change in changes:
                     table_id = table_record["id"]
-                    
-                    # Get full table record
-                    query = """
-                    SELECT * FROM tables WHERE id = $1
-                    """
-                    table_record = await db.fetch_one(query, table_id)
-                    
-                    # Check all requirements
-                    for requirement in table_change.requirements:
-                        if not await TableService._validate_requirement(table_id, table_record, requirement):
-                            requirement_type = getattr(requirement, "type", "Unknown")
-                            raise ValueError(f"Table requirement not met: {requirement_type}")
-                    
-                    # Apply all updates
-                    for update in table_change.updates:
-                        await TableService._apply_update(table_id, table_record, update.__root__)
-                        
-                        # Reload table record after each update
-                        table_record = await db.fetch_one(query, table_id)
+                    if table_id in applied:
+                        table_record = await TableService._fetch_table_row(namespace_levels, table_name)
+                    else:
+                        table_record = locked[table_id]
+                    await TableService._check_requirements(table_id, table_record, table_change.requirements)
+                    await TableService._apply_updates(
+                        table_id, table_record, [update.__root__ for update in table_change.updates]
+                    )
+                    applied.add(table_id)
                 
                 # Mark transaction as completed
                 completion_query = """
@@ -2435,12 +2163,57 @@ class TableService:
                 WHERE transaction_id = $2
                 """
                 await db.execute(completion_query, "completed", str(transaction_id))
-                
-                logger.info(f"Successfully committed transaction {transaction_id}")
+            
+            # Only drop cached metadata once the changes are visible, so a load
+            # in between cannot cache the pre-commit state again
+            for namespace_levels, table_name, table_record, _ in changes:
+                TableService.invalidate_table(namespace_levels, table_name, table_record["id"])
+            
+            logger.info("Successfully committed transaction %s", transaction_id)
         
         except ValueError:
             # Re-raise ValueError
             raise
         except Exception as e:
-            logger.error(f"Error processing transaction: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+            logger.error("Error processing transaction: %s", e, exc_info=True)
+            raise
+
+
+# Update action -> TableService handler, used by TableService._apply_update
+_UPDATE_HANDLERS = {
+    "assign-uuid": TableService._apply_assign_uuid,
+    "upgrade-format-version": TableService._apply_upgrade_format_version,
+    "add-schema": TableService._apply_add_schema,
+    "set-current-schema": TableService._apply_set_current_schema,
+    "add-spec": TableService._apply_add_spec,
+    "set-default-spec": TableService._apply_set_default_spec,
+    "add-sort-order": TableService._apply_add_sort_order,
+    "set-default-sort-order": TableService._apply_set_default_sort_order,
+    "add-snapshot": TableService._apply_add_snapshot,
+    "set-snapshot-ref": TableService._apply_set_snapshot_ref,
+    "remove-snapshots": TableService._apply_remove_snapshots,
+    "remove-snapshot-ref": TableService._apply_remove_snapshot_ref,
+    "set-location": TableService._apply_set_location,
+    "set-properties": TableService._apply_set_properties,
+    "remove-properties": TableService._apply_remove_properties,
+    "set-statistics": TableService._apply_set_statistics,
+    "set-partition-statistics": TableService._apply_set_partition_statistics,
+    "remove-statistics": TableService._apply_remove_statistics,
+    "remove-partition-statistics": TableService._apply_remove_partition_statistics,
+    "remove-partition-specs": TableService._apply_remove_partition_specs,
+    "remove-schemas": TableService._apply_remove_schemas,
+    "enable-row-lineage": TableService._apply_enable_row_lineage,
+}
+
+
+# Update action -> TableService handler taking a run of consecutive updates
+# with that action, used by TableService._apply_updates
+_BATCH_UPDATE_HANDLERS = {
+    "add-snapshot": TableService._apply_add_snapshots_batch,
+    "remove-snapshots": TableService._apply_remove_snapshots_batch,
+    "remove-snapshot-ref": TableService._apply_remove_snapshot_refs_batch,
+    "set-statistics": TableService._apply_set_statistics_batch,
+    "set-partition-statistics": TableService._apply_set_partition_statistics_batch,
+    "remove-statistics": TableService._apply_remove_statistics_batch,
+    "remove-partition-statistics": TableService._apply_remove_partition_statistics_batch,
+}
@@ -1,29 +1,37 @@
 # app/utils/error_handlers.py
+import functools
 from fastapi import HTTPException
 from app.models.base import IcebergErrorResponse, ErrorModel
 
+# Error types of the resources the catalog serves, so hot 404s skip building them
+_NOT_FOUND_TYPES = {
+    resource_type: f"NoSuch{resource_type.capitalize()}Exception"
+    for resource_type in ("table", "namespace", "view", "schema")
+}
+
+@functools.lru_cache(maxsize=64)
+def _error_template(status_code: int, error_type: str) -> ErrorModel:
+    """Validated error payload for a (status, type) pair, copied with each message"""
+    return ErrorModel(message="", type=error_type, code=status_code)
+
 def create_error_response(status_code: int, message: str, error_type: str) -> IcebergErrorResponse:
     """Create a standardized error response"""
-    return IcebergErrorResponse(
-        error=ErrorModel(
-            message=message,
-            type=error_type,
-            code=status_code
-        )
+    return IcebergErrorResponse.construct(
+        error=_error_template(status_code, error_type).copy(update={"message": message})
     )
 
 def not_found_error(resource_type: str, identifier: str) -> IcebergErrorResponse:
     """Create a not found error response"""
     return create_error_response(
         status_code=404,
-        message=f"The given {resource_type} does not exist: {identifier}",
-        error_type=f"NoSuch{resource_type.capitalize()}Exception"
+        message="The given %s does not exist: %s" % (resource_type, identifier),
+        error_type=_NOT_FOUND_TYPES.get(resource_type) or f"NoSuch{resource_type.capitalize()}Exception"
     )
 
 def conflict_error(resource_type: str, identifier: str) -> IcebergErrorResponse:
     """Create a conflict error response"""
     return create_error_response(
         status_code=409,
-        message=f"The given {resource_type} already exists: {identifier}",
+        message="The given %s already exists: %s" % (resource_type, identifier),
         error_type="AlreadyExistsException"
-    )
\ No newline at end of file
+    )
@@ -1,25 +1,33 @@
 # app/utils/logger.py
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import sys
+from typing import Optional
 
 class Logger:
+    # Shared by every handler of every instance
+    _FORMATTER = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
+    )
+    
     def __init__(self, name='iceberg-catalog', log_level=logging.INFO):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(log_level)
-        self.formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s'
-        )
+        self.formatter = Logger._FORMATTER
+        self.handlers = []
+        self.listener: Optional[QueueListener] = None
         
-        # Clear existing handlers to avoid duplicate logs
+        # Already set up (the logger is process-wide): keep its handlers
+        # rather than reopening them, which also avoids duplicate logs
         if self.logger.handlers:
-            self.logger.handlers.clear()
+            return
         
         # Add console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(self.formatter)
-        self.logger.addHandler(console_handler)
+        self.handlers.append(console_handler)
         
         # Add file handler if LOG_FILE_PATH is set
         log_file_path = os.getenv('LOG_FILE_PATH')
@@ -36,10 +44,44 @@ class Logger:
                 backupCount=5
             )
             file_handler.setFormatter(self.formatter)
-            self.logger.addHandler(file_handler)
+            self.handlers.append(file_handler)
+        
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
+    
+    def start_listener(self):
+        """
+        Hand records to a background QueueListener that owns the handlers.
+        QueueHandler.prepare() still merges the message and exception text on the
+        calling thread; the final formatting and the stream/file writes happen on
+        the listener's thread. Called from the app's startup hook, after any fork.
+        """
+        if self.listener is not None or not self.handlers:
+            return
+        log_queue = queue.Queue(-1)
+        self.listener = QueueListener(log_queue, *self.handlers)
+        for handler in self.handlers:
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(QueueHandler(log_queue))
+        self.listener.start()
+    
+    def stop_listener(self):
+        """Flush and stop the listener, writing records directly again"""
+        if self.listener is None:
+            return
+        for handler in list(self.logger.handlers):
+            if isinstance(handler, QueueHandler):
+                self.logger.removeHandler(handler)
+        self.listener.stop()
+        self.listener = None
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
     
     def get_logger(self):
         return self.logger
 
 # Create a singleton logger instance
-logger = Logger().get_logger()
\ No newline at end of file
+_logger_setup = Logger()
+logger = _logger_setup.get_logger()
+start_log_listener = _logger_setup.start_listener
+stop_log_listener = _logger_setup.stop_listener
\ No newline at end of file